@@ -11,6 +11,9 @@ else :
 
 import pyaedt_module
 from pyaedt_module.core import pyDesktop
+from pyaedt_module.core.id_allocator import allocate_id
+from pyaedt_module.core.wait import remove_path
+from pyaedt_module.core.results_store import ResultsStore
 
 import time
 from datetime import datetime
@@ -21,7 +24,6 @@ import copy
 import pandas as pd
 
 import csv
-from filelock import FileLock
 import traceback
 import logging
 
@@ -52,28 +54,10 @@ class Simulation() :
         self.NUM_TASK = 1
         self.freq = 30e3
 
-        file_path = "simulation_num.txt"
-
-        # 파일이 존재하지 않으면 생성
-        if not os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write("1")
-
-        # 읽기/쓰기 모드로 파일 열기
-        with open(file_path, "r+", encoding="utf-8") as file:
-
-            # 파일에서 값 읽기
-            content = int(file.read().strip())
-            self.num = content
-            self.PROJECT_NAME = f"simulation{content}"
-            content += 1
-
-            # 파일 포인터를 처음으로 되돌리고, 파일 내용 초기화 후 새 값 쓰기
-            file.seek(0)
-            file.truncate()
-            file.write(str(content))
-
-            # 파일은 with 블록 종료 시 자동으로 닫히며, 잠금도 해제됨
+        # simulation 번호는 공유 카운터 파일 대신 IdAllocator로 할당 (노드별 block 예약, lock 불필요)
+        content = allocate_id("simulation_ids")
+        self.num = content
+        self.PROJECT_NAME = f"simulation{content}"
 
         print(f"==========simulation{content}==========")
 
@@ -189,13 +173,10 @@ class Simulation() :
 
         return results_df
 
-    def save_results_to_csv(self, results_df, filename="simulation_results.csv"):
-        """Saves the DataFrame to a CSV file in a process-safe way."""
-        lock_path = filename + ".lock"
-        with FileLock(lock_path):
-            file_exists = os.path.isfile(filename)
-            results_df.to_csv(filename, mode='a', header=not file_exists, index=False)
-        print(f"Results saved to {filename}")
+    def save_results(self, results_df, directory="simulation_results"):
+        """Appends the DataFrame to the results store as a per-process shard (no cross-process lock)."""
+        path = ResultsStore(directory).append(results_df)
+        print(f"Results saved to {path}")
 
 
     def second_simulation(self):
@@ -313,14 +294,14 @@ class Simulation() :
         self.desktop.release_desktop(close_projects=True, close_on_exit=True)
 
     def delete_project_folder(self):
-        time.sleep(10)
-        try:
-            project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
-            if os.path.isdir(project_folder):
-                shutil.rmtree(project_folder)
-                print(f"Successfully deleted project folder: {project_folder}")
-        except Exception as e:
-            print(f"Error deleting project folder {project_folder}: {e}", file=sys.stderr)
+        project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
+        if not os.path.isdir(project_folder):
+            return
+        # 고정 sleep 대신 AEDT가 파일을 놓는 즉시 삭제되도록 backoff 재시도
+        if remove_path(project_folder, timeout=30):
+            print(f"Successfully deleted project folder: {project_folder}")
+        else:
+            print(f"Error deleting project folder {project_folder}", file=sys.stderr)
 
 
 if __name__ == '__main__':
@@ -373,7 +354,7 @@ if __name__ == '__main__':
             simulation_runner.get_icepak_results()
 
             # 15. 결과 저장
-            simulation_runner.save_results_to_csv(simulation_runner.results_df)
+            simulation_runner.save_results(simulation_runner.results_df)
 
             simulation_runner.close_project()
             simulation_runner.delete_project_folder()
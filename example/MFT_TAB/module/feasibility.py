@@ -0,0 +1,178 @@
+"""
+Pre-solve geometry validation of the MFT_TAB model (core, winding1~3, mold, cold plates).
+
+modeling.py와 같은 치수식으로 box/winding bounds를 계산해서 AEDT boolean/solve 전에 간섭을 찾아낸다.
+input은 input_parameter dict 1개, dict of arrays, pandas DataFrame, list of dict 모두 가능하고 batch 전체를 한 번에 검사한다.
+
+    >>> checker = check_geometry(input_parameter)
+    >>> checker.feasible[0], checker.reasons(0)
+    >>> checker = check_geometry(candidates_df)          # batch
+    >>> job_queue.put_many(candidates_df[checker.feasible].to_dict("records"))   # 불가능한 sample은 queue에 넣지 않는다
+"""
+
+import numpy as np
+
+from pyaedt_module.model3d import feasibility
+from pyaedt_module.model3d.feasibility import FeasibilityChecker
+from pyaedt_module.model3d.winding_geometry import transformer_winding_bounds
+
+from module.modeling import offset_calculation
+
+
+TERMINAL_LENGTH = 200 # modeling.py의 "w1/2 + 200mm" terminal
+OFFSET_RATIO_LIMIT = 0.8 # input_parameter.sample_input_parameter의 N*_offset_ratio 범위
+
+_KEYS = [
+    "N1", "N2", "N1_layer", "N2_layer", "w1", "l1_top", "l1_side", "l1_center", "l2", "h1",
+    "N1_height_ratio", "N1_coil_diameter", "N1_coil_zgap", "N2_height_ratio", "N2_coil_diameter", "N2_coil_zgap",
+    "N1_space_w", "N1_space_l", "N2_space_w", "N2_space_l", "N1_layer_gap", "N2_layer_gap",
+    "N1_offset", "N2_offset", "cold_plate_x", "cold_plate_y", "cold_plate_z1", "cold_plate_z2", "mold_thick",
+]
+
+
+def _as_arrays(params) -> dict:
+    if isinstance(params, (list, tuple)):
+        params = {key: [param[key] for param in params] for key in _KEYS}
+    return {key: np.atleast_1d(np.asarray(params[key], dtype=np.float64)) for key in _KEYS}
+
+
+def geometry_bounds(params) -> dict:
+    """Box / winding bounds (mm) of every part, for a whole batch."""
+    p = _as_arrays(params)
+    zero = np.zeros_like(p["w1"])
+    inf = np.full_like(p["w1"], np.inf)
+
+    # --- core ---
+    center_leg = feasibility.box(center=(zero, zero, zero), half=(p["w1"] / 2, p["l1_center"] / 2, p["h1"] / 2))
+    window = feasibility.box(center=(zero, zero, zero), half=(inf, p["l1_center"] / 2 + p["l2"], p["h1"] / 2)) # x 방향은 core 밖
+
+    # --- windings (modeling.create_all_windings) ---
+    N1_thick = p["N1_layer"] * p["N1_coil_diameter"] + (p["N1_layer"] - 1) * p["N1_layer_gap"]
+    offset1 = offset_calculation(p["N1_coil_diameter"], p["h1"], p["N1_height_ratio"]) + p["N1_offset"]
+    winding1 = transformer_winding_bounds(
+        p["N1"], p["N1_layer"], p["w1"] + 2 * p["N1_space_w"], p["l1_center"] + 2 * p["N1_space_l"],
+        p["N1_coil_diameter"], p["N1_coil_zgap"], p["N1_layer_gap"], p["N1_layer_gap"], [zero, zero, offset1])
+
+    offset2 = offset_calculation(p["N2_coil_diameter"], p["h1"] / 2, p["N2_height_ratio"]) + p["N2_offset"]
+    x2 = p["w1"] + 2 * p["N2_space_w"] + 2 * p["N1_space_w"] + 2 * N1_thick + 2 * p["mold_thick"]
+    y2 = p["l1_center"] + 2 * p["N2_space_l"] + 2 * p["N1_space_l"] + 2 * N1_thick + 2 * p["mold_thick"]
+    winding2, winding3 = [
+        transformer_winding_bounds(
+            p["N2"], p["N2_layer"], x2, y2, p["N2_coil_diameter"], p["N2_coil_zgap"], p["N2_layer_gap"], p["N2_layer_gap"],
+            [zero, zero, sign * p["h1"] / 4 + offset2], terminal_position=p["w1"] / 2 + TERMINAL_LENGTH)
+        for sign in (1, -1)
+    ]
+
+    # winding1 lead: 첫/마지막 점에서 core 위/아래로 나간 뒤 terminal까지 (vertical + horizontal box)
+    r1 = p["N1_coil_diameter"] / 2
+    lead_x = p["w1"] / 2 + p["N1_space_w"] + r1
+    lead_z = p["h1"] / 2 + r1
+    leads = {}
+    for side, sign in (("top", 1), ("bottom", -1)):
+        y = -sign * (p["l1_center"] / 2 + p["N1_space_l"] + r1) # 첫 점은 neg_y1, 마지막 점은 pos_y1
+        turn_z = winding1.hi[..., 2] - r1 if sign > 0 else winding1.lo[..., 2] + r1
+        leads[f"lead_{side}_vertical"] = feasibility.box(
+            lo=(lead_x - r1, y - r1, np.minimum(turn_z, sign * lead_z) - r1),
+            hi=(lead_x + r1, y + r1, np.maximum(turn_z, sign * lead_z) + r1))
+        leads[f"lead_{side}_horizontal"] = feasibility.box(
+            lo=(lead_x - r1, y - r1, sign * lead_z - r1),
+            hi=(p["w1"] / 2 + TERMINAL_LENGTH + r1, y + r1, sign * lead_z + r1))
+
+    # --- mold (modeling.create_mold) ---
+    mold = feasibility.box(center=(zero, zero, zero), half=(
+        p["w1"] / 2 + p["N1_space_w"] + N1_thick + p["mold_thick"],
+        p["l1_center"] / 2 + p["N1_space_l"] + N1_thick + p["mold_thick"],
+        p["h1"] / 2))
+
+    # --- cold plates (modeling.create_cold_plate, core pocket은 무시한 바깥 box) ---
+    plate_x = p["w1"] / 2 + p["cold_plate_x"]
+    plate_y = (p["l1_center"] + 2 * p["l2"] + 2 * p["l1_side"]) / 2 + p["cold_plate_y"]
+    plate_z = p["l1_top"] + p["h1"] / 2
+    cold_plate_top = feasibility.box(lo=(-plate_x, -plate_y, plate_z - p["l1_top"] * p["cold_plate_z2"]),
+                                     hi=(plate_x, plate_y, plate_z + p["cold_plate_z1"]))
+    cold_plate_bottom = feasibility.box(lo=(-plate_x, -plate_y, -plate_z - p["cold_plate_z1"]),
+                                        hi=(plate_x, plate_y, -plate_z + p["l1_top"] * p["cold_plate_z2"]))
+
+    return {
+        "center_leg": center_leg, "window": window, "mold": mold,
+        "winding1": winding1, "winding2": winding2, "winding3": winding3,
+        "cold_plate_top": cold_plate_top, "cold_plate_bottom": cold_plate_bottom,
+        **leads,
+    }
+
+
+def check_geometry(params, clearance: float = 0.5) -> FeasibilityChecker:
+    """
+    Checks a batch of parameter sets; returns a FeasibilityChecker (feasible mask, reasons, summary).
+
+    Args:
+        clearance: Minimum distance in mm between parts (같은 winding의 turn 사이는 coil_zgap > 0만 확인).
+    """
+    p = _as_arrays(params)
+    parts = geometry_bounds(p)
+    checker = FeasibilityChecker(clearance)
+    c = clearance
+
+    for name in ("winding1", "winding2", "winding3"):
+        winding = parts[name]
+        checker.require(f"{name}_around_core", feasibility.through_hole(parts["center_leg"], winding, c))
+        checker.require(f"{name}_in_window", feasibility.inside(winding, parts["window"], c, axes=slice(1, 3)))
+        for plate in ("cold_plate_top", "cold_plate_bottom"):
+            checker.forbid(f"{name}_{plate}", feasibility.overlaps(winding, parts[plate], c))
+
+    checker.require("winding1_in_mold", feasibility.inside(parts["winding1"], parts["mold"], 0.0))
+    checker.require("winding2_outside_mold", feasibility.through_hole(parts["mold"], parts["winding2"], c))
+    checker.require("winding3_outside_mold", feasibility.through_hole(parts["mold"], parts["winding3"], c))
+    checker.require("winding2_winding3", feasibility.winding_clear(parts["winding2"], parts["winding3"], c))
+
+    for lead in [name for name in parts if name.startswith("lead_")]:
+        for name in ("winding2", "winding3"):
+            checker.require(f"{lead}_{name}", feasibility.winding_clear(parts[name], parts[lead], c))
+        for plate in ("cold_plate_top", "cold_plate_bottom"):
+            checker.forbid(f"{lead}_{plate}", feasibility.overlaps(parts[lead], parts[plate], c))
+
+    for n in ("N1", "N2"):
+        checker.require(f"{n}_turns", (p[n] >= 1) & (p[f"{n}_coil_diameter"] > 0) & (p[f"{n}_coil_zgap"] > 0))
+
+    return checker
+
+
+def repair_geometry(params, clearance: float = 0.5):
+    """
+    Pulls the winding z-offsets of infeasible samples back into the window.
+
+    - N1_offset / N2_offset: winding이 window z 범위(±h1/2 - clearance) 안에 들어오도록 clip한다.
+      offset_ratio는 sample_input_parameter의 범위(±OFFSET_RATIO_LIMIT)를 넘지 않게 하고, N*_offset_ratio, h1_gap, h2_gap도 갱신한다.
+    - 그 외의 값(l2 등)은 바꾸지 않는다. 나머지 간섭은 check_geometry에서 걸러서 sample을 다시 뽑는다.
+
+    Args:
+        params: input_parameter dict (scalar 또는 array 값) or pandas DataFrame.
+
+    Returns:
+        Same kind as `params` with repaired values.
+    """
+    single = isinstance(params, dict) and np.ndim(params["w1"]) == 0
+    p = _as_arrays(params)
+    repaired = params.copy()
+
+    def _set(key, values):
+        repaired[key] = float(values[0]) if single else values
+
+    h1 = p["h1"]
+    for n, height in (("N1", h1), ("N2", h1 / 2)):
+        # calculate_coil_offset: offset = (height - coil_height)/2 * offset_ratio
+        half_span = (height - height * p[f"{n}_height_ratio"]) / 2
+        limit = np.minimum(np.maximum(half_span - clearance, 0.0), OFFSET_RATIO_LIMIT * half_span)
+        offset = np.clip(p[f"{n}_offset"], -limit, limit)
+        _set(f"{n}_offset", offset)
+        if f"{n}_offset_ratio" in repaired:
+            ratio = np.where(half_span > 0, offset / np.maximum(half_span, 1e-12), 0.0)
+            _set(f"{n}_offset_ratio", np.clip(ratio, -OFFSET_RATIO_LIMIT, OFFSET_RATIO_LIMIT))
+
+    # h1_gap / h2_gap은 create_input_parameter와 같이 h1 기준으로 계산
+    for n, gap in (("N1", "h1_gap"), ("N2", "h2_gap")):
+        if gap in repaired:
+            offset = np.atleast_1d(np.asarray(repaired[f"{n}_offset"], dtype=np.float64))
+            _set(gap, (h1 - h1 * p[f"{n}_height_ratio"]) / 2 - np.abs(offset))
+
+    return repaired
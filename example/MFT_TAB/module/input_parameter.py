@@ -1,5 +1,7 @@
 import math
 
+from module.feasibility import check_geometry, repair_geometry
+
 def calculate_coil_parameter(N, N_layer, h1, height_ratio, fill_factor):
     height = h1 * height_ratio
     effective_height = height * fill_factor
@@ -33,6 +35,16 @@ def calculate_coil_offset(N, N_layer, h1, height_ratio, offset_ratio) :
     return offset
 
 
+def _input_parameter_from(params, keys):
+    # job queue의 params는 dict이므로 순서가 아니라 이름으로 찾는다 (없는 key는 KeyError)
+    if isinstance(params, dict):
+        return {key: params[key] for key in keys}
+
+    if len(params) != len(keys):
+        raise ValueError(f"Input list must have exactly {len(keys)} elements, but got {len(params)}.")
+    return dict(zip(keys, params))
+
+
 def create_input_parameter_for_test(design, param_list=None):
     if param_list is not None:
         keys = [
@@ -45,11 +57,7 @@ def create_input_parameter_for_test(design, param_list=None):
             "cold_plate_z2", "mold_thick", "thermal_conductivity", "winding_thermal_ratio", "wind_speed"
         ]
         
-        if len(param_list) != len(keys):
-            raise ValueError(f"Input list must have exactly {len(keys)} elements, but got {len(param_list)}.")
-            
-        input_parameter = dict(zip(keys, param_list))
-        return input_parameter
+        return _input_parameter_from(param_list, keys)
     
     N1 = 6
     N2 = 6
@@ -224,7 +232,7 @@ def create_input_parameter_for_test(design, param_list=None):
     
 
 
-def create_input_parameter(design, param_list=None):
+def create_input_parameter(design, param_list=None, max_attempts=100):
     if param_list is not None:
         keys = [
             "N1", "N2", "N1_layer", "N2_layer", "frequency", "per", "w1", "l1_top", "l1_top_ratio", "l1_side", "l1_side_ratio", "l1_center", "l2", "l2_gap", "h1",
@@ -236,12 +244,20 @@ def create_input_parameter(design, param_list=None):
             "cold_plate_z2", "mold_thick", "thermal_conductivity", "winding_thermal_ratio", "wind_speed"
         ]
         
-        if len(param_list) != len(keys):
-            raise ValueError(f"Input list must have exactly {len(keys)} elements, but got {len(param_list)}.")
-            
-        input_parameter = dict(zip(keys, param_list))
-        return input_parameter
+        return _input_parameter_from(param_list, keys)
+
+    # AEDT에 모델을 만들기 전에 geometry 간섭(winding/core/mold/cold plate)을 검사해서 불가능한 sample은 다시 뽑는다
+    for attempt in range(max_attempts):
+        input_parameter = repair_geometry(sample_input_parameter(design))
+        checker = check_geometry(input_parameter)
+        if checker.feasible[0]:
+            return input_parameter
+        print(f"Warning: infeasible geometry sample rejected ({', '.join(checker.reasons(0))})")
+
+    raise ValueError(f"No feasible geometry sample after {max_attempts} attempts")
+
 
+def sample_input_parameter(design):
     N1 = design.get_random_value(lower=3, upper=10, resolution=1)
     N2 = N1
     N1_layer = design.get_random_value(lower=1, upper=1, resolution=1)
@@ -381,9 +397,7 @@ def set_design_variables(design, input_parameter):
         "mold_thick": "mm"
     }
 
-    for key, value in input_parameter.items():
-        # Ansys 디자인에 변수를 설정합니다.
-        unit = units.get(key, "")
-        design.set_variable(variable_name=key, value=value, unit=unit)
+    # 변수마다 AEDT transaction을 만들지 않도록 한 번의 ChangeProperty로 설정합니다.
+    design.set_variables(input_parameter, units=units)
 
     print("Ansys 디자인 변수가 설정되었습니다.")
\ No newline at end of file
@@ -27,21 +27,23 @@ def extract_data_from_last_line(filename):
     return pass_number, tetrahedra, total_energy, energy_error, delta_energy
 
 
+# get_input_parameter column 순서 (ResultCache의 input hash도 이 순서를 사용)
+INPUT_PARAMETER_COLUMNS = [
+    "N1", "N2", "N1_layer", "N2_layer", "frequency", "per", "w1", "l1_top", "l1_top_ratio", "l1_side", "l1_side_ratio", "l1_center", "l2", "l2_gap", "h1",
+    "h1_gap", "h2_gap", "N1_height_ratio", "N1_fill_factor", "N1_coil_diameter",
+    "N1_coil_zgap", "N2_height_ratio", "N2_fill_factor", "N2_coil_diameter",
+    "N2_coil_zgap", "N1_space_w", "N1_space_l", "N2_space_w", "N2_space_l",
+    "N1_layer_gap", "N2_layer_gap", "N1_offset_ratio", "N2_offset_ratio",
+    "N1_offset", "N2_offset", "cold_plate_x", "cold_plate_y", "cold_plate_z1",
+    "cold_plate_z2", "mold_thick", "thermal_conductivity", "winding_thermal_ratio", "wind_speed"
+]
+
+
 def get_input_parameter(design):
     """
     Gathers input parameters from the design object and returns them as a pandas DataFrame.
     """
-    param_columns = [
-            "N1", "N2", "N1_layer", "N2_layer", "frequency", "per", "w1", "l1_top", "l1_top_ratio", "l1_side", "l1_side_ratio", "l1_center", "l2", "l2_gap", "h1",
-            "h1_gap", "h2_gap", "N1_height_ratio", "N1_fill_factor", "N1_coil_diameter",
-            "N1_coil_zgap", "N2_height_ratio", "N2_fill_factor", "N2_coil_diameter",
-            "N2_coil_zgap", "N1_space_w", "N1_space_l", "N2_space_w", "N2_space_l",
-            "N1_layer_gap", "N2_layer_gap", "N1_offset_ratio", "N2_offset_ratio",
-            "N1_offset", "N2_offset", "cold_plate_x", "cold_plate_y", "cold_plate_z1",
-            "cold_plate_z2", "mold_thick", "thermal_conductivity", "winding_thermal_ratio", "wind_speed"
-        ]       
-    
-    input_data = {col: [getattr(design, col, None)] for col in param_columns}
+    input_data = {col: [getattr(design, col, None)] for col in INPUT_PARAMETER_COLUMNS}
     
     return pd.DataFrame(data=input_data)
 
@@ -23,6 +23,12 @@ else :
 
 import pyaedt_module
 from pyaedt_module.core import pyDesktop
+from pyaedt_module.core.id_allocator import allocate_id
+from pyaedt_module.core.wait import wait_until, remove_path
+from pyaedt_module.core.results_store import ResultsStore, ResultCache
+from pyaedt_module.core.job_queue import JobQueue, Heartbeat
+from pyaedt_module.core.pipeline import Pipeline
+from pyaedt_module.core.memory_watchdog import MemoryWatchdog
 
 import time
 from datetime import datetime
@@ -33,16 +39,16 @@ import copy
 import pandas as pd
 
 import csv
-from filelock import FileLock
 import traceback
 
 from module.input_parameter import create_input_parameter, create_input_parameter_for_test, calculate_coil_parameter, calculate_coil_offset, set_design_variables
+from module.feasibility import check_geometry
 from module.modeling import (
     create_core_model, create_all_windings, create_cold_plate, create_air,
     assign_meshing, assign_excitations, create_face, create_mold
 )
 from module.report import (
-    get_input_parameter, get_maxwell_magnetic_parameter,
+    INPUT_PARAMETER_COLUMNS, get_input_parameter, get_maxwell_magnetic_parameter,
     get_maxwell_calculator_parameter, get_convergence_report, get_icepak_calculator_parameter
 )
 
@@ -74,26 +80,10 @@ class Simulation() :
         self.NUM_CORE = 4
         self.NUM_TASK = 1
 
-        file_path = "simulation_num.txt"
-
-        # 파일이 존재하지 않으면 생성
-        if not os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write("1")
-
-        # 읽기/쓰기 모드로 파일 열기
-        with open(file_path, "r+", encoding="utf-8") as file:
-
-            # 파일에서 값 읽기
-            content = int(file.read().strip())
-            self.num = content
-            self.PROJECT_NAME = f"simulation{content}"
-            content += 1
-
-            # 파일 포인터를 처음으로 되돌리고, 파일 내용 초기화 후 새 값 쓰기
-            file.seek(0)
-            file.truncate()
-            file.write(str(content))
+        # simulation 번호는 공유 카운터 파일 대신 IdAllocator로 할당 (노드별 block 예약, lock 불필요)
+        content = allocate_id("simulation_ids")
+        self.num = content
+        self.PROJECT_NAME = f"simulation{content}"
 
         # Set up logging for this simulation
         folder_path = os.path.join(current_dir, "simulation", self.PROJECT_NAME)
@@ -142,6 +132,7 @@ class Simulation() :
         for key, value in input_parameter.items():
             setattr(self.maxwell_design, key, value)
         
+        self.input_parameter = input_parameter
         self.input_df = pd.DataFrame([input_parameter])
         
         # 2. input_parameter.py의 함수를 호출하여 Ansys 디자인에 변수를 설정합니다.
@@ -230,22 +221,24 @@ class Simulation() :
 
         return results_df
 
-    def save_results_to_csv(self, results_df, filename="simulation_results.csv"):
-        """Saves the DataFrame to a CSV file in a process-safe way."""
-        lock_path = filename + ".lock"
-        with FileLock(lock_path):
-            file_exists = os.path.isfile(filename)
-            results_df.to_csv(filename, mode='a', header=not file_exists, index=False)
-        logging.info(f"Results saved to {filename}")
+    def save_results(self, results_df, directory="simulation_results", result_cache=None):
+        """Appends the DataFrame to the results store as a per-process shard (no cross-process lock)."""
+        if result_cache is not None:
+            # input hash를 같이 기록해서 같은 parameter set은 다음부터 해석하지 않는다
+            path = result_cache.save(self.input_parameter, results_df)
+        else:
+            path = ResultsStore(directory).append(results_df)
+        logging.info(f"Results saved to {path}")
 
 
     def second_simulation(self):
 
-        time.sleep(5)
-
         oProject = self.desktop.odesktop.SetActiveProject(self.project.name)
+        n_designs = len(oProject.GetTopDesignList())
         oProject.CopyDesign(self.maxwell_design.name)
         oProject.Paste()
+        # 고정 sleep 대신 paste된 design이 project에 나타날 때까지 polling
+        wait_until(lambda: len(oProject.GetTopDesignList()) > n_designs, timeout=30, name="design_paste")
 
         self.maxwell_design2 = self.maxwell_design.get_active_design()
 
@@ -288,8 +281,23 @@ class Simulation() :
         self.analyze_maxwell(self.maxwell_design2)
         self.get_simulation_results(design=self.maxwell_design2, input=False, step=2)
 
+    def delete_icepak(self):
+        """Deletes Icepak designs left by a failed attempt (every design except the two Maxwell designs)."""
+        oProject = self.desktop.odesktop.SetActiveProject(self.project.name)
+        keep = {self.maxwell_design.design_name, self.maxwell_design2.design_name}
+        leftovers = [name for name in oProject.GetTopDesignList() if name not in keep]
+        for name in leftovers:
+            logging.warning(f"{self.PROJECT_NAME} : deleting design '{name}' from a failed Icepak attempt")
+            oProject.DeleteDesign(name)
+        if leftovers:
+            self.project.invalidate_designs()
+        self.icepak_design = None
+
     def create_icepak(self):
 
+        # retry 시 이전 시도의 Icepak design을 먼저 지운다 (CreateEMLossTarget이 EM loss target design을 하나 더 만들지 않도록)
+        self.delete_icepak()
+
         oProject = self.desktop.odesktop.SetActiveProject(self.project.name)
         oDesign = oProject.SetActiveDesign(self.maxwell_design.design_name)
         oDesign.CreateEMLossTarget("Icepak", "Setup1 : LastAdaptive", 
@@ -380,6 +388,66 @@ class Simulation() :
         self.results_df = pd.concat([self.results_df, icepak_results_df], axis=1)
 
 
+    def maxwell_stage(self, state):
+        # 5. 해석 설정 및 실행
+        self.set_maxwell_analysis()
+
+        # 6. 모델을 생성합니다.
+        self.create_core()
+
+        self.create_face(self.maxwell_design)
+        self.create_windings()
+        self.create_mold()
+        self.create_cold_plate()
+        self.create_air()
+
+        # 7. 메쉬 및 경계조건 설정
+        self.assign_meshing()
+        self.assign_excitations()
+
+        # 8. 해석 설정 및 실행
+        self.analyze_maxwell(self.maxwell_design)
+
+        # 9. 결과 리포팅
+        state.results_df = self.get_simulation_results(design=self.maxwell_design, input=True)
+
+    def second_maxwell_stage(self, state):
+        # 10. 두 번째 해석 실행
+        self.second_simulation()
+        state.results_df = self.results_df
+
+    def icepak_stage(self, state):
+        # 11. Icepak 디자인 생성
+        self.create_icepak()
+
+        # 12. Icepak 해석 설정
+        self.setup_icepak_analysis()
+
+        # 13. Icepak 해석 실행
+        self.analyze_icepak()
+
+        # 14. Icepak 결과 리포팅
+        self.get_icepak_results()
+        state.results_df = self.results_df
+
+    def build_pipeline(self):
+        """
+        Maxwell -> second Maxwell -> Icepak as stages (Icepak failures are retried once in the same process).
+
+        icepak stage는 시작할 때 이전 시도의 Icepak design을 지우므로 같은 project에서 그대로 다시 실행할 수 있다.
+        새 process에서 이어서 실행하지 않으므로 stage마다 .aedt를 저장하지 않는다
+        (실패한 job은 queue에서 처음부터 다시 실행, checkpoint에는 attempts/errors만 남는다).
+        """
+        pipeline = Pipeline(
+            run_id=self.PROJECT_NAME,
+            checkpoint_dir=os.path.join(os.getcwd(), "simulation", f"{self.PROJECT_NAME}", "checkpoint")
+        )
+        pipeline.add_stage("maxwell", self.maxwell_stage)
+        pipeline.add_stage("second_maxwell", self.second_maxwell_stage)
+        pipeline.add_stage("icepak", self.icepak_stage, retries=1)
+        return pipeline
+
+
     def close_project(self):
         self.maxwell_design.cleanup_solution()
         self.icepak_design.cleanup_solution()
@@ -389,19 +457,64 @@ class Simulation() :
         self.desktop.release_desktop(close_projects=True, close_on_exit=True)
 
     def delete_project_folder(self):
-        time.sleep(10)
-        try:
-            project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
-            if os.path.isdir(project_folder):
-                shutil.rmtree(project_folder)
-                logging.info(f"Successfully deleted project folder: {project_folder}")
-        except Exception as e:
-            logging.error(f"Error deleting project folder {project_folder}: {e}")
+        project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
+        if not os.path.isdir(project_folder):
+            return
+        # 고정 sleep 대신 AEDT가 파일을 놓는 즉시 삭제되도록 backoff 재시도
+        if remove_path(project_folder, timeout=30):
+            logging.info(f"Successfully deleted project folder: {project_folder}")
+        else:
+            logging.error(f"Error deleting project folder {project_folder}")
+
+
+def complete_job(job_queue, job, result=None):
+    # lease가 만료되어 다른 worker에게 넘어간 job이면 새 소유자의 row를 덮어쓰지 않는다
+    if not job_queue.complete(job.job_id, job.worker_id, result=result):
+        logging.warning(f"job {job.job_id} : no longer owned by {job.worker_id}, result not recorded")
 
 
 def main(test=False):
+    # Scheduler가 job_queue와 함께 실행한 경우 queue에서 parameter set을 받아온다 (없으면 자체 샘플링)
+    job_queue = JobQueue.from_env()
+
+    # 이미 해석한 parameter set은 results store에서 결과를 가져온다
+    result_cache = ResultCache(ResultsStore("simulation_results"), columns=INPUT_PARAMETER_COLUMNS)
+
+    # iteration마다 Python/AEDT RSS를 기록하고, 메모리가 새면 swap에 들어가기 전에 process를 recycle한다
+    # 노드 메모리 90% 초과는 노드 전체 신호이므로 노드에서 가장 큰 AEDT를 가진 slot만 recycle한다 (모든 slot이 동시에 재시작하지 않도록)
+    memory_watchdog = MemoryWatchdog(python_rss_limit=4096, aedt_rss_limit=32000, system_mem_limit=0.90,
+                                     system_mem_largest_only=True, growth_limit=20, window=20, log_file="memory_watchdog.jsonl")
+
     for i in range(5000):
+        job = None
+        if job_queue is not None:
+            job = job_queue.claim()
+            if job is None:
+                break
+
+        # Scheduler가 띄운 script는 lease_timeout보다 오래 걸릴 수 있으므로 실행 중에는 lease를 계속 연장한다
+        heartbeat = Heartbeat(job_queue, job.job_id, job.worker_id) if job is not None else None
+
+        simulation_runner = None
         try:
+            if job is not None:
+                # geometry가 불가능한 parameter set은 AEDT를 띄우기 전에 재시도 없이 fail 처리
+                # (key가 빠진 parameter set은 KeyError로 아래 except에서 일반 실패로 처리된다)
+                checker = check_geometry(job.params)
+                if not checker.feasible[0]:
+                    reasons = ", ".join(checker.reasons(0))
+                    logging.warning(f"job {job.job_id} : infeasible geometry, skipped ({reasons})")
+                    job_queue.fail(job.job_id, job.worker_id, error=f"infeasible geometry: {reasons}", retry=False)
+                    continue
+
+                # queue에서 받은 parameter set은 AEDT를 띄우기 전에 cache를 확인한다
+                cached = result_cache.lookup(job.params)
+                if cached is not None:
+                    logging.info(f"job {job.job_id} : cache hit, skipping simulation ({result_cache})")
+                    complete_job(job_queue, job, result={"cached": True})
+                    continue
+                logging.info(f"job {job.job_id} : cache miss ({result_cache})")
+
             simulation_runner = Simulation()
 
             if test == True :
@@ -413,67 +526,65 @@ def main(test=False):
             simulation_runner.create_design("SST_MFT")
 
             # 3. 이제 입력 매개변수를 생성할 수 있습니다.
-            input_parameters = simulation_runner.create_input_parameter()
+            input_parameters = simulation_runner.create_input_parameter(None if job is None else job.params)
+
+            # 자체 샘플링한 parameter set은 샘플링에 design이 필요하므로 AEDT를 띄운 뒤에 cache를 확인한다
+            if job is None:
+                cached = result_cache.lookup(input_parameters)
+                if cached is not None:
+                    logging.info(f"{simulation_runner.PROJECT_NAME} : cache hit, skipping simulation ({result_cache})")
+                    simulation_runner.desktop.release_desktop(close_projects=True, close_on_exit=True)
+                    simulation_runner.delete_project_folder()
+                    continue
+                logging.info(f"{simulation_runner.PROJECT_NAME} : cache miss ({result_cache})")
 
             # 4. 생성된 파라미터를 Simulation 객체와 Ansys 디자인에 설정합니다.
             simulation_runner.set_variable(input_parameters)
 
-            # 5. 해석 설정 및 실행
-            simulation_runner.set_maxwell_analysis()
-
-            # 6. 모델을 생성합니다.
-            simulation_runner.create_core()
-
-            simulation_runner.create_face(simulation_runner.maxwell_design)
-            simulation_runner.create_windings()
-            simulation_runner.create_mold()
-            simulation_runner.create_cold_plate()
-            simulation_runner.create_air()
-
-            # 7. 메쉬 및 경계조건 설정
-            simulation_runner.assign_meshing()
-            simulation_runner.assign_excitations()
-
-            # 8. 해석 설정 및 실행
-            simulation_runner.analyze_maxwell(simulation_runner.maxwell_design)
-
-            # 9. 결과 리포팅
-            simulation_runner.get_simulation_results(design=simulation_runner.maxwell_design, input=True)
-
-            # 10. 두 번째 해석 실행
-            simulation_runner.second_simulation()
-
-            # 11. Icepak 디자인 생성
-            simulation_runner.create_icepak()       
-
-            # 12. Icepak 해석 설정
-            simulation_runner.setup_icepak_analysis()
-
-            # 13. Icepak 해석 실행
-            simulation_runner.analyze_icepak()
-
-            # 14. Icepak 결과 리포팅
-            simulation_runner.get_icepak_results()
+            # 5~14. Maxwell -> 두 번째 Maxwell -> Icepak (stage마다 checkpoint, 실패한 stage부터 재시도)
+            simulation_runner.build_pipeline().run(context=simulation_runner)
 
             # 15. 결과 저장
-            simulation_runner.save_results_to_csv(simulation_runner.results_df)
+            simulation_runner.save_results(simulation_runner.results_df, result_cache=result_cache)
+
+            # AEDT가 아직 살아있을 때 RSS 샘플링
+            recycle_reason = memory_watchdog.check(simulation_runner.desktop, iteration=i)
 
             if test == True :
+                if job is not None:
+                    complete_job(job_queue, job)
                 break
 
             simulation_runner.close_project()
             simulation_runner.delete_project_folder()
 
+            # cleanup이 끝난 뒤에 complete : cleanup 실패가 아래 except의 fail()로 done job을 다시 queued로 돌리지 않도록
+            if job is not None:
+                complete_job(job_queue, job)
+
+            if recycle_reason:
+                # desktop은 close_project에서 이미 release됨 : gc 후에도 Python 쪽이 넘치면 process를 끝내고 Scheduler가 새로 띄우게 한다
+                memory_watchdog.recycle()
+                if memory_watchdog.check(iteration=i):
+                    logging.warning(f"{simulation_runner.PROJECT_NAME} : memory still over threshold after gc, exiting for a fresh process ({memory_watchdog})")
+                    break
+
         except Exception as e:
+            if job is not None and not job_queue.fail(job.job_id, job.worker_id, error=str(e)):
+                logging.warning(f"job {job.job_id} : no longer owned by {job.worker_id}, failure not recorded")
+
             pd.set_option('display.max_rows', None)
             pd.set_option('display.max_columns', None)
             pd.set_option('display.width', None)
             
-            err_info = f"error : {simulation_runner.PROJECT_NAME}\n"
+            # Simulation()을 만들기 전에 실패한 경우(check_geometry 등)에는 job 기준으로 기록
+            project_name = simulation_runner.PROJECT_NAME if simulation_runner is not None else f"job{job.job_id if job is not None else i}"
+
+            err_info = f"error : {project_name}\n"
             try:
                 err_info += f"input : {simulation_runner.input_df.to_string()}\n"
             except AttributeError:
-                err_info += "input : Not available\n"
+                err_info += "input : Not available\n" if job is None else f"input : {job.params}\n"
             
             err_info += f"{str(e)}\n"
             err_info += traceback.format_exc()
@@ -483,15 +594,20 @@ def main(test=False):
             
             logging.error(err_info, exc_info=True)
             
-            save_error_log(simulation_runner.PROJECT_NAME, err_info)
+            save_error_log(project_name, err_info)
             
-            logging.error(f"{simulation_runner.PROJECT_NAME} : {i} simulation Failed")
+            logging.error(f"{project_name} : {i} simulation Failed")
             
-            simulation_runner.desktop.release_desktop(close_projects=True, close_on_exit=True)
-            # simulation_runner.delete_project_folder()
+            if simulation_runner is not None:
+                simulation_runner.desktop.release_desktop(close_projects=True, close_on_exit=True)
+                # simulation_runner.delete_project_folder()
 
             time.sleep(10)
 
+        finally:
+            if heartbeat is not None:
+                heartbeat.stop()
+
 if __name__ == '__main__':
     main()
 
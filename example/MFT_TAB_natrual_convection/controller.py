@@ -28,6 +28,7 @@ while True:
     subprocess.run(["rm", "-rf", "log.txt"])
     subprocess.run(["rm", "-rf", "run_debug.log"])
     subprocess.run(["rm", "-rf", "simulation_num.txt"])
+    subprocess.run(["rm", "-rf", "simulation_ids"])
 
 
     time.sleep(10)
@@ -181,9 +181,7 @@ def set_design_variables(design, input_parameter):
         "N1_offset": "mm", "N2_offset": "mm", "N3_offset": "mm"
     }
 
-    for key, value in input_parameter.items():
-        # Ansys 디자인에 변수를 설정합니다.
-        unit = units.get(key, "")
-        design.set_variable(variable_name=key, value=value, unit=unit)
+    # 변수마다 AEDT transaction을 만들지 않도록 한 번의 ChangeProperty로 설정합니다.
+    design.set_variables(input_parameter, units=units)
 
     print("Ansys 디자인 변수가 설정되었습니다.")
\ No newline at end of file
@@ -1,9 +1,28 @@
+import sys
 import subprocess
 import time
 import logging
 import os
 import platform
 
+os_name = platform.system()
+if os_name == "Windows":
+    sys.path.insert(0, r"Y:/git/insulation_amp/pyaedt_library/src/")
+    sys.path.insert(0, r"C:/Users/NEC_5950X1/Desktop/git/pyaedt_library/src/")
+else :
+    # 두 가지 가능한 경로 패턴
+    possible_paths = [
+        "/gpfs/home1/r1jae262/jupyter/git/pyaedt_library/src/",
+        "/gpfs/home2/wjddn5916/Ansys_NEC/git/pyaedt_library/src/"
+    ]
+    
+    # 존재하는 경로만 sys.path에 추가
+    for path in possible_paths:
+        if os.path.exists(path):
+            sys.path.insert(0, path)
+
+from pyaedt_module.core.id_allocator import allocate_id
+
 logging.basicConfig(filename='run_debug.log', level=logging.DEBUG)
 
 script_name = "run_simulation.py"
@@ -23,24 +42,8 @@ os.makedirs(log_dir, exist_ok=True)
 
 for i in range(num_processes):
 
-    file_path = "simulog_num.txt"
-
-    # 파일이 존재하지 않으면 생성
-    if not os.path.exists(file_path):
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write("1")
-
-    # 읽기/쓰기 모드로 파일 열기
-    with open(file_path, "r+", encoding="utf-8") as file:
-
-            # 파일에서 값 읽기
-            content = int(file.read().strip())
-            content += 1
-
-            # 파일 포인터를 처음으로 되돌리고, 파일 내용 초기화 후 새 값 쓰기
-            file.seek(0)
-            file.truncate()
-            file.write(str(content))
+    # log 번호는 공유 카운터 파일 대신 IdAllocator로 할당
+    content = allocate_id("simulog_ids")
 
     log_file = open(f'./simul_log/process_{content}.log', 'w')
     p = subprocess.Popen(
@@ -50,7 +53,7 @@ for i in range(num_processes):
         stderr=subprocess.STDOUT
     )
     processes.append((p, log_file))
-    time.sleep(30)
+    # gRPC port는 pyDesktop이 노드 로컬 lock으로 예약하므로 기동 간격(sleep)을 두지 않는다
 
 for idx, (p, log_file) in enumerate(processes):
     p.wait()
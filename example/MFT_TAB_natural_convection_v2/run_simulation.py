@@ -23,6 +23,9 @@ else :
 
 import pyaedt_module
 from pyaedt_module.core import pyDesktop
+from pyaedt_module.core.id_allocator import allocate_id
+from pyaedt_module.core.wait import wait_until, remove_path
+from pyaedt_module.core.results_store import ResultsStore
 
 import time
 from datetime import datetime
@@ -33,7 +36,6 @@ import copy
 import pandas as pd
 
 import csv
-from filelock import FileLock
 import traceback
 
 from module.input_parameter import create_input_parameter, calculate_coil_parameter, calculate_coil_offset, set_design_variables
@@ -74,26 +76,10 @@ class Simulation() :
         self.NUM_CORE = 4
         self.NUM_TASK = 1
 
-        file_path = "simulation_num.txt"
-
-        # 파일이 존재하지 않으면 생성
-        if not os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write("1")
-
-        # 읽기/쓰기 모드로 파일 열기
-        with open(file_path, "r+", encoding="utf-8") as file:
-
-            # 파일에서 값 읽기
-            content = int(file.read().strip())
-            self.num = content
-            self.PROJECT_NAME = f"simulation{content}"
-            content += 1
-
-            # 파일 포인터를 처음으로 되돌리고, 파일 내용 초기화 후 새 값 쓰기
-            file.seek(0)
-            file.truncate()
-            file.write(str(content))
+        # simulation 번호는 공유 카운터 파일 대신 IdAllocator로 할당 (노드별 block 예약, lock 불필요)
+        content = allocate_id("simulation_ids")
+        self.num = content
+        self.PROJECT_NAME = f"simulation{content}"
 
         # Set up logging for this simulation
         folder_path = os.path.join(current_dir, "simulation", self.PROJECT_NAME)
@@ -227,22 +213,20 @@ class Simulation() :
 
         return results_df
 
-    def save_results_to_csv(self, results_df, filename="simulation_results.csv"):
-        """Saves the DataFrame to a CSV file in a process-safe way."""
-        lock_path = filename + ".lock"
-        with FileLock(lock_path):
-            file_exists = os.path.isfile(filename)
-            results_df.to_csv(filename, mode='a', header=not file_exists, index=False)
-        logging.info(f"Results saved to {filename}")
+    def save_results(self, results_df, directory="simulation_results"):
+        """Appends the DataFrame to the results store as a per-process shard (no cross-process lock)."""
+        path = ResultsStore(directory).append(results_df)
+        logging.info(f"Results saved to {path}")
 
 
     def second_simulation(self):
 
-        time.sleep(5)
-
         oProject = self.desktop.odesktop.SetActiveProject(self.project.name)
+        n_designs = len(oProject.GetTopDesignList())
         oProject.CopyDesign(self.maxwell_design.name)
         oProject.Paste()
+        # 고정 sleep 대신 paste된 design이 project에 나타날 때까지 polling
+        wait_until(lambda: len(oProject.GetTopDesignList()) > n_designs, timeout=30, name="design_paste")
 
         self.maxwell_design2 = self.maxwell_design.get_active_design()
 
@@ -383,14 +367,14 @@ class Simulation() :
         self.desktop.release_desktop(close_projects=True, close_on_exit=True)
 
     def delete_project_folder(self):
-        time.sleep(10)
-        try:
-            project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
-            if os.path.isdir(project_folder):
-                shutil.rmtree(project_folder)
-                logging.info(f"Successfully deleted project folder: {project_folder}")
-        except Exception as e:
-            logging.error(f"Error deleting project folder {project_folder}: {e}")
+        project_folder = os.path.join(os.getcwd(), "simulation", self.PROJECT_NAME)
+        if not os.path.isdir(project_folder):
+            return
+        # 고정 sleep 대신 AEDT가 파일을 놓는 즉시 삭제되도록 backoff 재시도
+        if remove_path(project_folder, timeout=30):
+            logging.info(f"Successfully deleted project folder: {project_folder}")
+        else:
+            logging.error(f"Error deleting project folder {project_folder}")
 
 
 def main(test=False):
@@ -450,7 +434,7 @@ def main(test=False):
             simulation_runner.get_icepak_results()
 
             # 15. 결과 저장
-            simulation_runner.save_results_to_csv(simulation_runner.results_df)
+            simulation_runner.save_results(simulation_runner.results_df)
 
             if test == True :
                 break
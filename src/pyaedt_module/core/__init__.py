@@ -2,6 +2,12 @@ from .pysystem import pySystem
 from .pydesktop import pyDesktop
 from .pyproject import pyProject
 from .scheduler import Scheduler
+from .desktop_pool import DesktopPool
+from .memory_watchdog import MemoryWatchdog
+from .worker_pool import WorkerPool
+from .job_queue import JobQueue
+from .results_store import ResultsStore, ResultCache
+from .pipeline import Pipeline, StageDAG
 
 
-__all__ = ["pySystem", "pyDesktop", "pyProject", "Scheduler"]
\ No newline at end of file
+__all__ = ["pySystem", "pyDesktop", "pyProject", "Scheduler", "DesktopPool", "MemoryWatchdog", "WorkerPool", "JobQueue", "ResultsStore", "ResultCache", "Pipeline", "StageDAG"]
\ No newline at end of file
@@ -0,0 +1,153 @@
+import os
+import time
+import psutil
+from typing import Optional
+
+
+class AdmissionController :
+    """
+    Scheduler의 동시 AEDT 프로세스 수를 노드 자원 상태에 따라 조절하는 admission controller.
+
+    - target은 max_processes에서 시작한다 (initial_processes로 변경 가능).
+    - 메모리 사용률(또는 켜져 있으면 load average)이 high watermark 이상이 되면 pressure 상태가 되어
+      목표 동시 실행 수(target)를 1 줄이고 신규 admission을 막는다 (실행 중인 solver는 건드리지 않음).
+    - pressure 상태는 메모리/로드가 모두 low watermark 이하로 내려가야 풀린다 (hysteresis).
+    - 메모리/로드가 모두 low watermark 이하이고, 프로세스 하나를 더 올릴 여유 메모리가 있으면 target을 1 늘린다.
+    - target은 cooldown초에 한 번만 바꾼다. 1분 load average는 줄인 결과가 반영되기까지 시간이 걸리므로
+      매 tick마다 줄이면 load가 내려가기 전에 target이 min_processes까지 떨어진다.
+    - 프로세스당 메모리 예상치는 probe에서 수집한 slot RSS의 최대값으로 학습한다.
+
+    load watermark는 CPU 코어 수로 나눈 1분 load average 기준이며 기본값은 None(load throttling 끔)이다.
+    AEDT solver는 코어 수만큼 thread를 쓰므로 정상 동작 중에도 load가 1.0을 넘기 쉽다.
+    기본 설정에서는 메모리 pressure만 admission을 막는다.
+
+    Example:
+        >>> admission = AdmissionController(max_processes=20, mem_high_watermark=0.9, mem_low_watermark=0.75)
+        >>> admission = AdmissionController(max_processes=20, load_high_watermark=1.5, load_low_watermark=1.2)  # load throttling 사용
+        >>> admission.update(probe_results.values())
+        >>> if admission.can_admit(running=8): ...
+    """
+
+    def __init__(
+            self,
+            min_processes: int = 1,
+            max_processes: int = 5,
+            initial_processes: Optional[int] = None,
+            mem_high_watermark: float = 0.90,
+            mem_low_watermark: float = 0.75,
+            load_high_watermark: Optional[float] = None,
+            load_low_watermark: Optional[float] = None,
+            process_mem: float = 4096,
+            cooldown: float = 60
+    ) -> None:
+        if mem_low_watermark >= mem_high_watermark:
+            raise ValueError("mem_low_watermark must be less than mem_high_watermark")
+        if load_high_watermark is not None:
+            if load_low_watermark is None:
+                load_low_watermark = 0.8 * load_high_watermark
+            if load_low_watermark >= load_high_watermark:
+                raise ValueError("load_low_watermark must be less than load_high_watermark")
+
+        self.min_processes = min_processes
+        self.max_processes = max_processes
+        self.mem_high_watermark = mem_high_watermark
+        self.mem_low_watermark = mem_low_watermark
+        self.load_high_watermark = load_high_watermark # None이면 load average로 throttling 하지 않음
+        self.load_low_watermark = load_low_watermark
+        self.process_mem = process_mem # MB, probe 결과가 없을 때 쓰는 프로세스당 메모리 예상치
+        self.cooldown = cooldown # target 변경 사이의 최소 간격 (초)
+
+        if initial_processes is None:
+            initial_processes = max_processes
+        self.target = max(min_processes, min(initial_processes, max_processes))
+
+        self.mem_ratio = 0.0
+        self.load_ratio = 0.0
+        self.available_mem = 0.0
+        self.total_mem = 0.0
+        self.pressure = False
+        self.last_adjusted = None # target을 마지막으로 바꾼 시각 (time.monotonic)
+
+
+    def sample(self) -> None:
+        """Samples free RAM and the 1-minute load average of the node."""
+        vm = psutil.virtual_memory()
+        self.mem_ratio = vm.percent / 100
+        self.available_mem = vm.available / (1024 * 1024)
+        self.total_mem = vm.total / (1024 * 1024)
+
+        try:
+            load1 = psutil.getloadavg()[0]
+        except (AttributeError, OSError):
+            load1 = 0.0
+        self.load_ratio = load1 / (os.cpu_count() or 1)
+
+
+    def update(self, probe_results=(), running: Optional[int] = None) -> int:
+        """
+        Re-evaluates the target concurrency.
+
+        Args:
+            probe_results: ProbeResult (or (state, aedt_pid, cpu_usage, ram_usage)) tuples of the running slots.
+            running: Number of active processes. If given, the target is only raised once it is reached,
+                so that freshly started processes can show their memory usage first.
+
+        Returns:
+            int: The new target number of concurrent processes.
+        """
+        ram_usage = [result[3] for result in probe_results if result[0] == 1 and result[3] > 0]
+        if ram_usage:
+            # 가장 무거운 slot 기준으로 보수적으로 잡는다
+            self.process_mem = max(ram_usage)
+
+        self.sample()
+
+        use_load = self.load_high_watermark is not None
+        high = self.mem_ratio >= self.mem_high_watermark or (use_load and self.load_ratio >= self.load_high_watermark)
+        low = self.mem_ratio <= self.mem_low_watermark and (not use_load or self.load_ratio <= self.load_low_watermark)
+
+        # high watermark에서 들어가고 low watermark에서 나온다 (그 사이에서는 이전 상태 유지)
+        if high:
+            self.pressure = True
+        elif low:
+            self.pressure = False
+
+        now = time.monotonic()
+        if self.last_adjusted is not None and now - self.last_adjusted < self.cooldown:
+            return self.target
+
+        target = self.target
+        if high:
+            target = max(self.min_processes, self.target - 1)
+        elif (low
+              and (running is None or running >= self.target)
+              and self._has_headroom()):
+            target = min(self.max_processes, self.target + 1)
+
+        if target != self.target:
+            self.target = target
+            self.last_adjusted = now
+
+        return self.target
+
+
+    def can_admit(self, running: int) -> bool:
+        """Returns True if one more process may be started while `running` processes are active."""
+        if running >= self.target:
+            return False
+        if self.pressure:
+            return False
+        return self._has_headroom()
+
+
+    def _has_headroom(self) -> bool:
+        # 새 프로세스를 올려도 high watermark를 넘지 않는지 확인
+        if self.total_mem <= 0:
+            return False
+        used_after = self.total_mem - self.available_mem + self.process_mem
+        return used_after / self.total_mem < self.mem_high_watermark
+
+
+    def __repr__(self) :
+        return (f"AdmissionController(target={self.target}, mem={self.mem_ratio:.2f}, "
+                f"load={self.load_ratio:.2f}, process_mem={self.process_mem:.0f}MB, pressure={self.pressure})")
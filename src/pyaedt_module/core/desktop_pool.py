@@ -0,0 +1,221 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+import psutil
+
+from .process_probe import kill_tree
+
+
+class _Session :
+    """Pool bookkeeping for one pyDesktop."""
+
+    __slots__ = ("desktop", "uses", "created", "last_used")
+
+    def __init__(self, desktop) -> None:
+        self.desktop = desktop
+        self.uses = 0
+        self.created = time.time()
+        self.last_used = self.created
+
+
+class DesktopPool :
+    """
+    Warm pyDesktop session pool.
+
+    acquire()는 쉬고 있는 healthy session을 재사용하고, 없으면 size까지 새로 띄운다 (다 쓰는 중이면 대기).
+    release()는 project를 닫는 soft reset만 하고 session을 pool로 돌려보내므로
+    sample마다 20~60초의 AEDT 기동 비용을 내지 않는다.
+
+    session은 다음 경우에만 종료(recycle)된다.
+    - max_uses번 사용했을 때
+    - AEDT 프로세스 RSS가 max_rss(MB)를 넘었을 때
+    - health check(odesktop.GetVersion) 또는 soft reset이 실패했을 때
+
+    Example:
+        >>> pool = DesktopPool(size=1, desktop_kwargs={"non_graphical": True}, max_uses=20, max_rss=16000)
+        >>> with pool.session() as desktop:
+        ...     project = desktop.create_project()
+        ...     ...
+        >>> pool.close()
+    """
+
+    def __init__(
+            self,
+            size: int = 1,
+            desktop_kwargs: Optional[dict] = None,
+            max_uses: Optional[int] = 20,
+            max_rss: Optional[float] = None,
+            delete_projects: bool = True
+    ) -> None:
+        self.size = size
+        self.desktop_kwargs = desktop_kwargs or {}
+        self.max_uses = max_uses
+        self.max_rss = max_rss
+        self.delete_projects = delete_projects
+
+        self._idle = []
+        self._busy = {} # id(desktop) -> _Session
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.n_created = 0
+        self.n_recycled = 0
+        self.n_reused = 0
+
+
+    def __enter__(self) :
+        return self
+
+    def __exit__(self, exc_type, exc, tb) :
+        self.close()
+        return False
+
+
+    def _create(self):
+        from .pydesktop import pyDesktop
+        desktop = pyDesktop(**self.desktop_kwargs)
+        self.n_created += 1
+        return desktop
+
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Returns a ready pyDesktop (warm if possible).
+
+        Raises:
+            TimeoutError: If no session became available within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        dead = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DesktopPool is closed")
+
+                    while self._idle:
+                        session = self._idle.pop()
+                        if session.desktop.is_healthy():
+                            self._busy[id(session.desktop)] = session
+                            self.n_reused += 1
+                            return session.desktop
+                        dead.append(session)
+
+                    if len(self._busy) < self.size:
+                        # 기동 중에는 다른 thread가 size를 넘지 않도록 자리를 먼저 잡는다
+                        placeholder = object()
+                        self._busy[id(placeholder)] = None
+                        break
+
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No desktop session available")
+                    self._cond.wait(remaining)
+        finally:
+            # 죽은 session 정리는 lock 밖에서
+            for session in dead:
+                self._discard(session)
+
+        try:
+            desktop = self._create()
+        except Exception:
+            with self._cond:
+                del self._busy[id(placeholder)]
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            del self._busy[id(placeholder)]
+            self._busy[id(desktop)] = _Session(desktop)
+        return desktop
+
+
+    def release(self, desktop, reset: bool = True) -> bool:
+        """
+        Returns a session to the pool after a soft reset, or recycles it if a recycle condition is met.
+
+        Returns:
+            bool: True if the session was kept warm, False if it was recycled.
+        """
+        with self._cond:
+            session = self._busy.pop(id(desktop), None)
+        if session is None:
+            raise ValueError("desktop was not acquired from this pool")
+
+        session.uses += 1
+        session.last_used = time.time()
+
+        keep = not self._closed
+        if keep and reset:
+            try:
+                desktop.soft_reset(delete_projects=self.delete_projects)
+            except Exception as e:
+                print(f"Warning: soft reset failed, recycling desktop ({e})")
+                keep = False
+        if keep and self.max_uses is not None and session.uses >= self.max_uses:
+            keep = False
+        if keep and self.max_rss is not None and desktop.rss > self.max_rss:
+            print(f"Desktop RSS {desktop.rss:.0f}MB > {self.max_rss:.0f}MB, recycling")
+            keep = False
+        if keep and not desktop.is_healthy():
+            keep = False
+
+        if not keep:
+            self._discard(session)
+        with self._cond:
+            if keep:
+                self._idle.append(session)
+            self._cond.notify()
+        return keep
+
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Context manager around acquire/release."""
+        desktop = self.acquire(timeout)
+        try:
+            yield desktop
+        finally:
+            self.release(desktop)
+
+
+    def _discard(self, session: _Session) -> None:
+        with self._cond:
+            self.n_recycled += 1
+        desktop = session.desktop
+        pid = desktop.pid # release_desktop 뒤에는 session이 끊겨 desktop으로 프로세스 상태를 알 수 없으므로 미리 잡아둔다
+        try:
+            desktop.release_desktop(close_projects=True, close_on_exit=True)
+        except Exception:
+            desktop.kill_process()
+        # release_desktop이 프로세스를 못 끝낸 경우 정리 (is_healthy는 끊긴 session에서 항상 False)
+        if pid and psutil.pid_exists(pid):
+            kill_tree(pid)
+
+
+    def close(self) -> None:
+        """Shuts down every idle session; busy sessions are shut down when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for session in idle:
+            self._discard(session)
+
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "idle": len(self._idle),
+                "busy": len(self._busy),
+                "created": self.n_created,
+                "reused": self.n_reused,
+                "recycled": self.n_recycled,
+            }
+
+
+    def __repr__(self) :
+        stats = self.stats()
+        return f"DesktopPool(size={self.size}, idle={stats['idle']}, busy={stats['busy']}, reused={stats['reused']})"
@@ -0,0 +1,177 @@
+import re
+import ast
+import math
+from functools import lru_cache
+from typing import Optional
+
+from . import units
+
+
+class ExpressionError(ValueError):
+    """Raised when an AEDT expression cannot be evaluated locally (syntax, unknown name/unit, cycle)."""
+
+
+# 숫자 바로 뒤에 붙은 unit (e.g. "3mm", "1.5e-3m", "30deg"), identifier 안의 숫자(N1_coil)는 제외
+_NUMBER_WITH_UNIT = re.compile(r"(?<![\w.])((?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?![eE][-+]?\d)([A-Za-z_]\w*)")
+
+_FUNCTIONS = {
+    "abs": abs, "min": min, "max": max,
+    "sqrt": math.sqrt, "exp": math.exp, "ln": math.log, "log": math.log, "log10": math.log10,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan, "atan2": math.atan2,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh,
+    "floor": math.floor, "ceil": math.ceil, "round": round,
+    "sign": lambda x: (x > 0) - (x < 0),
+    "even": lambda x: float(int(x) % 2 == 0), "odd": lambda x: float(int(x) % 2 == 1),
+}
+_CONSTANTS = {"pi": math.pi, "PI": math.pi, "e": math.e}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv, ast.UAdd, ast.USub,
+)
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> tuple:
+    """
+    Validates and compiles an AEDT expression once.
+
+    AEDT 문법을 Python으로 바꾼 뒤(^ -> **, 3mm -> 3*0.001) AST를 검사해서
+    숫자/변수/사칙연산/허용된 함수 호출 외의 node(attribute, subscript, lambda, ...)가 있으면 거부한다.
+
+    Returns:
+        tuple: (code object, frozenset of variable names used by the expression)
+
+    Raises:
+        ExpressionError: On syntax errors, unknown units or disallowed constructs.
+    """
+    def _unit(match):
+        number, unit = match.groups()
+        if unit not in units.UNITS:
+            raise ExpressionError(f"Unknown unit '{unit}' in '{expression}'")
+        _, scale, offset = units.UNITS[unit]
+        if offset:
+            return f"({number}*{scale!r}+{offset!r})"
+        return f"({number}*{scale!r})"
+
+    source = _NUMBER_WITH_UNIT.sub(_unit, str(expression).strip()).replace("^", "**")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression '{expression}': {e.msg}") from None
+
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"Unsupported syntax '{type(node).__name__}' in '{expression}'")
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ExpressionError(f"Unsupported constant {node.value!r} in '{expression}'")
+            # 정수 거듭제곱(9^9^9)이 큰 정수 계산으로 멈추지 않도록 float로 계산 (overflow는 ExpressionError)
+            node.value = float(node.value)
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+                raise ExpressionError(f"Unsupported function call in '{expression}'")
+        elif isinstance(node, ast.Name) and node.id not in _FUNCTIONS and node.id not in _CONSTANTS:
+            names.add(node.id)
+
+    return compile(tree, "<aedt-expression>", "eval"), frozenset(names)
+
+
+class ExpressionEvaluator :
+    """
+    Safe local evaluator for AEDT variable expressions.
+
+    "-(2)*((N1_coil_diameter) + (N1_coil_zgap)) + (offset)" 같은 문자열을 design 변수 값으로 풀어서 float로 계산한다.
+    AEDT에 보내기 전에 geometry를 Python에서 미리 계산/검증할 수 있고, parametric link가 필요 없는 곳에는 숫자 좌표를 보낼 수 있다.
+
+    - 값은 SI 단위로 계산된다 ("3mm" -> 0.003). evaluate(unit="mm")로 원하는 unit으로 받을 수 있다.
+    - 변수 값이 다시 수식이면 재귀적으로 풀고 (순환 참조는 ExpressionError), 결과는 cache한다.
+    - expression 문자열마다 compile 결과를 LRU cache하므로 같은 수식을 반복해서 parsing하지 않는다.
+
+    Example:
+        >>> evaluator = ExpressionEvaluator({"w1": "3mm", "N1_space_w": "0.5mm", "k": "2*w1"})
+        >>> evaluator.evaluate("w1 + 2*N1_space_w", unit="mm")   # 4.0
+        >>> evaluator.evaluate("k")                              # 0.006
+    """
+
+    def __init__(self, variables: Optional[dict] = None) -> None:
+        self.variables = dict(variables or {})
+        self._resolved = {}
+        self._resolving = set()
+
+
+    @classmethod
+    def from_design(cls, design) -> "ExpressionEvaluator":
+        """Builds an evaluator from the design's variable snapshot (pyDesign.variables)."""
+        return cls(design.variables)
+
+
+    def update(self, variables: dict) -> None:
+        """Sets/overrides variable values (resolved values are recomputed)."""
+        self.variables.update(variables)
+        self._resolved.clear()
+
+
+    def _resolve(self, name: str) -> float:
+        if name in self._resolved:
+            return self._resolved[name]
+        if name not in self.variables:
+            raise ExpressionError(f"Unknown variable '{name}'")
+        if name in self._resolving:
+            raise ExpressionError(f"Circular reference through '{name}'")
+
+        self._resolving.add(name)
+        try:
+            value = self.variables[name]
+            if isinstance(value, str):
+                value = self._evaluate(value)
+            value = float(value)
+        finally:
+            self._resolving.discard(name)
+        self._resolved[name] = value
+        return value
+
+
+    def _evaluate(self, expression) -> float:
+        if not isinstance(expression, str):
+            return float(expression)
+        code, names = compile_expression(expression)
+        namespace = dict(_FUNCTIONS)
+        namespace.update(_CONSTANTS)
+        for name in names:
+            namespace[name] = self._resolve(name)
+        try:
+            return float(eval(code, {"__builtins__": {}}, namespace))
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(f"Cannot evaluate '{expression}': {e}") from None
+
+
+    def evaluate(self, expression, unit: Optional[str] = None) -> float:
+        """
+        Evaluates `expression` (str or number).
+
+        Args:
+            expression: AEDT expression, e.g. "(w1)/2 + (N1_coil_diameter)/2".
+            unit: Unit of the result (e.g. "mm"). None이면 SI 값.
+
+        Raises:
+            ExpressionError: If the expression cannot be evaluated.
+        """
+        value = self._evaluate(expression)
+        if unit:
+            try:
+                _, scale, offset = units.UNITS[unit]
+            except KeyError:
+                raise ExpressionError(f"Unknown unit '{unit}'") from None
+            value = (value - offset) / scale
+        return value
+
+
+    def __call__(self, expression, unit: Optional[str] = None) -> float:
+        return self.evaluate(expression, unit)
+
+
+    def __repr__(self) :
+        return f"ExpressionEvaluator(variables={len(self.variables)}, resolved={len(self._resolved)})"
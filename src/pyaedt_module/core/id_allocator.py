@@ -0,0 +1,162 @@
+import os
+import shutil
+import socket
+import hashlib
+import tempfile
+from typing import Optional
+
+
+class IdAllocator :
+    """
+    공유 카운터 파일(simulation_num.txt) 없이 simulation ID를 할당하는 allocator.
+
+    - 공유 디렉토리(GPFS 등)에서는 block_size개 ID 묶음(block)을 atomic mkdir로 예약한다.
+      mkdir은 이미 존재하면 실패하므로 lock 없이도 block이 중복 예약되지 않고,
+      공유 파일시스템 metadata 접근은 block당 한 번뿐이다.
+    - 예약한 block 안의 개별 ID는 노드 로컬 디렉토리(temp)에 O_EXCL 파일 생성으로 claim 하므로
+      같은 노드의 여러 프로세스가 하나의 block을 나눠 쓴다.
+
+    ID는 항상 유일하지만 연속적이지는 않다 (노드마다 다른 block을 사용).
+
+    Example:
+        >>> allocator = IdAllocator("simulation_ids")
+        >>> num = allocator.allocate()  # 1, 2, ... (노드마다 1000 단위 block)
+        >>> project_name = f"simulation{num}"
+    """
+
+    BLOCK_PREFIX = "block_"
+
+    def __init__(self, directory: str = "simulation_ids", block_size: int = 1000, start: int = 1,
+                 local_dir: Optional[str] = None) -> None:
+        self.directory = os.path.abspath(directory)
+        self.block_size = block_size
+        self.start = start
+
+        if local_dir is None:
+            # 공유 디렉토리 경로별로 로컬 디렉토리를 분리
+            key = hashlib.sha1(self.directory.encode("utf-8")).hexdigest()[:12]
+            local_dir = os.path.join(tempfile.gettempdir(), "pyaedt_ids", key)
+        self.local_dir = local_dir
+
+        os.makedirs(self.directory, exist_ok=True)
+        os.makedirs(self.local_dir, exist_ok=True)
+
+        self._block = None
+        self._cursor = None
+
+
+    def allocate(self) -> int:
+        """
+        Returns a new unique ID.
+        """
+        while True:
+            if self._block is None:
+                self._block = self._local_block()
+                if self._block is None:
+                    self._block = self._reserve_block()
+                self._cursor = None
+
+            num = self._claim_in_block(self._block)
+            if num is not None:
+                return num
+
+            # 현재 block 소진 -> 새 block 예약
+            self._block = self._reserve_block()
+            self._cursor = None
+
+
+    def _block_range(self, block: int) -> range:
+        first = self.start + block * self.block_size
+        return range(first, first + self.block_size)
+
+
+    @classmethod
+    def _list_blocks(cls, directory: str) -> list:
+        blocks = []
+        for entry in os.listdir(directory):
+            if entry.startswith(cls.BLOCK_PREFIX):
+                try:
+                    blocks.append(int(entry[len(cls.BLOCK_PREFIX):]))
+                except ValueError:
+                    pass
+        return blocks
+
+
+    def _local_block(self) -> Optional[int]:
+        """Latest block already reserved by this host (shared by every process on the node)."""
+        blocks = self._list_blocks(self.local_dir)
+        if not blocks:
+            return None
+        block = max(blocks)
+        # 공유 디렉토리가 초기화된 경우(새 캠페인) 로컬 기록은 무효 -> 소유자가 이 노드인지 확인
+        try:
+            with open(os.path.join(self.directory, f"{self.BLOCK_PREFIX}{block}", "owner"), "r", encoding="utf-8") as file:
+                owner = file.read().split(":")[0]
+        except OSError:
+            return None
+        return block if owner == socket.gethostname() else None
+
+
+    def _reserve_block(self) -> int:
+        """Reserves the next free block on the shared directory with an atomic mkdir."""
+        blocks = self._list_blocks(self.directory)
+        block = max(blocks) + 1 if blocks else 0
+        while True:
+            path = os.path.join(self.directory, f"{self.BLOCK_PREFIX}{block}")
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                block += 1
+                continue
+            # 이전 캠페인에서 남은 로컬 기록은 지운다.
+            # owner를 쓰기 전에 비워야 같은 노드의 _local_block이 이전 claim 기록을 이어 쓰지 않는다 (ID 중복)
+            local_block_dir = os.path.join(self.local_dir, f"{self.BLOCK_PREFIX}{block}")
+            shutil.rmtree(local_block_dir, ignore_errors=True)
+            os.makedirs(local_block_dir, exist_ok=True)
+            try:
+                tmp_path = os.path.join(path, f"owner.{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    file.write(f"{socket.gethostname()}:{os.getpid()}")
+                os.replace(tmp_path, os.path.join(path, "owner"))
+            except OSError:
+                pass
+            return block
+
+
+    def _claim_in_block(self, block: int) -> Optional[int]:
+        """Claims the next free ID of the block on the local filesystem with O_EXCL."""
+        block_dir = os.path.join(self.local_dir, f"{self.BLOCK_PREFIX}{block}")
+        os.makedirs(block_dir, exist_ok=True)
+
+        id_range = self._block_range(block)
+        if self._cursor is None:
+            # 이미 claim된 개수만큼 건너뛰고 시작 (O_EXCL이 최종 판정)
+            self._cursor = id_range.start + len(os.listdir(block_dir))
+
+        for num in range(max(self._cursor, id_range.start), id_range.stop):
+            try:
+                fd = os.open(os.path.join(block_dir, str(num)), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            self._cursor = num + 1
+            return num
+
+        # 앞쪽에 남은 ID가 있는지 한 번 더 확인 (동시 실행 중 cursor를 건너뛴 경우)
+        for num in range(id_range.start, min(self._cursor, id_range.stop)):
+            try:
+                fd = os.open(os.path.join(block_dir, str(num)), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return num
+
+        self._cursor = id_range.stop
+        return None
+
+
+def allocate_id(directory: str = "simulation_ids", block_size: int = 1000, start: int = 1) -> int:
+    """
+    Allocates one ID with a fresh IdAllocator (convenience wrapper for one-shot scripts).
+    """
+    return IdAllocator(directory, block_size=block_size, start=start).allocate()
@@ -0,0 +1,346 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Optional
+
+from .slot_store import _json_default
+
+
+Job = namedtuple("Job", ["job_id", "params", "attempts", "worker_id"])
+
+# job status
+QUEUED = "queued"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+
+ENV_QUEUE_PATH = "PYAEDT_JOB_QUEUE"
+ENV_WORKER_ID = "PYAEDT_WORKER_ID"
+
+
+def default_worker_id() -> str:
+    """Worker id used for claims: PYAEDT_WORKER_ID if set by the Scheduler, otherwise host:pid."""
+    return os.environ.get(ENV_WORKER_ID) or f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue :
+    """
+    SQLite(WAL) 기반의 durable job queue.
+
+    parameter set을 미리 대량으로 넣어두고, Scheduler가 띄운 script나 WorkerPool worker가
+    claim -> complete/fail 순서로 소비한다.
+
+    - claim은 BEGIN IMMEDIATE 트랜잭션 안에서 수행되어 여러 프로세스가 동시에 claim해도 중복이 없다.
+    - claim된 job은 lease_timeout 동안 해당 worker 소유이며, heartbeat로 lease를 연장한다.
+    - lease가 만료되거나 worker가 죽으면(requeue_worker) 다시 queued 상태로 돌아간다.
+    - 같은 parameter set(json 기준)은 한 번만 들어간다.
+
+    WAL은 shared memory를 쓰므로 DB 파일은 GPFS/NFS가 아닌 노드 로컬 디스크에 두어야 한다.
+
+    Example:
+        >>> queue = JobQueue("/tmp/mft_jobs.db")
+        >>> queue.put_many(ParameterSampler(space).sample(5000, SamplingStrategy.LHS))
+        >>> job = queue.claim()
+        >>> queue.complete(job.job_id, job.worker_id)
+    """
+
+    def __init__(self, path: str = "job_queue.db", lease_timeout: float = 2 * 3600, max_attempts: int = 3) -> None:
+        self.path = os.path.abspath(path)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        self._conn = None
+        self._conn_pid = None
+
+        self._init_schema()
+
+
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional["JobQueue"]:
+        """Opens the queue given by the PYAEDT_JOB_QUEUE environment variable (set by Scheduler), or returns None."""
+        path = os.environ.get(ENV_QUEUE_PATH)
+        if not path:
+            return None
+        return cls(path, **kwargs)
+
+
+    def __getstate__(self) :
+        # WorkerPool(spawn) 등으로 전달될 때 connection은 넘기지 않는다
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_conn_pid"] = None
+        return state
+
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # sqlite connection은 fork 후 공유하면 안되므로 프로세스마다 새로 연다
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+
+    def _init_schema(self) -> None:
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+                params      TEXT NOT NULL,
+                params_key  TEXT NOT NULL UNIQUE,
+                status      TEXT NOT NULL DEFAULT 'queued',
+                worker_id   TEXT,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                created     REAL NOT NULL,
+                claimed     REAL,
+                finished    REAL,
+                result      TEXT,
+                error       TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, job_id);
+            """
+        )
+
+
+    def close(self) -> None:
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+    @staticmethod
+    def _params_key(params: dict) -> str:
+        return json.dumps(params, sort_keys=True, default=_json_default)
+
+
+    def put(self, params: dict) -> Optional[int]:
+        """
+        Enqueues one parameter set.
+
+        Returns:
+            int or None: The new job id, or None if the same parameter set is already queued.
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (params, params_key, created) VALUES (?, ?, ?)",
+            (json.dumps(params, default=_json_default), self._params_key(params), time.time())
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+
+    def put_many(self, param_list) -> int:
+        """
+        Enqueues a batch of parameter sets in a single transaction (duplicates are skipped).
+
+        Returns:
+            int: Number of newly queued jobs.
+        """
+        now = time.time()
+        rows = [(json.dumps(params, default=_json_default), self._params_key(params), now) for params in param_list]
+        conn = self.conn
+        before = conn.total_changes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO jobs (params, params_key, created) VALUES (?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+
+    def claim(self, worker_id: Optional[str] = None) -> Optional[Job]:
+        """
+        Atomically claims the oldest queued job.
+
+        Returns:
+            Job or None: The claimed job, or None if nothing is queued.
+        """
+        if worker_id is None:
+            worker_id = default_worker_id()
+
+        now = time.time()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id, params, attempts FROM jobs WHERE status = ? ORDER BY job_id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, params, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = ?, claimed = ?, lease_until = ? WHERE job_id = ?",
+                (CLAIMED, worker_id, attempts + 1, now, now + self.lease_timeout, job_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return Job(job_id, json.loads(params), attempts + 1, worker_id)
+
+
+    def heartbeat(self, job_id: int, worker_id: Optional[str] = None) -> bool:
+        """Extends the lease of a claimed job. Returns False if the job is no longer owned by this worker."""
+        if worker_id is None:
+            worker_id = default_worker_id()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND status = ? AND worker_id = ?",
+            (time.time() + self.lease_timeout, job_id, CLAIMED, worker_id)
+        )
+        return cursor.rowcount > 0
+
+
+    def complete(self, job_id: int, worker_id: Optional[str] = None, result=None) -> bool:
+        """
+        Marks a job claimed by `worker_id` as done.
+
+        lease 만료로 다른 worker에게 넘어간 job은 건드리지 않는다 (늦게 끝난 worker가 새 소유자의 row를 덮어쓰지 않도록).
+
+        Returns:
+            bool: False if the job is no longer claimed by this worker.
+        """
+        if worker_id is None:
+            worker_id = default_worker_id()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ?, finished = ?, lease_until = NULL, result = ? WHERE job_id = ? AND status = ? AND worker_id = ?",
+            (DONE, time.time(), None if result is None else json.dumps(result, default=_json_default), job_id, CLAIMED, worker_id)
+        )
+        return cursor.rowcount > 0
+
+
+    def fail(self, job_id: int, worker_id: Optional[str] = None, error: str = "", retry: bool = True) -> bool:
+        """
+        Marks a job claimed by `worker_id` as failed. With retry=True it is requeued until max_attempts is reached.
+
+        Returns:
+            bool: False if the job is no longer claimed by this worker (이미 done이거나 다른 worker에게 넘어간 경우).
+        """
+        if worker_id is None:
+            worker_id = default_worker_id()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE job_id = ? AND status = ? AND worker_id = ?", (job_id, CLAIMED, worker_id)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return False
+            if retry and row[0] < self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, lease_until = NULL, error = ? WHERE job_id = ?",
+                    (QUEUED, error, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished = ?, lease_until = NULL, error = ? WHERE job_id = ?",
+                    (FAILED, time.time(), error, job_id)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+
+    def requeue_expired(self) -> int:
+        """
+        Requeues claimed jobs whose lease has expired (jobs over max_attempts are marked failed).
+
+        Returns:
+            int: Number of jobs requeued.
+        """
+        return self._requeue("status = ? AND lease_until < ?", (CLAIMED, time.time()), "lease expired")
+
+
+    def requeue_worker(self, worker_id: str) -> int:
+        """
+        Requeues every job still claimed by a dead worker.
+
+        Returns:
+            int: Number of jobs requeued.
+        """
+        return self._requeue("status = ? AND worker_id = ?", (CLAIMED, worker_id), f"worker {worker_id} died")
+
+
+    def _requeue(self, where: str, args: tuple, reason: str) -> int:
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"UPDATE jobs SET status = ?, finished = ?, lease_until = NULL, error = ? WHERE {where} AND attempts >= ?",
+                (FAILED, time.time(), reason) + args + (self.max_attempts,)
+            )
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = ?, worker_id = NULL, lease_until = NULL, error = ? WHERE {where}",
+                (QUEUED, reason) + args
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+
+    def stats(self) -> dict:
+        """Returns the number of jobs per status."""
+        counts = {QUEUED: 0, CLAIMED: 0, DONE: 0, FAILED: 0}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        return counts
+
+
+    def pending(self) -> int:
+        """Number of jobs that are queued or still being worked on."""
+        stats = self.stats()
+        return stats[QUEUED] + stats[CLAIMED]
+
+
+    def __len__(self) :
+        return self.stats()[QUEUED]
+
+
+class Heartbeat :
+    """
+    Background thread that keeps extending the lease of a claimed job while it runs.
+
+    lease_timeout보다 오래 걸리는 job이 실행 중에 requeue_expired로 다른 worker에게 넘어가지 않도록 한다.
+
+    Example:
+        >>> job = queue.claim()
+        >>> with Heartbeat(queue, job.job_id, job.worker_id):
+        ...     run(job.params)
+    """
+
+    def __init__(self, job_queue: JobQueue, job_id: int, worker_id: str) :
+        self._stop = threading.Event()
+        interval = max(1.0, job_queue.lease_timeout / 3)
+        self._thread = threading.Thread(target=self._run, args=(job_queue, job_id, worker_id, interval), daemon=True)
+        self._thread.start()
+
+    def _run(self, job_queue, job_id, worker_id, interval) :
+        # heartbeat용 connection은 thread 전용으로 따로 연다
+        queue = JobQueue(job_queue.path, lease_timeout=job_queue.lease_timeout, max_attempts=job_queue.max_attempts)
+        while not self._stop.wait(interval):
+            queue.heartbeat(job_id, worker_id)
+        queue.close()
+
+    def stop(self) :
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) :
+        return self
+
+    def __exit__(self, *exc) :
+        self.stop()
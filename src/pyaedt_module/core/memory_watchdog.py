@@ -0,0 +1,192 @@
+import gc
+import os
+import json
+import time
+import psutil
+from collections import namedtuple, deque
+from typing import Callable, Optional
+
+
+RssSample = namedtuple("RssSample", ["time", "iteration", "python_rss", "aedt_rss", "system_mem"])
+
+
+class MemoryWatchdog :
+    """
+    Memory-leak watchdog for long in-process simulation loops.
+
+    iteration 사이마다 Python 프로세스 RSS와 AEDT 프로세스 트리 RSS(pyDesktop.pid 기준), 노드 메모리 사용률을 샘플링하고,
+    threshold를 넘거나 최근 window 동안의 RSS 증가 추세가 growth_limit를 넘으면 recycle 사유를 돌려준다.
+    노드 메모리 사용률은 노드 전체 신호라서 같은 노드의 모든 slot이 동시에 recycle하지 않도록,
+    기본적으로 이 slot의 AEDT 프로세스 트리가 노드에서 가장 큰 AEDT일 때만 recycle 사유가 된다.
+    샘플은 log_file(JSONL)에 한 줄씩 추가되어 RSS 추세를 나중에 확인할 수 있다.
+
+    Example:
+        >>> watchdog = MemoryWatchdog(python_rss_limit=4096, aedt_rss_limit=32000, log_file="memory_log.jsonl")
+        >>> for i in range(5000):
+        ...     ...
+        ...     reason = watchdog.check(desktop, iteration=i)
+        ...     if reason:
+        ...         desktop = watchdog.recycle(desktop, restart=lambda: pyDesktop(non_graphical=True))
+    """
+
+    def __init__(
+            self,
+            python_rss_limit: Optional[float] = None,
+            aedt_rss_limit: Optional[float] = None,
+            system_mem_limit: Optional[float] = 0.90,
+            growth_limit: Optional[float] = None,
+            window: int = 20,
+            log_file: Optional[str] = None,
+            system_mem_largest_only: bool = True
+    ) -> None:
+        """
+        Args:
+            python_rss_limit: Python process RSS threshold in MB.
+            aedt_rss_limit: AEDT process tree RSS threshold in MB.
+            system_mem_limit: Node memory usage ratio (0~1) threshold, checked before the node starts swapping.
+            growth_limit: Python RSS growth threshold in MB per iteration, fitted over the last `window` samples.
+            window: Number of samples kept for the trend.
+            log_file: JSONL file the samples are appended to (None disables logging).
+            system_mem_largest_only: Recycle on system_mem_limit only if this slot's AEDT process tree is the largest
+                AEDT tree on the node (False: every slot over the limit recycles).
+        """
+        self.python_rss_limit = python_rss_limit
+        self.aedt_rss_limit = aedt_rss_limit
+        self.system_mem_limit = system_mem_limit
+        self.growth_limit = growth_limit
+        self.window = window
+        self.log_file = log_file
+        self.system_mem_largest_only = system_mem_largest_only
+
+        self.samples = deque(maxlen=window)
+        self.n_recycles = 0
+        self.last_reason = None
+
+        self._process = psutil.Process(os.getpid())
+        self._aedt_pid = None
+
+
+    def sample(self, desktop=None, iteration: Optional[int] = None) -> RssSample:
+        """Samples the Python RSS, the AEDT RSS (if a desktop is given) and the node memory usage."""
+        python_rss = self._process.memory_info().rss / (1024 * 1024)
+        aedt_rss = 0.0
+        self._aedt_pid = None
+        if desktop is not None:
+            try:
+                aedt_rss = desktop.rss
+                self._aedt_pid = desktop.pid
+            except Exception:
+                aedt_rss = 0.0
+        if iteration is None:
+            iteration = self.samples[-1].iteration + 1 if self.samples else 0
+
+        sample = RssSample(time.time(), iteration, python_rss, aedt_rss, psutil.virtual_memory().percent / 100)
+        self.samples.append(sample)
+
+        if self.log_file is not None:
+            with open(self.log_file, mode="a", encoding="utf-8") as file:
+                file.write(json.dumps({"pid": self._process.pid, **sample._asdict(), "trend": self.trend()}) + "\n")
+        return sample
+
+
+    def trend(self, field: str = "python_rss") -> float:
+        """Least-squares slope of `field` in MB per iteration over the current window (0 with < 2 samples)."""
+        if len(self.samples) < 2:
+            return 0.0
+        xs = [sample.iteration for sample in self.samples]
+        ys = [getattr(sample, field) for sample in self.samples]
+        n = len(xs)
+        mean_x = sum(xs) / n
+        mean_y = sum(ys) / n
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        if var_x == 0:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+    def should_recycle(self) -> Optional[str]:
+        """Returns the recycle reason for the latest sample, or None."""
+        if not self.samples:
+            return None
+        sample = self.samples[-1]
+        if self.python_rss_limit is not None and sample.python_rss > self.python_rss_limit:
+            return f"python RSS {sample.python_rss:.0f}MB > {self.python_rss_limit:.0f}MB"
+        if self.aedt_rss_limit is not None and sample.aedt_rss > self.aedt_rss_limit:
+            return f"AEDT RSS {sample.aedt_rss:.0f}MB > {self.aedt_rss_limit:.0f}MB"
+        if self.system_mem_limit is not None and sample.system_mem > self.system_mem_limit:
+            if not self.system_mem_largest_only or self._is_largest_aedt(sample.aedt_rss):
+                return f"node memory {sample.system_mem:.0%} > {self.system_mem_limit:.0%}"
+        if self.growth_limit is not None and len(self.samples) == self.window:
+            growth = self.trend()
+            if growth > self.growth_limit:
+                return f"python RSS growing {growth:.1f}MB/iteration > {self.growth_limit:.1f}MB/iteration"
+        return None
+
+
+    @staticmethod
+    def _tree_rss(proc) -> float:
+        rss = 0
+        try:
+            procs = [proc] + proc.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return 0.0
+        for p in procs:
+            try:
+                rss += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return rss / (1024 * 1024)
+
+
+    def _is_largest_aedt(self, aedt_rss: float) -> bool:
+        """True if no other AEDT process (same executable name) on the node has a larger process tree than ours."""
+        if self._aedt_pid is None or aedt_rss <= 0:
+            return False
+        try:
+            name = psutil.Process(self._aedt_pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, TypeError, ValueError):
+            return False
+        for proc in psutil.process_iter(["pid", "name"]):
+            if proc.info["pid"] == self._aedt_pid or proc.info["name"] != name:
+                continue
+            if self._tree_rss(proc) > aedt_rss:
+                return False
+        return True
+
+
+    def check(self, desktop=None, iteration: Optional[int] = None) -> Optional[str]:
+        """sample() + should_recycle()."""
+        self.sample(desktop, iteration)
+        self.last_reason = self.should_recycle()
+        if self.last_reason:
+            print(f"MemoryWatchdog: recycle requested ({self.last_reason})")
+        return self.last_reason
+
+
+    def recycle(self, desktop=None, restart: Optional[Callable] = None):
+        """
+        Controlled recycle: releases the desktop (kill the tree if that fails), runs gc and optionally restarts.
+
+        Returns:
+            The value returned by `restart()` (e.g. a new pyDesktop), or None.
+        """
+        if desktop is not None:
+            try:
+                desktop.release_desktop(close_projects=True, close_on_exit=True)
+            except Exception as e:
+                print(f"Warning: release_desktop failed during recycle, killing AEDT ({e})")
+                desktop.kill_process()
+        gc.collect()
+
+        self.n_recycles += 1
+        # recycle 전 샘플은 추세 계산에서 제외
+        self.samples.clear()
+        return restart() if restart is not None else None
+
+
+    def __repr__(self) :
+        latest = self.samples[-1] if self.samples else None
+        if latest is None:
+            return "MemoryWatchdog(no samples)"
+        return (f"MemoryWatchdog(python_rss={latest.python_rss:.0f}MB, aedt_rss={latest.aedt_rss:.0f}MB, "
+                f"system_mem={latest.system_mem:.0%}, trend={self.trend():.1f}MB/it, recycles={self.n_recycles})")
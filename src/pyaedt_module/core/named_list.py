@@ -0,0 +1,115 @@
+class NamedList(list):
+    """
+    이름으로 원소에 접근할 수 있는 list (ProjectList, DesignList의 공통 부분).
+
+    name→object index는 list를 만들 때(= refresh 1회) 한 번만 채워지므로
+    list["name"] 조회는 원소마다 name(GetName RPC)을 부르는 linear scan 없이 dict 조회로 끝난다.
+    generation은 list를 만든 시점의 owner(desktop/project) generation으로, owner가 invalidate되면 새 list로 교체된다.
+
+    Example:
+        >>> projects = ProjectList(generation=0)
+        >>> projects.append(project, name="simulation1")
+        >>> projects["simulation1"]  # RPC 없음
+        >>> projects[0]              # 일반 list처럼 index 접근
+    """
+
+    _label = "Item"
+
+    def __init__(self, items=(), generation: int = 0) -> None:
+        super().__init__()
+        self.generation = generation
+        self._index = {}
+        self._pending = [] # 이름 없이 추가된 원소 (조회가 실패했을 때만 이름을 얻는다)
+        self._stale = False
+        for item in items:
+            self.append(item)
+
+
+    def _get_name(self, item) -> str:
+        return item.name
+
+
+    def append(self, item, name: str = None) -> None:
+        super().append(item)
+        if name is None:
+            self._pending.append(item)
+        else:
+            self._index[name] = item
+
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+
+
+    def _rebuild(self) -> None:
+        self._index = {self._get_name(item): item for item in self}
+        self._pending = []
+        self._stale = False
+
+
+    def _resolve(self, key: str):
+        if self._stale:
+            self._rebuild()
+        elif key not in self._index and self._pending:
+            for item in self._pending:
+                self._index[self._get_name(item)] = item
+            self._pending = []
+        return self._index.get(key)
+
+
+    def __getitem__(self, key):
+        # 문자열이면 이름으로 검색
+        if isinstance(key, str):
+            item = self._resolve(key)
+            if item is None:
+                raise KeyError(f"{self._label} '{key}' not found")
+            return item
+        # 정수면 일반 리스트처럼 인덱스로 접근
+        return super().__getitem__(key)
+
+
+    def __contains__(self, item) -> bool:
+        if isinstance(item, str):
+            return self._resolve(item) is not None
+        return super().__contains__(item)
+
+
+    def names(self) -> list:
+        """Names of the elements, in list order."""
+        if self._stale or self._pending:
+            self._rebuild()
+        position = {id(item): i for i, item in enumerate(self)}
+        return sorted(self._index, key=lambda name: position.get(id(self._index[name]), len(self)))
+
+
+    # index를 직접 맞추기 어려운 변경은 다음 이름 조회 때 index를 다시 만든다
+    def _mark_stale(self) -> None:
+        self._stale = True
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._mark_stale()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._mark_stale()
+
+    def insert(self, index, item) -> None:
+        super().insert(index, item)
+        self._mark_stale()
+
+    def remove(self, item) -> None:
+        super().remove(item)
+        self._mark_stale()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._mark_stale()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._index = {}
+        self._pending = []
+        self._stale = False
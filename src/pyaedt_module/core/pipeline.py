@@ -0,0 +1,477 @@
+import os
+import time
+import pickle
+import hashlib
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional
+
+
+class Stage :
+    """One named step of a Pipeline. `func(state)` returns the stage output."""
+
+    def __init__(self, name: str, func: Callable, retries: int = 0) -> None:
+        self.name = name
+        self.func = func
+        self.retries = retries
+
+    def __repr__(self) :
+        return f"Stage(name={self.name}, retries={self.retries})"
+
+
+class PipelineState :
+    """
+    Checkpointed state of one pipeline run.
+
+    - completed: 성공한 stage 이름 (실행 순서)
+    - outputs: stage 이름 -> stage 반환값
+    - results_df: stage들이 채워가는 부분 결과 DataFrame
+    - aedt_path: 마지막으로 저장된 .aedt 경로
+    - context: checkpoint에 저장되지 않는 runtime 객체 (Simulation, pyDesktop 등)
+    """
+
+    PERSISTENT = ("run_id", "completed", "outputs", "results_df", "aedt_path", "attempts", "errors", "updated")
+
+    def __init__(self, run_id: str, context=None) -> None:
+        self.run_id = run_id
+        self.context = context
+        self.completed = []
+        self.outputs = {}
+        self.results_df = None
+        self.aedt_path = None
+        self.attempts = {}
+        self.errors = {}
+        self.updated = None
+        self.resumed = False
+
+    def __getstate__(self) :
+        # COM/gRPC 객체가 들어있는 context는 pickle하지 않는다
+        return {key: getattr(self, key) for key in self.PERSISTENT}
+
+    def __setstate__(self, state) :
+        self.__init__(state["run_id"])
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def __repr__(self) :
+        return f"PipelineState(run_id={self.run_id}, completed={self.completed}, aedt_path={self.aedt_path})"
+
+
+class Pipeline :
+    """
+    Stage-level checkpoint/resume runner.
+
+    stage가 끝날 때마다 save_project hook으로 .aedt를 저장하고, 완료된 stage 목록/stage 출력/부분 results_df를
+    checkpoint_dir/<run_id>.ckpt 에 atomic하게 기록한다.
+    stage가 실패하면 같은 프로세스 안에서 마지막으로 성공한 stage 다음부터 다시 시도하며 (stage별 retries),
+    프로세스가 죽은 뒤 같은 run_id로 다시 실행하면 checkpoint를 읽어 restore hook으로 project를 다시 열고
+    남은 stage만 실행한다.
+
+    Example:
+        >>> pipeline = Pipeline(run_id=sim.PROJECT_NAME, save_project=save, restore=reopen)
+        >>> pipeline.add_stage("maxwell", run_maxwell)
+        >>> pipeline.add_stage("maxwell2", run_second_maxwell)
+        >>> pipeline.add_stage("icepak", run_icepak, retries=2)
+        >>> state = pipeline.run(context=sim)
+        >>> state.results_df
+    """
+
+    CHECKPOINT_SUFFIX = ".ckpt"
+
+    def __init__(
+            self,
+            run_id: str,
+            checkpoint_dir: str = "checkpoints",
+            stages: Optional[list] = None,
+            save_project: Optional[Callable] = None,
+            restore: Optional[Callable] = None,
+            retries: int = 0,
+            keep_checkpoint: bool = False
+    ) -> None:
+        """
+        Args:
+            run_id: Checkpoint key (e.g. the project name).
+            checkpoint_dir: Directory for the checkpoint files.
+            stages: Initial list of Stage objects.
+            save_project: `save_project(state) -> str` saves the project and returns the .aedt path.
+            restore: `restore(state)` reopens the saved project when resuming from a checkpoint in a new process.
+            retries: Default number of retries per stage.
+            keep_checkpoint: Keep the checkpoint file after a successful run.
+        """
+        self.run_id = run_id
+        self.checkpoint_dir = os.path.abspath(checkpoint_dir)
+        self.stages = list(stages) if stages is not None else []
+        self.save_project = save_project
+        self.restore = restore
+        self.retries = retries
+        self.keep_checkpoint = keep_checkpoint
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+
+    @property
+    def checkpoint_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, f"{self.run_id}{self.CHECKPOINT_SUFFIX}")
+
+
+    def add_stage(self, name: str, func: Callable, retries: Optional[int] = None) -> Stage:
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Duplicate stage name: {name}")
+        stage = Stage(name, func, self.retries if retries is None else retries)
+        self.stages.append(stage)
+        return stage
+
+
+    def stage(self, name: Optional[str] = None, retries: Optional[int] = None):
+        """Decorator form of add_stage."""
+        def decorator(func):
+            self.add_stage(name or func.__name__, func, retries)
+            return func
+        return decorator
+
+
+    # ------------------------------------------------------------------ checkpoint
+
+    def load_checkpoint(self) -> Optional[PipelineState]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Warning: ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return None
+
+
+    def save_checkpoint(self, state: PipelineState) -> None:
+        state.updated = time.time()
+        tmp_path = f"{self.checkpoint_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(state, file)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+
+    # ------------------------------------------------------------------ run
+
+    def run(self, context=None, resume: bool = True) -> PipelineState:
+        """
+        Runs every stage that has not completed yet.
+
+        Returns:
+            PipelineState: Final state (results_df, outputs, aedt_path).
+
+        Raises:
+            The exception of a stage that still fails after its retries (the checkpoint is kept).
+        """
+        state = self.load_checkpoint() if resume else None
+        if state is not None and state.completed:
+            state.context = context
+            state.resumed = True
+            print(f"{self.run_id} : resuming after stage '{state.completed[-1]}'")
+            if self.restore is not None:
+                self.restore(state)
+        else:
+            state = PipelineState(self.run_id, context)
+
+        for stage in self.stages:
+            if stage.name in state.completed:
+                continue
+            self._run_stage(stage, state)
+
+        if not self.keep_checkpoint:
+            self.clear()
+        return state
+
+
+    def _run_stage(self, stage: Stage, state: PipelineState) -> None:
+        while True:
+            state.attempts[stage.name] = state.attempts.get(stage.name, 0) + 1
+            start = time.time()
+            try:
+                output = stage.func(state)
+            except Exception as e:
+                state.errors[stage.name] = f"{e}\n{traceback.format_exc()}"
+                # 실패도 기록해 두어야 재실행 시 시도 횟수가 이어진다
+                self.save_checkpoint(state)
+                if state.attempts[stage.name] > stage.retries:
+                    raise
+                print(f"Warning: {self.run_id} : stage '{stage.name}' failed (attempt {state.attempts[stage.name]}), retrying: {e}")
+                continue
+
+            print(f"{self.run_id} : stage '{stage.name}' finished in {time.time() - start:.2f} s")
+            state.outputs[stage.name] = output
+            if self.save_project is not None:
+                state.aedt_path = self.save_project(state)
+            state.completed.append(stage.name)
+            self.save_checkpoint(state)
+            return
+
+
+class DagStage :
+    """
+    One node of a StageDAG.
+
+    func는 inputs 이름을 keyword argument로 받고, outputs가 하나면 값 하나를, 여러 개면 같은 순서의 tuple(또는 dict)을 반환한다.
+    """
+
+    def __init__(self, name: str, func: Callable, inputs=(), outputs=None, retries: int = 0, cache: bool = False,
+                 parallel: bool = False) -> None:
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs is not None else (name,)
+        self.retries = retries
+        self.cache = cache
+        self.parallel = parallel
+
+    def unpack(self, value) -> dict:
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: value}
+        if isinstance(value, dict):
+            return {key: value[key] for key in self.outputs}
+        if len(value) != len(self.outputs):
+            raise ValueError(f"Stage '{self.name}' returned {len(value)} values for outputs {self.outputs}")
+        return dict(zip(self.outputs, value))
+
+    def __repr__(self) :
+        return f"DagStage(name={self.name}, inputs={self.inputs}, outputs={self.outputs}, parallel={self.parallel})"
+
+
+class StageDAG :
+    """
+    Declarative stage DAG.
+
+    각 stage는 필요한 input 이름과 만들어내는 output 이름을 선언하고, 실행 순서는 의존 관계로 정해진다.
+
+    - parallel=False(기본) stage는 호출한 thread에서 하나씩 실행한다 (AEDT API 호출은 thread를 옮기지 않는다).
+    - parallel=True stage는 ThreadPoolExecutor에서 실행되어, 예를 들어 report CSV parsing이 다음 solve와 동시에 돈다.
+    - cache=True stage는 입력 값이 같으면 이전 출력을 재사용한다 (cache_dir를 주면 pickle로 디스크에도 저장).
+    - stage별 실행 시간은 timings, 재시도 횟수는 attempts에 남는다.
+
+    Example:
+        >>> dag = StageDAG(max_workers=4)
+        >>> dag.add("model", build_model, inputs=["design", "params"], outputs=["design_ready"])
+        >>> dag.add("solve1", solve, inputs=["design_ready"], outputs=["report1_csv"])
+        >>> dag.add("parse1", parse_report, inputs=["report1_csv"], outputs=["magnetic_df"], parallel=True)
+        >>> dag.add("solve2", second_solve, inputs=["design_ready", "report1_csv"], outputs=["report2_csv"])
+        >>> artifacts = dag.run({"design": design, "params": params})
+        >>> dag.timings
+    """
+
+    def __init__(self, stages: Optional[list] = None, max_workers: int = 4, cache_dir: Optional[str] = None) -> None:
+        self.stages = {}
+        self.max_workers = max_workers
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir is not None else None
+
+        self.timings = {}
+        self.attempts = {}
+        self.cache_hits = 0
+        self._cache = {}
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        for stage in stages or []:
+            self._register(stage)
+
+
+    def _register(self, stage: DagStage) -> DagStage:
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        for other in self.stages.values():
+            overlap = set(other.outputs) & set(stage.outputs)
+            if overlap:
+                raise ValueError(f"Outputs {sorted(overlap)} of '{stage.name}' are already produced by '{other.name}'")
+        self.stages[stage.name] = stage
+        return stage
+
+
+    def add(self, name: str, func: Callable, inputs=(), outputs=None, retries: int = 0, cache: bool = False,
+            parallel: bool = False) -> DagStage:
+        return self._register(DagStage(name, func, inputs, outputs, retries, cache, parallel))
+
+
+    def stage(self, inputs=(), outputs=None, name: Optional[str] = None, **kwargs):
+        """Decorator form of add."""
+        def decorator(func):
+            self.add(name or func.__name__, func, inputs, outputs, **kwargs)
+            return func
+        return decorator
+
+
+    def order(self, available=()) -> list:
+        """
+        Returns the stages in a valid execution order.
+
+        Raises:
+            ValueError: If an input is produced by no stage (and not given) or the graph has a cycle.
+        """
+        producers = {output: stage.name for stage in self.stages.values() for output in stage.outputs}
+        available = set(available)
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in producers and name not in available]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs {missing}, which no stage produces")
+
+        ordered, done, visiting = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for input_name in self.stages[name].inputs:
+                if input_name in producers and input_name not in available:
+                    visit(producers[input_name])
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name)
+        return ordered
+
+
+    # ------------------------------------------------------------------ cache
+
+    def _cache_key(self, stage: DagStage, kwargs: dict) -> Optional[str]:
+        try:
+            payload = pickle.dumps((stage.name, sorted(kwargs.items())))
+        except Exception:
+            return None # pickle 안되는 입력(AEDT 객체 등)은 cache하지 않는다
+        return hashlib.sha1(payload).hexdigest()
+
+
+    def _cache_get(self, key: str):
+        if key in self._cache:
+            return True, self._cache[key]
+        if self.cache_dir is not None:
+            path = os.path.join(self.cache_dir, f"{key}.pkl")
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    value = pickle.load(file)
+                self._cache[key] = value
+                return True, value
+        return False, None
+
+
+    def _cache_put(self, key: str, value) -> None:
+        self._cache[key] = value
+        if self.cache_dir is not None:
+            path = os.path.join(self.cache_dir, f"{key}.pkl")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb") as file:
+                    pickle.dump(value, file)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Warning: failed to write stage cache {path}: {e}")
+
+
+    # ------------------------------------------------------------------ run
+
+    def _execute(self, stage: DagStage, kwargs: dict) -> dict:
+        key = self._cache_key(stage, kwargs) if stage.cache else None
+        if key is not None:
+            hit, value = self._cache_get(key)
+            if hit:
+                self.cache_hits += 1
+                self.timings[stage.name] = 0.0
+                return stage.unpack(value)
+
+        start = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts[stage.name] = attempt
+            try:
+                value = stage.func(**kwargs)
+                break
+            except Exception as e:
+                if attempt > stage.retries:
+                    raise
+                print(f"Warning: stage '{stage.name}' failed (attempt {attempt}), retrying: {e}")
+        self.timings[stage.name] = time.time() - start
+
+        if key is not None:
+            self._cache_put(key, value)
+        return stage.unpack(value)
+
+
+    def run(self, initial: Optional[dict] = None) -> dict:
+        """
+        Runs every stage once its inputs are available.
+
+        Args:
+            initial: Artifacts available before the first stage (e.g. {"design": design, "params": params}).
+
+        Returns:
+            dict: Every artifact (initial values and stage outputs) by name.
+
+        Raises:
+            The first stage exception after its retries; running parallel stages are awaited first.
+        """
+        artifacts = dict(initial or {})
+        pending = self.order(available=artifacts)
+        self.timings = {}
+        self.attempts = {}
+
+        def ready(stage):
+            return all(name in artifacts for name in stage.inputs)
+
+        futures = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while (pending or futures) and error is None:
+                for stage in [stage for stage in pending if stage.parallel and ready(stage)]:
+                    pending.remove(stage)
+                    futures[executor.submit(self._execute, stage, {name: artifacts[name] for name in stage.inputs})] = stage
+
+                serial = next((stage for stage in pending if not stage.parallel and ready(stage)), None)
+                if serial is not None:
+                    # 병렬 stage가 도는 동안 다음 serial stage(solve 등)를 현재 thread에서 진행
+                    pending.remove(serial)
+                    try:
+                        artifacts.update(self._execute(serial, {name: artifacts[name] for name in serial.inputs}))
+                    except Exception as e:
+                        error = e
+                elif futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        futures.pop(future)
+                        try:
+                            artifacts.update(future.result())
+                        except Exception as e:
+                            error = error or e
+                else:
+                    raise RuntimeError(f"Stages {[stage.name for stage in pending]} can never run")
+
+                # 끝난 병렬 stage 결과 수거
+                for future in [future for future in futures if future.done()]:
+                    futures.pop(future)
+                    try:
+                        artifacts.update(future.result())
+                    except Exception as e:
+                        error = error or e
+
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+
+        if error is not None:
+            raise error
+        return artifacts
+
+
+    def stats(self) -> dict:
+        return {"timings": dict(self.timings), "attempts": dict(self.attempts), "cache_hits": self.cache_hits}
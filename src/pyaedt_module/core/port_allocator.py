@@ -0,0 +1,168 @@
+import os
+import time
+import errno
+import random
+import socket
+import tempfile
+from typing import Optional
+
+import psutil
+
+
+class PortAllocator :
+    """
+    Host-local gRPC port reservation.
+
+    PyAEDT의 port=0 처리(_find_free_port)는 OS에게 빈 port를 받아 바로 닫기 때문에,
+    여러 프로세스가 동시에 AEDT를 띄우면 AEDT가 listen하기 전에 같은 port를 받아 충돌할 수 있다.
+    (그래서 controller들이 sleep(30), start_interval로 기동을 띄엄띄엄 했다.)
+
+    reserve()는 port 범위에서
+    1. 노드 로컬 lock 디렉토리에 <port>.lock 파일을 O_EXCL로 만들어 예약하고 (다른 프로세스와의 경합 제거)
+    2. 실제로 bind가 되는지 확인해서 (이미 다른 프로그램이 쓰는 port 제외)
+    둘 다 통과한 port를 돌려준다. lock 소유 프로세스가 죽었거나 lease_timeout이 지난 lock은 stale로 보고 회수한다.
+    AEDT가 port를 listen하기 시작하면(wait_until_listening) lock은 release해도 된다.
+
+    Example:
+        >>> ports = PortAllocator()
+        >>> port = ports.reserve()
+        >>> desktop = pyDesktop(port=port)
+        >>> ports.release(port)
+    """
+
+    def __init__(
+            self,
+            port_range: tuple = (50051, 51050),
+            lock_dir: Optional[str] = None,
+            host: str = "127.0.0.1",
+            lease_timeout: float = 600
+    ) -> None:
+        self.port_range = port_range
+        self.lock_dir = lock_dir or os.path.join(tempfile.gettempdir(), "pyaedt_ports")
+        self.host = host
+        self.lease_timeout = lease_timeout
+
+        self._held = set()
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+
+    def _lock_path(self, port: int) -> str:
+        return os.path.join(self.lock_dir, f"{port}.lock")
+
+
+    def _try_lock(self, port: int) -> bool:
+        path = self._lock_path(port)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._is_stale(path):
+                return False
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False # 다른 프로세스가 먼저 회수
+        with os.fdopen(fd, "w") as file:
+            file.write(f"{os.getpid()}:{time.time()}")
+        return True
+
+
+    def _is_stale(self, path: str) -> bool:
+        try:
+            with open(path, "r") as file:
+                pid, created = file.read().split(":")
+            pid, created = int(pid), float(created)
+        except (OSError, ValueError):
+            # 쓰는 도중이거나 깨진 파일: 충분히 오래된 경우만 stale
+            try:
+                return time.time() - os.path.getmtime(path) > self.lease_timeout
+            except OSError:
+                return False
+        if time.time() - created > self.lease_timeout:
+            return True
+        return not psutil.pid_exists(pid)
+
+
+    def is_free(self, port: int) -> bool:
+        """Bind-probe: True if nothing is bound to `port` on this host."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((self.host, port))
+            except OSError as e:
+                if e.errno in (errno.EADDRINUSE, errno.EACCES, getattr(errno, "WSAEADDRINUSE", -1)):
+                    return False
+                raise
+        return True
+
+
+    def reserve(self) -> int:
+        """
+        Reserves a free port.
+
+        Returns:
+            int: The reserved port.
+
+        Raises:
+            RuntimeError: If every port in the range is taken.
+        """
+        first, last = self.port_range
+        n_ports = last - first + 1
+        # 모든 프로세스가 같은 port부터 경합하지 않도록 시작 위치를 섞는다
+        offset = random.randrange(n_ports)
+        for i in range(n_ports):
+            port = first + (offset + i) % n_ports
+            if not self._try_lock(port):
+                continue
+            if self.is_free(port):
+                self._held.add(port)
+                return port
+            self._unlock(port)
+        raise RuntimeError(f"No free port in range {self.port_range}")
+
+
+    def _unlock(self, port: int) -> None:
+        try:
+            os.remove(self._lock_path(port))
+        except FileNotFoundError:
+            pass
+
+
+    def release(self, port: int) -> None:
+        """Releases the reservation (call once the server listens on the port or failed to start)."""
+        self._held.discard(port)
+        self._unlock(port)
+
+
+    def release_all(self) -> None:
+        for port in list(self._held):
+            self.release(port)
+
+
+    def wait_until_listening(self, port: int, timeout: float = 120, pid: Optional[int] = None) -> bool:
+        """
+        Waits until something accepts TCP connections on `port` (readiness detection instead of a fixed sleep).
+
+        Args:
+            port: Port to probe.
+            timeout: Maximum wait in seconds.
+            pid: If given, stop waiting as soon as this process exits.
+
+        Returns:
+            bool: True once the port accepts connections, False on timeout or if `pid` died.
+        """
+        deadline = time.time() + timeout
+        delay = 0.1
+        while time.time() < deadline:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1)
+                if sock.connect_ex((self.host, port)) == 0:
+                    return True
+            if pid is not None and not psutil.pid_exists(pid):
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+        return False
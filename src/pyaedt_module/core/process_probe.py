@@ -0,0 +1,183 @@
+import os
+import time
+import psutil
+from collections import namedtuple
+
+
+ProbeResult = namedtuple("ProbeResult", ["state", "aedt_pid", "cpu_usage", "ram_usage"])
+TeardownResult = namedtuple("TeardownResult", ["pids", "survivors", "duration"])
+
+# state 값은 Scheduler._is_my_process_alive와 동일
+STATE_FINISHED = 0  # 시뮬레이션 종료
+STATE_RUNNING = 1   # 시뮬레이션 중
+STATE_ERROR = 2     # 이상동작
+
+
+class ProcessProbe :
+    """
+    Scheduler slot들의 health 상태를 한 번에 확인하는 probing engine.
+
+    tick마다 process table을 한 번만 훑어서(parent -> children map) 모든 slot을 판정하고,
+    CPU 사용률은 tick 사이에 캐싱해둔 psutil.Process 객체의 delta(cpu_percent(interval=None))로 계산한다.
+    sleep이 없으므로 N개 slot sweep 시간이 slot 수와 거의 무관하다.
+
+    Example:
+        >>> probe = ProcessProbe()
+        >>> results = probe.probe([1234, 5678])
+        >>> results[1234].state
+        1
+    """
+
+    def __init__(self, aedt_name: str = "ansysedt", license_name: str = "ansyscl") -> None:
+        self.aedt_name = aedt_name
+        self.license_name = license_name
+
+        self._procs = {}     # pid -> psutil.Process (cpu_percent 기준점 유지용)
+        self._children = {}  # ppid -> [pid, ...]
+        self._names = {}     # pid -> process name (lower, .exe 제거)
+
+
+    def snapshot(self) -> None:
+        """Reads the whole process table once and rebuilds the parent -> children map."""
+        children = {}
+        names = {}
+        for proc in psutil.process_iter(["pid", "ppid", "name"]):
+            info = proc.info
+            pid = info["pid"]
+            names[pid] = self._normalize(info.get("name"))
+            children.setdefault(info.get("ppid"), []).append(pid)
+
+        self._children = children
+        self._names = names
+
+        # 사라진 프로세스는 캐시에서 제거
+        for pid in list(self._procs):
+            if pid not in names:
+                del self._procs[pid]
+
+
+    def probe(self, pids, refresh: bool = True) -> dict:
+        """
+        Checks all given root PIDs (`conda run` processes) against a single process table snapshot.
+
+        Args:
+            pids: Iterable of root PIDs.
+            refresh: Take a new snapshot first. Set False to reuse the snapshot of this tick.
+
+        Returns:
+            dict[int, ProbeResult]: Result per root PID.
+        """
+        if refresh:
+            self.snapshot()
+        return {pid: self._probe_one(pid) for pid in pids}
+
+
+    def _probe_one(self, pid) -> ProbeResult:
+
+        if pid not in self._names:
+            return ProbeResult(STATE_ERROR, 0, 0, 0)
+
+        descendants = self._descendants(pid)
+        if not descendants: # child process 없는 경우
+            return ProbeResult(STATE_ERROR, 0, 0, 0)
+
+        aedt_pid = next((child for child in descendants if self._names.get(child) == self.aedt_name), None)
+        if aedt_pid is None: # child process는 있으나 ansysedt 안열린 경우 -> 다시실행해야함
+            return ProbeResult(STATE_ERROR, 0, 0, 0)
+
+        solver_procs = [child for child in self._descendants(aedt_pid) if self._names.get(child) != self.license_name]
+        if not solver_procs:
+            return ProbeResult(STATE_FINISHED, 0, 0, 0)
+
+        cpu_usage = 0.0
+        mem_usage = 0.0
+        for child in [pid] + descendants:
+            proc = self._process(child)
+            if proc is None:
+                continue
+            try:
+                cpu_usage += proc.cpu_percent(interval=None)
+                mem_usage += proc.memory_info().rss / (1024 * 1024)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self._procs.pop(child, None)
+
+        return ProbeResult(STATE_RUNNING, int(aedt_pid), cpu_usage, mem_usage)
+
+
+    def _descendants(self, pid) -> list:
+        result = []
+        stack = list(self._children.get(pid, []))
+        while stack:
+            child = stack.pop()
+            if child == pid:
+                continue
+            result.append(child)
+            stack.extend(self._children.get(child, []))
+        return result
+
+
+    def _process(self, pid):
+        proc = self._procs.get(pid)
+        if proc is None:
+            try:
+                proc = psutil.Process(pid)
+                proc.cpu_percent(interval=None) # 첫 호출은 기준점 설정 (0.0 반환)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+            self._procs[pid] = proc
+        return proc
+
+
+    @staticmethod
+    def _normalize(name) -> str:
+        name = (name or "").lower()
+        if name.endswith(".exe"):
+            name = name[:-4]
+        return name
+
+
+def kill_tree(pid: int, timeout: float = 15.0, grace: float = 5.0) -> TeardownResult:
+    """
+    Tears down a process and all of its descendants within a global deadline.
+
+    트리 전체에 terminate를 한 번에 보내고 psutil.wait_procs로 함께 기다린 뒤(grace),
+    남은 프로세스에만 kill을 보내고 남은 시간(timeout) 동안 다시 함께 기다린다.
+    child마다 순서대로 기다리지 않으므로 teardown 시간은 child 수와 무관하게 timeout 이내로 제한된다.
+
+    Args:
+        pid: Root process id.
+        timeout: Global deadline in seconds for the whole teardown.
+        grace: Part of the deadline given to terminate before escalating to kill.
+
+    Returns:
+        TeardownResult: (pids, survivors, duration) - every pid found in the tree, the pids still alive
+            at the deadline and the elapsed seconds.
+    """
+    start = time.time()
+    try:
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return TeardownResult([], [], time.time() - start)
+
+    # 자기 자신은 절대 종료하지 않는다
+    procs = [proc for proc in procs if proc.pid != os.getpid()]
+    pids = [proc.pid for proc in procs]
+
+    for proc in procs:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=max(0.0, min(grace, timeout)))
+
+    if alive:
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        remaining = max(0.0, timeout - (time.time() - start))
+        _, alive = psutil.wait_procs(alive, timeout=remaining)
+
+    return TeardownResult(pids, [proc.pid for proc in alive], time.time() - start)
@@ -4,20 +4,32 @@ from pyaedt_module.solver.circuit import Circuit
 from pyaedt_module.solver.icepak import Icepak
 from pyaedt_module.model3d import Model3d
 from .post_processing import PostProcessing
+from .named_list import NamedList
+from . import units as _units
+from .expression import ExpressionEvaluator
 
 import numpy as np
 import re
+import math
+import time
 import inspect
 
 
+_VARIABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class VariableWrapper(str):
     """
     문자열을 래핑하는 클래스로, 변수 값에서 숫자 부분만 추출할 수 있는 .value() 메서드를 제공합니다.
+    unit을 반영한 값은 .si() / .to(unit)으로 얻습니다 (core.units 사용).
     
     Example:
         wrapper = VariableWrapper("1.6uH")
-        wrapper.value()  # 1.6
-        str(wrapper)     # "1.6uH"
+        wrapper.value()     # 1.6
+        wrapper.unit        # "uH"
+        wrapper.si()        # 1.6e-06
+        wrapper.to("nH")    # 1600.0
+        str(wrapper)        # "1.6uH"
     """
     def value(self):
         """
@@ -25,22 +37,162 @@ class VariableWrapper(str):
         E.g. '1.6uH' -> 1.6, '1k' -> 1, '2mm' -> 2, etc.
         If the numeric part cannot be parsed, returns the original string.
         """
-        s = self.strip()
-        m = re.match(r"^([-\d\.eE+]+)", s)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                return self
-        return self
+        try:
+            return _units.parse(str(self))[0]
+        except ValueError:
+            return self
+
+    @property
+    def unit(self) -> str:
+        """Unit part of the value ("" if there is none or the value is an expression)."""
+        try:
+            return _units.parse(str(self))[1]
+        except ValueError:
+            return ""
+
+    def si(self) -> float:
+        """Value in SI base units (m, H, Hz, W, K, ...). Raises ValueError for expressions/unknown units."""
+        return _units.to_si(str(self))
+
+    def to(self, unit: str) -> float:
+        """Value converted to `unit`. Raises ValueError for expressions/unknown or incompatible units."""
+        return _units.convert(str(self), unit)
+
+
+
+def _pyaedt_version():
+    try:
+        from ansys.aedt.core import __version__
+        return __version__
+    except Exception:
+        return None
 
 
-class DesignList(list):
+class _SolverAdapter:
     """
-    커스텀 리스트 클래스: 이름으로 design에 접근할 수 있게 함
+    solver 생성자 kwargs mapping을 (solver class, PyAEDT version)마다 한 번만 계산해 두는 adapter.
+
+    wrapper 클래스는 *args/**kwargs로 init을 감쌀 수 있으므로, MRO에서 실제 base __init__ signature를 찾아
+    project/design/solution/desktop 관련 파라미터 이름을 미리 골라둔다.
+    design을 만들 때마다 MRO 탐색과 inspect.signature를 반복하지 않는다.
     """
-    def _get_design_name(self, design):
+
+    _cache = {}
+
+    PROJECT_KEYS = ("project", "projectname", "project_name")
+    DESIGN_KEYS = ("design", "designname", "design_name")
+    SOLUTION_KEYS = ("solution_type", "solution")
+    # 새 Desktop 생성 방지 / exit에서 desktop release 방지 (우리가 밖에서 관리)
+    FALSE_KEYS = ("new_desktop", "new_desktop_session", "new_session", "AlwaysNew", "always_new", "close_on_exit", "release_on_exit")
+
+    def __init__(self, solver_cls) -> None:
+        self.solver_cls = solver_cls
+        params = self._signature_params(solver_cls)
+
+        self.project_key = next((key for key in self.PROJECT_KEYS if key in params), None)
+        self.design_key = next((key for key in self.DESIGN_KEYS if key in params), None)
+        self.solution_key = next((key for key in self.SOLUTION_KEYS if key in params), None)
+        self.false_keys = tuple(key for key in self.FALSE_KEYS if key in params)
+
+        self.pass_desktop = "desktop" in params
+        self.pass_pid = "aedt_process_id" in params
+        self.pass_port = "port" in params
+        self.pass_machine = "machine" in params
+        self.pass_non_graphical = "non_graphical" in params
+
+
+    @classmethod
+    def get(cls, solver_cls) -> "_SolverAdapter":
+        key = (solver_cls, _pyaedt_version())
+        adapter = cls._cache.get(key)
+        if adapter is None:
+            adapter = cls._cache[key] = cls(solver_cls)
+        return adapter
+
+
+    @staticmethod
+    def _signature_params(solver_cls) -> set:
+        base_init = None
+        for cls in solver_cls.__mro__:
+            if cls is solver_cls:
+                continue
+            if "__init__" in cls.__dict__:
+                base_init = cls.__init__
+                break
+        if base_init is None:
+            base_init = solver_cls.__init__
+
+        try:
+            return set(inspect.signature(base_init).parameters.keys())
+        except Exception:
+            # signature를 못 얻어도 최소한의 안전값으로 시도
+            return set()
+
+
+    def kwargs(self, desktop, project_name, design_name, solution_type=None) -> dict:
+        kwargs = {}
+
+        # 프로젝트/디자인 이름 파라미터 이름 호환
+        if project_name and self.project_key:
+            kwargs[self.project_key] = project_name
+        if self.design_key:
+            kwargs[self.design_key] = design_name
+        # solution_type 파라미터 호환 (HFSS/Maxwell 등)
+        if solution_type is not None and self.solution_key:
+            kwargs[self.solution_key] = solution_type
+
+        # Desktop 세션 주입: 가능한 방식(버전별로 다름)을 모두 시도하되, 존재하는 키만 넣는다
+        if self.pass_desktop:
+            kwargs["desktop"] = desktop
+
+        if self.pass_pid:
+            pid = getattr(desktop, "aedt_process_id", None)
+            if pid is None:
+                pid = getattr(desktop, "pid", None)
+            if pid is not None:
+                kwargs["aedt_process_id"] = pid
+
+        if self.pass_port:
+            port = getattr(desktop, "port", None)
+            if port is None:
+                port = getattr(desktop, "grpc_port", None)
+            if port is not None:
+                kwargs["port"] = port
+
+        if self.pass_machine:
+            machine = getattr(desktop, "machine", None)
+            if machine:
+                kwargs["machine"] = machine
+
+        for key in self.false_keys:
+            kwargs[key] = False
+
+        # non_graphical은 desktop의 값을 따라가되, 파라미터가 있는 경우에만 전달
+        if self.pass_non_graphical:
+            ng = getattr(desktop, "non_graphical", None)
+            if ng is not None:
+                kwargs["non_graphical"] = ng
+
+        return kwargs
+
+
+    def __call__(self, desktop, project_name, design_name, solution_type=None):
+        return self.solver_cls(**self.kwargs(desktop, project_name, design_name, solution_type))
+
+
+
+class DesignList(NamedList):
+    """
+    커스텀 리스트 클래스: 이름으로 design에 접근할 수 있게 함 (name→object index, NamedList 참고)
+    """
+    _label = "Design"
+
+    def _get_name(self, design):
         """design 객체에서 이름을 안전하게 가져오기"""
+        # lazy handle은 이름을 들고 있으므로 materialize하지 않는다
+        if isinstance(design, DesignHandle):
+            return design.name
+
         # solver_instance.design_name 우선 시도
         if hasattr(design, 'solver_instance') and design.solver_instance:
             if hasattr(design.solver_instance, 'design_name'):
@@ -51,30 +203,97 @@ class DesignList(list):
             return design.name
         
         return None
-    
+
+
+
+class DesignHandle:
+    """
+    Lazy design handle: design 이름과 type만 가지고 있다가, 처음 실제로 사용할 때 pyDesign을 만든다.
+
+    pyDesign 생성은 solver wrapper(PyAEDT Maxwell3d/Icepak/HFSS 초기화)와 Model3d/PostProcessing 모듈 생성까지 포함하므로
+    design 목록만 볼 때는 handle만 만들고, name/solver 외의 attribute나 변수 접근이 오면 그때 materialize한다.
+
+    Example:
+        >>> design = project.designs["Icepak"]   # handle만 조회 (RPC 없음)
+        >>> design.solver                        # "Icepak" (materialize 안함)
+        >>> design.create_setup()                # 여기서 pyDesign 생성
+    """
+
+    def __init__(self, project, name: str, design_type: str) -> None:
+        self.project = project
+        self.name = name
+        self.design_type = design_type
+        self._design = None
+
+    @property
+    def solver(self) -> str:
+        return self.design_type
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._design is not None
+
+    def materialize(self) -> "pyDesign":
+        """Creates (once) and returns the underlying pyDesign."""
+        if self._design is None:
+            self._design = pyDesign(self.project, name=self.name, solver=self.design_type, existing=True)
+        return self._design
+
+    def __getattr__(self, name):
+        # 초기화/unpickle 도중이나 special attribute 조회로 materialize되지 않도록
+        if name == "_design" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __dir__(self):
+        default_dir = super().__dir__()
+        if self._design is not None:
+            return list(set(default_dir + dir(self._design)))
+        return default_dir
+
     def __getitem__(self, key):
-        # 문자열이면 이름으로 검색
-        if isinstance(key, str):
-            for design in self:
-                design_name = self._get_design_name(design)
-                if design_name == key:
-                    return design
-            raise KeyError(f"Design '{key}' not found")
-        
-        # 정수면 일반 리스트처럼 인덱스로 접근
-        return super().__getitem__(key)
+        return self.materialize()[key]
+
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self.materialize()[key]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __repr__(self):
+        return f"DesignHandle(name={self.name}, solver={self.design_type}, materialized={self.is_materialized})"
 
 
 
 class pyDesign:
-    def __init__(self, project, name=None, solver=None, solution=None):
+    def __init__(self, project, name=None, solver=None, solution=None, existing=False):
+        """
+        Args:
+            existing: True if the design already exists in the project (handle materialize, design copy, ...).
+                      solver 생성 시 project 활성화와 solution type 재설정 RPC를 생략하는 fast path를 사용한다.
+        """
         self.project = project
         self.NUM_CORE = 4
 
         self._store = {}
 
+        # __getattr__ resolution cache: name -> (layer, value) (layer: "solver" / "odesign" / "variable")
+        self._attr_cache = {}
+
+        # design 변수 snapshot (한 번에 읽고 library setter로 갱신, invalidate_variables로 폐기)
+        self._variables = None
+        self._variable_array = None
+        self._dirty_variables = set()
+        self._evaluator = None
+
         # 기본 design 생성 (AEDT design 객체)
-        self.solver_instance = self._pydesign(project, name, solver, solution)
+        self.solver_instance = self._pydesign(project, name, solver, solution, existing)
         
         # solver_instance가 None이면 에러 발생 (필수)
         if self.solver_instance is None:
@@ -90,23 +309,28 @@ class pyDesign:
         
         # 모듈 초기화 (model3d, post_processing 등)
         self._get_module()
+
+        # 새 design이거나 AEDT에서 직접 만든 design을 처음 감싸는 경우 project.designs 캐시 갱신
+        self.project._design_created(name)
         
 
 
     
-    def _pydesign(self, project, name, solver, solution):
+    def _pydesign(self, project, name, solver, solution, existing=False):
         """인스턴스 메서드: design 생성 또는 가져오기"""
         solver = self._solver_name(solver)
-        solution = self._solution_name(solver, solution)
+        # 이미 있는 design은 solution을 명시하지 않으면 기존 solution type을 그대로 둔다
+        if not (existing and solution is None):
+            solution = self._solution_name(solver, solution)
         
         if solver == "HFSS":
-            solver_instance = self._setup_hfss(name, solution)
+            solver_instance = self._setup_hfss(name, solution, existing)
         elif solver == "Maxwell 3D":
-            solver_instance = self._setup_maxwell(name, solution)
+            solver_instance = self._setup_maxwell(name, solution, existing)
         elif solver == "Icepak":
-            solver_instance = self._setup_icepak(name, solution)
+            solver_instance = self._setup_icepak(name, solution, existing)
         elif solver == "Circuit Design":
-            solver_instance = self._setup_circuit(name, solution)
+            solver_instance = self._setup_circuit(name, solution, existing)
         else:
             raise ValueError(f"Invalid solver: {solver}")
 
@@ -164,10 +388,34 @@ class pyDesign:
 
     
     def __getattr__(self, name):
+        # 초기화 도중(_attr_cache 세팅 전)에는 solver_instance 조회가 다시 __getattr__로 와서 무한 재귀가 되므로 막는다
+        cache = self.__dict__.get("_attr_cache")
+        if cache is None:
+            raise AttributeError(name)
+
+        # 이전에 찾은 layer가 있으면 그 layer만 조회 (실패한 layer 탐색과 odesign RPC를 반복하지 않음)
+        entry = cache.get(name)
+        if entry is not None:
+            layer, value = entry
+            if layer == "solver":
+                try:
+                    return getattr(self.solver_instance, name)
+                except AttributeError:
+                    pass
+            elif layer == "odesign":
+                odesign, attr = value
+                if self.solver_instance.odesign is odesign:
+                    return attr
+            elif layer == "variable":
+                return value
+            del cache[name]
+
         # First, try to get the attribute from the solver instance (e.g., methods like 'create_setup')
         if self.solver_instance:
             try:
-                return getattr(self.solver_instance, name)
+                value = getattr(self.solver_instance, name)
+                cache[name] = ("solver", None)
+                return value
             except AttributeError:
                 # If it's not found in solver_instance, try solver_instance.odesign (original AEDT design object)
                 # odesign은 PyAEDT의 property이므로 직접 접근만 가능 (설정 불가)
@@ -175,17 +423,39 @@ class pyDesign:
                     try:
                         odesign = self.solver_instance.odesign
                         if odesign:
-                            return getattr(odesign, name)
+                            value = getattr(odesign, name)
+                            cache[name] = ("odesign", (odesign, value))
+                            return value
                     except (AttributeError, TypeError):
                         pass
                 pass
 
         # Second, try to get it as a design variable using __getitem__
         try:
-            return self[name]
+            value = self[name]
         except (KeyError, TypeError):
              # If it's not a variable either, raise the final error
             raise AttributeError(f"'pyDesign' object and its solver have no attribute or variable '{name}'")
+        # design 변수 값은 __setitem__/__delitem__(set_variable 포함)에서 무효화
+        if self.solver_instance and value is not None:
+            cache[name] = ("variable", value)
+        return value
+
+
+    def invalidate_attribute_cache(self, name=None):
+        """
+        Drops the __getattr__ resolution cache for `name` (or for every name).
+        __setitem__/__delitem__/set_variable에서 자동으로 호출되므로, variable_manager를 직접 수정한 경우에만 호출하면 된다.
+        """
+        if name is None:
+            self._attr_cache.clear()
+        else:
+            self._attr_cache.pop(name, None)
+
+
+    def attribute_layers(self) -> dict:
+        """Returns {name: layer} for every cached attribute resolution (layer: "solver", "odesign" or "variable")."""
+        return {name: layer for name, (layer, _) in self._attr_cache.items()}
 
     def __dir__(self):
         default_dir = super().__dir__()
@@ -201,17 +471,23 @@ class pyDesign:
 
     def __setitem__(self, key, value):
         """변수 저장 - HFSS에 직접 반영 또는 _store에 저장"""
+        self.invalidate_attribute_cache(key)
         if self.solver_instance:
             self.solver_instance.variable_manager[key] = value  # HFSS 변수 시스템에 저장
+            self._update_variables({key: value})
         else:
             self._store[key] = value  # HFSS가 없으면 _store에 저장
             return value
 
     def __delitem__(self, key):
         """변수 삭제 - HFSS에서 삭제 또는 _store에서 삭제"""
+        self.invalidate_attribute_cache(key)
         if self.solver_instance:
             if key in self.solver_instance.variable_manager.independent_variables:
                 del self.solver_instance.variable_manager[key]
+            if self._variables is not None:
+                self._variables.pop(key, None)
+                self._variable_array = None
         elif key in self._store:
             del self._store[key]
 
@@ -232,138 +508,59 @@ class pyDesign:
 
 
     @classmethod
-    def create_design(cls, project, name=None, solver=None, solution=None):
+    def create_design(cls, project, name=None, solver=None, solution=None, existing=False):
         """
         클래스 메서드: pyDesign 인스턴스를 생성합니다.
         __init__에서 이미 _setup_*가 호출되므로 여기서는 인스턴스만 생성하고 반환합니다.
         """
-        return cls(project, name=name, solver=solver, solution=solution)
+        return cls(project, name=name, solver=solver, solution=solution, existing=existing)
     
 
-    def _setup_maxwell(self, name, solution):
+    def _setup_maxwell(self, name, solution, existing=False):
         """Maxwell 3D solver 설정 및 인스턴스 생성"""
-        self.project.desktop.odesktop.SetActiveProject(self.project.name)
-        solver_instance = self._instantiate_solver(Maxwell3d, design_name=name, solution_type=solution)
+        solver_instance = self._instantiate_solver(Maxwell3d, design_name=name, solution_type=solution, existing=existing)
         solver_instance.design = self
         return solver_instance
             
-    def _setup_hfss(self, name, solution):
+    def _setup_hfss(self, name, solution, existing=False):
         """HFSS solver 설정 및 인스턴스 생성"""
-        self.project.desktop.odesktop.SetActiveProject(self.project.name)
-        solver_instance = self._instantiate_solver(HFSS, design_name=name, solution_type=solution)
+        solver_instance = self._instantiate_solver(HFSS, design_name=name, solution_type=solution, existing=existing)
         solver_instance.design = self
         return solver_instance
 
-    def _setup_circuit(self, name, solution):
+    def _setup_circuit(self, name, solution, existing=False):
         """Circuit solver 설정 및 인스턴스 생성"""
-        self.project.desktop.odesktop.SetActiveProject(self.project.name)
-        solver_instance = self._instantiate_solver(Circuit, design_name=name, solution_type=solution)
+        solver_instance = self._instantiate_solver(Circuit, design_name=name, solution_type=solution, existing=existing)
         solver_instance.design = self
         return solver_instance
 
-    def _setup_icepak(self, name, solution):
+    def _setup_icepak(self, name, solution, existing=False):
         """Icepak solver 설정 및 인스턴스 생성"""
-        self.project.desktop.odesktop.SetActiveProject(self.project.name)
-        solver_instance = self._instantiate_solver(Icepak, design_name=name, solution_type=solution)
+        solver_instance = self._instantiate_solver(Icepak, design_name=name, solution_type=solution, existing=existing)
         solver_instance.design = self
         return solver_instance
 
 
-    def _instantiate_solver(self, solver_cls, design_name: str, solution_type=None):
+    def _instantiate_solver(self, solver_cls, design_name: str, solution_type=None, existing=False):
         """
         solver(HFSS/Circuit/Maxwell3d/Icepak) 인스턴스를 생성할 때,
         Desktop 세션을 "암묵적으로" 만들지 않도록 현재 pyDesktop 세션을 명시적으로 주입합니다.
 
         - PyAEDT/ansys.aedt.core 버전에 따라 생성자 파라미터명이 달라질 수 있어,
-          실제 signature에 존재하는 키만 골라 kwargs로 전달합니다.
+          (solver class, PyAEDT version)마다 한 번 계산한 _SolverAdapter로 kwargs를 만듭니다.
+        - existing=True(이미 있는 design)이면 SetActiveProject를 생략합니다 (PyAEDT가 project를 활성화함).
         """
-        desktop = self.project.desktop
-
         # underlying AEDT project name은 pyProject.name(property) 대신 project 객체에서 직접 가져오는 편이 안전
         try:
             project_name = self.project.project.GetName()
         except Exception:
             project_name = getattr(self.project, "name", None)
 
-        # wrapper 클래스는 *args/**kwargs로 init을 감쌀 수 있으므로, 실제 base __init__ signature를 우선 사용
-        base_init = None
-        for cls in solver_cls.__mro__:
-            if cls is solver_cls:
-                continue
-            if "__init__" in cls.__dict__:
-                base_init = cls.__init__
-                break
-        if base_init is None:
-            base_init = solver_cls.__init__
-
-        params = set()
-        try:
-            params = set(inspect.signature(base_init).parameters.keys())
-        except Exception:
-            # signature를 못 얻어도 최소한의 안전값으로 시도
-            params = set()
-
-        kwargs = {}
+        if not existing:
+            self.project.desktop.odesktop.SetActiveProject(project_name)
 
-        # 프로젝트/디자인 이름 파라미터 이름 호환
-        if project_name:
-            if "project" in params:
-                kwargs["project"] = project_name
-            elif "projectname" in params:
-                kwargs["projectname"] = project_name
-            elif "project_name" in params:
-                kwargs["project_name"] = project_name
-
-        if "design" in params:
-            kwargs["design"] = design_name
-        elif "designname" in params:
-            kwargs["designname"] = design_name
-        elif "design_name" in params:
-            kwargs["design_name"] = design_name
-
-        # solution_type 파라미터 호환 (HFSS/Maxwell 등)
-        if solution_type is not None:
-            if "solution_type" in params:
-                kwargs["solution_type"] = solution_type
-            elif "solution" in params:
-                kwargs["solution"] = solution_type
-
-        # Desktop 세션 주입: 가능한 방식(버전별로 다름)을 모두 시도하되, 존재하는 키만 넣는다
-        if "desktop" in params:
-            kwargs["desktop"] = desktop
-
-        pid = getattr(desktop, "aedt_process_id", None)
-        if pid is None:
-            pid = getattr(desktop, "pid", None)
-        if pid is not None and "aedt_process_id" in params:
-            kwargs["aedt_process_id"] = pid
-
-        port = getattr(desktop, "port", None)
-        if port is None:
-            port = getattr(desktop, "grpc_port", None)
-        if port is not None and "port" in params:
-            kwargs["port"] = port
-
-        machine = getattr(desktop, "machine", None)
-        if machine and "machine" in params:
-            kwargs["machine"] = machine
-
-        # 새 Desktop 생성 방지
-        for key in ("new_desktop", "new_desktop_session", "new_session", "AlwaysNew", "always_new"):
-            if key in params:
-                kwargs[key] = False
-
-        # exit에서 desktop release 방지 (우리가 밖에서 관리)
-        for key in ("close_on_exit", "release_on_exit", "release_on_exit", "close_on_exit"):
-            if key in params:
-                kwargs[key] = False
-
-        # non_graphical은 desktop의 값을 따라가되, 파라미터가 있는 경우에만 전달
-        ng = getattr(desktop, "non_graphical", None)
-        if ng is not None and "non_graphical" in params:
-            kwargs["non_graphical"] = ng
-
-        return solver_cls(**kwargs)
+        adapter = _SolverAdapter.get(solver_cls)
+        return adapter(self.project.desktop, project_name, design_name, solution_type)
 
 
     def _get_module(self):
@@ -411,20 +608,134 @@ class pyDesign:
             self.variable_name = value
 
         return value
+
+
+    @staticmethod
+    def _same_expression(old, new) -> bool:
+        """"3mm" == "3.0mm" 처럼 숫자/단위가 같으면 같은 값으로 본다 (그 외에는 공백을 뺀 문자열 비교)."""
+        try:
+            old_number, old_unit = _units.parse(str(old))
+            new_number, new_unit = _units.parse(str(new))
+        except ValueError:
+            return "".join(str(old).split()) == "".join(str(new).split())
+        return old_unit == new_unit and math.isclose(old_number, new_number, rel_tol=1e-12, abs_tol=0.0)
+
+
+    def set_variables(self, variables: dict, units: dict = None, dry_run: bool = False, skip_unchanged: bool = False) -> dict:
+        """
+        Sets many design variables with a single ChangeProperty call on LocalVariableTab.
+
+        변수마다 variable_manager[key] = value로 쓰면 변수 수만큼 AEDT transaction(+undo history)이 생기므로,
+        값과 unit을 먼저 검증한 뒤 새 변수는 NewProps, 기존 변수는 ChangedProps로 묶어 한 번에 보낸다.
+
+        Args:
+            variables: {name: value}. 숫자 value에는 units[name]이 붙고, 문자열 value는 expression 그대로 사용한다.
+            units: {name: unit} (e.g. {"w1": "mm"}).
+            dry_run: Only compute the diff against the current design values, nothing is written.
+            skip_unchanged: Compare with the current values and only send new/changed variables (design 재사용 시).
+
+        Returns:
+            dict: {"added": {name: expr}, "changed": {name: (old, new)}, "unchanged": [names], "elapsed": seconds}
+
+        Raises:
+            ValueError: If a name, value or unit is invalid (nothing is written).
+
+        Example:
+            >>> design.set_variables({"w1": 3, "l1": 10.5, "freq": "10kHz"}, units={"w1": "mm", "l1": "mm"})
+            >>> design.set_variables(params, units=units, dry_run=True)["changed"]
+        """
+        start = time.time()
+        units = units or {}
+
+        # 1. 검증 (하나라도 틀리면 아무것도 쓰지 않음)
+        expressions = {}
+        errors = []
+        for name, value in variables.items():
+            if not isinstance(name, str) or not _VARIABLE_NAME.match(name):
+                errors.append(f"{name!r}: invalid variable name")
+                continue
+            if isinstance(value, str):
+                expression = value.strip()
+            elif isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+                expression = f"{value}{units.get(name, '') or ''}"
+            else:
+                errors.append(f"{name}: unsupported value {value!r}")
+                continue
+            try:
+                unit = _units.parse(expression)[1]
+            except ValueError:
+                unit = "" # 변수 참조/수식은 AEDT가 검증
+            if unit and not _units.is_known(unit):
+                errors.append(f"{name}: unknown unit '{unit}' in '{expression}'")
+                continue
+            if not expression:
+                errors.append(f"{name}: empty value")
+                continue
+            expressions[name] = expression
+        if errors:
+            raise ValueError("Invalid design variables: " + "; ".join(errors))
+
+        # 2. 기존 변수와 비교 (AEDT 변수 이름은 대소문자를 구분하지 않음)
+        odesign = self.solver_instance.odesign
+        if dry_run or skip_unchanged:
+            current = {name: str(value) for name, value in self.variables.items()}
+        else:
+            current = {name: None for name in odesign.GetVariables()}
+        existing = {name.lower(): name for name in current}
+
+        added, changed, unchanged = {}, {}, []
+        for name, expression in expressions.items():
+            current_name = existing.get(name.lower())
+            if current_name is None:
+                added[name] = expression
+            elif (dry_run or skip_unchanged) and self._same_expression(current[current_name], expression):
+                unchanged.append(name)
+            else:
+                changed[current_name] = (current[current_name], expression)
+
+        # 3. 한 번의 ChangeProperty로 전송
+        if not dry_run and (added or changed):
+            if self.solver_instance.design_type in ["HFSS 3D Layout Design", "Circuit Design", "Maxwell Circuit", "Twin Builder"]:
+                prop_server = f"Instance:{odesign.GetName()}"
+            else:
+                prop_server = "LocalVariables"
+
+            tab = ["NAME:LocalVariableTab", ["NAME:PropServers", prop_server]]
+            if added:
+                tab.append(["NAME:NewProps"] + [
+                    [f"NAME:{name}", "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", expression]
+                    for name, expression in added.items()
+                ])
+            if changed:
+                tab.append(["NAME:ChangedProps"] + [
+                    [f"NAME:{name}", "Value:=", expression] for name, (_, expression) in changed.items()
+                ])
+            odesign.ChangeProperty(["NAME:AllTabs", tab])
+
+            # PyAEDT variable_manager / __getattr__ 캐시에 남은 이전 값 제거
+            clear = getattr(self.solver_instance.variable_manager, "_clear_variable_from_cache", None)
+            for name in list(added) + list(changed):
+                self.invalidate_attribute_cache(name)
+                if clear is not None:
+                    clear(name)
+            self._update_variables({**added, **{name: expression for name, (_, expression) in changed.items()}})
+
+        return {"added": added, "changed": changed, "unchanged": unchanged, "elapsed": time.time() - start}
     
 
 
     def get_active_design(self) :
 
+        # active design은 이미 만들어진 design(copy, EM loss target 등)이므로 fast path로 감싼다
         design_name = self.project.desktop.active_design().GetName()
         design_type = self.project.desktop.active_design().GetDesignType()
 
         if design_type == "Icepak" :
-            design_obj = pyDesign.create_design(self.project, name=design_name, solver="icepak")
+            design_obj = pyDesign.create_design(self.project, name=design_name, solver="icepak", existing=True)
         elif design_type == "Maxwell 3D" :
-            design_obj = pyDesign.create_design(self.project, name=design_name, solver="maxwell3d")
+            design_obj = pyDesign.create_design(self.project, name=design_name, solver="maxwell3d", existing=True)
         elif design_type == "HFSS" :
-            design_obj = pyDesign.create_design(self.project, name=design_name, solver="hfss")
+            design_obj = pyDesign.create_design(self.project, name=design_name, solver="hfss", existing=True)
         else :
             return False
 
@@ -491,15 +802,114 @@ class pyDesign:
         Returns a dictionary where the keys are variable names, and the values are VariableWrapper objects,
         which behave like str, but have a `.value()` method to obtain the numeric part only.
 
+        값은 snapshot에서 가져온다 (처음 접근할 때 한 번에 읽고, __setitem__/set_variable/set_variables로 갱신).
+        AEDT API로 직접 변수를 바꾼 경우 invalidate_variables()를 호출해야 한다.
+
         Example:
             design.variables["Ltx"]           # '1.6uH'
             design.variables["Ltx"].value()   # 1.6
         """
-        variables = {
-            var_name: VariableWrapper(self.solver_instance.odesign.GetVariableValue(var_name))
-            for var_name in self.solver_instance.odesign.GetVariables()
+        if self._variables is None:
+            self._variables = self._read_variables()
+            self._variable_array = None
+            self._dirty_variables.clear()
+        return dict(self._variables)
+
+
+    def _read_variables(self) -> dict:
+        """
+        Reads every design variable in one batch.
+
+        독립 변수 값은 GetNominalVariation() 한 번으로 (name='value' ...) 모두 받고,
+        거기에 없는 변수(수식으로 정의된 종속 변수)만 GetVariableValue로 읽는다.
+        """
+        odesign = self.solver_instance.odesign
+        names = list(odesign.GetVariables())
+
+        nominal = {}
+        try:
+            nominal = dict(re.findall(r"([A-Za-z_$][\w$]*)='([^']*)'", odesign.GetNominalVariation()))
+        except Exception:
+            pass
+
+        return {
+            name: VariableWrapper(nominal[name] if name in nominal else odesign.GetVariableValue(name))
+            for name in names
         }
-        return variables
+
+
+    def _update_variables(self, values: dict) -> None:
+        """library setter가 쓴 값을 snapshot에 반영 (snapshot이 아직 없으면 다음 접근 때 새로 읽음)."""
+        self._dirty_variables.update(values)
+        if self._variables is None:
+            return
+        for name, value in values.items():
+            self._variables[name] = VariableWrapper(str(value))
+        self._variable_array = None
+        self._evaluator = None
+
+
+    def invalidate_variables(self) -> None:
+        """Drops the variable snapshot (the next `variables` access reads every variable again)."""
+        self._variables = None
+        self._variable_array = None
+        self._evaluator = None
+        # __getattr__가 cache한 design.<name> 변수 값도 같이 버린다 (solver attribute 해석 결과는 유지)
+        for name in [name for name, (layer, _) in self._attr_cache.items() if layer == "variable"]:
+            del self._attr_cache[name]
+
+
+    def evaluate(self, expression, unit: str = None) -> float:
+        """
+        Evaluates an AEDT expression locally against the variable snapshot (no RPC, see core.expression).
+
+        Example:
+            >>> design.evaluate("-(3)*((N1_coil_diameter) + (N1_coil_zgap)) + (offset)", unit="mm")
+
+        Raises:
+            ExpressionError: If the expression cannot be evaluated (syntax, unknown variable/unit, ...).
+        """
+        if self._evaluator is None:
+            self._evaluator = ExpressionEvaluator(self.variables)
+        return self._evaluator.evaluate(expression, unit)
+
+
+    @property
+    def dirty_variables(self) -> set:
+        """Names written through the library setters since the snapshot was last read."""
+        return set(self._dirty_variables)
+
+
+    def numeric_variables(self, names: list = None):
+        """
+        Numeric view of the variable snapshot for feature vectors.
+
+        Args:
+            names: Variables (and their order) to include. None이면 snapshot의 모든 변수.
+
+        Returns:
+            tuple: (np.ndarray of float64, {name: index}). 값은 SI 단위로 변환되며 ("3mm" -> 0.003, "1.6uH" -> 1.6e-06),
+            숫자로 읽을 수 없는 값(수식, 모르는 unit)은 nan.
+
+        Example:
+            >>> x, index = design.numeric_variables(["w1", "l1", "N1"])
+            >>> x[index["w1"]]
+        """
+        variables = self.variables
+        if names is None:
+            if self._variable_array is None:
+                array, index = self._to_numeric(variables, list(variables))
+                array.setflags(write=False)
+                self._variable_array = (array, index)
+            return self._variable_array
+        return self._to_numeric(variables, list(names))
+
+
+    @staticmethod
+    def _to_numeric(variables: dict, names: list):
+        values = [variables.get(name, "") for name in names]
+        array = np.asarray(_units.convert_array(np.array(values, dtype=object)), dtype=np.float64)
+        return array, {name: i for i, name in enumerate(names)}
 
     @property
     def name(self):
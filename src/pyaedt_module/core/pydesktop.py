@@ -7,8 +7,17 @@ from typing import Any
 from ansys.aedt.core import Desktop as AEDTDesktop
 
 from .pyproject import pyProject, ProjectList
+from .port_allocator import PortAllocator
+from .process_probe import kill_tree
 
-import socket # for grpc
+
+_port_allocator = None
+
+def _default_port_allocator() -> PortAllocator:
+    global _port_allocator
+    if _port_allocator is None:
+        _port_allocator = PortAllocator()
+    return _port_allocator
 
 
 
@@ -46,18 +55,31 @@ class pyDesktop(AEDTDesktop) :
         # new_desktop=True로 새 세션을 원할 때는 캐시를 강하게 비우는게 안전하다.
         # self._purge_dead_pyaedt_sessions(clear_all=bool(new_desktop))
 
-        super().__init__(
-            version=version,
-            non_graphical=non_graphical,
-            new_desktop=new_desktop,
-            close_on_exit=close_on_exit,
-            student_version=student_version,
-            machine=machine,
-            port=port,
-            aedt_process_id=aedt_process_id,
-            *args,
-            **kwargs
-        )
+        # port=0이면 PyAEDT가 OS 임시 port를 골라 바로 닫기 때문에 동시 기동 시 충돌할 수 있다.
+        # 노드 로컬 lock으로 port를 예약해서 넘기고, AEDT 연결이 끝나면(= port listen 중) 예약을 푼다.
+        port_allocator = kwargs.pop("port_allocator", None)
+        reserved_port = None
+        if port == 0 and new_desktop and not machine and aedt_process_id is None:
+            if port_allocator is None:
+                port_allocator = _default_port_allocator()
+            reserved_port = port = port_allocator.reserve()
+
+        try:
+            super().__init__(
+                version=version,
+                non_graphical=non_graphical,
+                new_desktop=new_desktop,
+                close_on_exit=close_on_exit,
+                student_version=student_version,
+                machine=machine,
+                port=port,
+                aedt_process_id=aedt_process_id,
+                *args,
+                **kwargs
+            )
+        finally:
+            if reserved_port is not None:
+                port_allocator.release(reserved_port)
 
         # PyAEDT가 "started" 로그를 찍고도 odesktop이 잠깐 None인 채로 반환되는 케이스가 있음.
         # (특히 loop로 Desktop을 반복 생성/종료할 때) 이 상태에서 EnableAutoSave를 호출하면
@@ -65,6 +87,10 @@ class pyDesktop(AEDTDesktop) :
         # self._wait_for_odesktop(timeout_sec=30.0)
         self.disable_autosave()
 
+        # projects 캐시 (create/load/close 시 generation 증가)
+        self.projects_generation = 0
+        self._projects_cache = None
+
 
     # def _wait_for_odesktop(self, timeout_sec: float = 30.0, poll_sec: float = 0.2) -> None:
     #     """Wait until `self.odesktop` is available or raise RuntimeError."""
@@ -156,12 +182,20 @@ class pyDesktop(AEDTDesktop) :
         return folder_path
 
 
-    def kill_process(self) -> bool:
+    def kill_process(self, timeout: float = 15.0, grace: float = 5.0) -> bool:
         """
-        Kills the AEDT process associated with this desktop session.
-        
+        Kills the AEDT process tree associated with this desktop session.
+
+        AEDT는 solver, ansyscl 등 자식 프로세스를 여러 개 띄우므로 트리 전체를 한 번에 terminate하고
+        함께 기다린 뒤 남은 프로세스만 kill한다 (core.process_probe.kill_tree).
+        결과(pids, survivors, duration)는 self.last_teardown에 남는다.
+
+        Args:
+            timeout: Global deadline in seconds for the whole teardown.
+            grace: Seconds given to terminate before escalating to kill.
+
         Returns:
-            bool: True if the process was successfully killed, False otherwise.
+            bool: True if the whole tree is gone, False otherwise.
         """
         try:
             pid = self.pid
@@ -172,31 +206,15 @@ class pyDesktop(AEDTDesktop) :
                 print("Warning: desktop.pid equals current Python PID. Skip killing to avoid self-termination.")
                 return False
 
-            proc = psutil.Process(pid)
-            # AEDT는 자식 프로세스를 여러 개 띄울 수 있어, 부모만 죽이면 리소스(UDS/lock)가 남을 수 있음.
-            # 가능한 한 프로세스 트리를 먼저 정리한다.
-            try:
-                children = proc.children(recursive=True)
-                for c in children:
-                    try:
-                        c.kill()
-                    except Exception:
-                        pass
-                for c in children:
-                    try:
-                        c.wait(timeout=5)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            proc.kill()
-            try:
-                proc.wait(timeout=15)
-            except Exception:
-                pass
+            result = kill_tree(pid, timeout=timeout, grace=grace)
+            self.last_teardown = result
+            if not result.pids:
+                return False
+            if result.survivors:
+                print(f"Warning: AEDT teardown left {result.survivors} alive after {result.duration:.1f} s")
+                return False
+            print(f"AEDT process tree ({len(result.pids)} processes) terminated in {result.duration:.1f} s")
             return True
-        except psutil.NoSuchProcess:
-            return False
         except Exception as e:
             print(f"Error killing process: {e}")
             return False
@@ -211,6 +229,14 @@ class pyDesktop(AEDTDesktop) :
         return project
 
 
+    def invalidate_projects(self) -> None:
+        """
+        Marks the cached `projects` list as outdated (the next access lists the open projects again).
+        library의 create/load/close/save_project에서 자동으로 호출되므로, AEDT API로 직접 project를 열고 닫은 경우에만 호출하면 된다.
+        """
+        self.projects_generation = getattr(self, "projects_generation", 0) + 1
+
+
     # legacy code
     # def get_project_list(self) :
         
@@ -235,11 +261,62 @@ class pyDesktop(AEDTDesktop) :
             >>> projects = desktop.get_project_list()
             >>> my_project = projects["MyProject"]  # 이름으로 객체 찾기
         """
-        projects_dict = {}
-        for project in self.projects:  # projects property 활용
-            projects_dict[project.GetName()] = project
-            
-        return projects_dict
+        projects = self.projects  # projects property 활용 (이름 index 재사용, GetName RPC 없음)
+        return {name: projects[name] for name in projects.names()}
+
+
+    def is_healthy(self) -> bool:
+        """
+        Cheap liveness check: the AEDT process exists and answers a trivial odesktop call.
+        """
+        try:
+            pid = self.pid
+            if pid is None or not psutil.pid_exists(pid):
+                return False
+            return self.odesktop is not None and bool(self.odesktop.GetVersion())
+        except Exception:
+            return False
+
+
+    def soft_reset(self, delete_projects: bool = True) -> None:
+        """
+        Closes every open project without saving (and deletes its folder), keeping the AEDT process alive
+        so the next job skips the AEDT launch.
+
+        Raises:
+            RuntimeError: If a project could not be closed (the session should then be recycled).
+        """
+        failed = []
+        for project in list(self.projects):
+            try:
+                project.close(save=False)
+            except Exception as e:
+                failed.append(f"{project.close_name}: {e}")
+                continue
+            if delete_projects:
+                try:
+                    project.delete()
+                except Exception as e:
+                    print(f"Warning: failed to delete project folder: {e}")
+        if failed:
+            raise RuntimeError(f"Soft reset failed to close projects: {failed}")
+
+
+    @property
+    def rss(self) -> float:
+        """Resident memory of the AEDT process tree in MB (0 if the process is gone)."""
+        try:
+            proc = psutil.Process(self.pid)
+            procs = [proc] + proc.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, TypeError, ValueError):
+            return 0.0
+        rss = 0
+        for p in procs:
+            try:
+                rss += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return rss / (1024 * 1024)
 
 
     # desktop 상에 열려있는 모든 프로젝트를 종료 후 제거
@@ -255,7 +332,8 @@ class pyDesktop(AEDTDesktop) :
     def projects(self) -> ProjectList:
         """
         Returns a list of pyProject objects for all open projects.
-        Automatically updates each time it's accessed.
+        The list is cached until a project is created, loaded, saved under a new name or closed (see invalidate_projects),
+        so repeated lookups by name cost no RPCs.
         
         Returns:
             ProjectList: List of pyProject objects. Can be accessed by name or index.
@@ -265,13 +343,24 @@ class pyDesktop(AEDTDesktop) :
             >>> project = desktop.projects["simulation2"]  # 이름으로 접근
             >>> project = desktop.projects[0]  # 인덱스로 접근
         """
-        projects = ProjectList()
-        project_names = self.project_list
+        generation = getattr(self, "projects_generation", 0)
+        cache = getattr(self, "_projects_cache", None)
+        if cache is not None and cache.generation == generation:
+            return cache
 
-        for project_name in project_names:
-            project = pyProject(self, name=project_name)
-            projects.append(project)
-            
+        projects = ProjectList(generation=generation)
+        try:
+            # 열린 project 객체를 한 번에 받아 감싼다 (project마다 _get_project의 파일 확인/SetActiveProject 생략)
+            for project in self.odesktop.GetProjects():
+                name = project.GetName()
+                projects.append(pyProject._from_aedt(self, project, name=name), name=name)
+        except AttributeError:
+            projects = ProjectList()
+            for project_name in self.project_list:
+                projects.append(pyProject(self, name=project_name), name=project_name)
+            projects.generation = self.projects_generation
+
+        self._projects_cache = projects
         return projects
 
     @property
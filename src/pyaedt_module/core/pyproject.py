@@ -5,24 +5,18 @@ import stat
 import time
 from typing import Optional
 
-from .pydesign import pyDesign, DesignList
+from .pydesign import pyDesign, DesignList, DesignHandle
+from .named_list import NamedList
+from .wait import wait_until, remove_path
 
 
 
 
-class ProjectList(list):
+class ProjectList(NamedList):
     """
-    커스텀 리스트 클래스: 이름으로 project에 접근할 수 있게 함
+    커스텀 리스트 클래스: 이름으로 project에 접근할 수 있게 함 (name→object index, NamedList 참고)
     """
-    def __getitem__(self, key):
-        # 문자열이면 이름으로 검색
-        if isinstance(key, str):
-            for project in self:
-                if project.name == key:
-                    return project
-            raise KeyError(f"Project '{key}' not found")
-        # 정수면 일반 리스트처럼 인덱스로 접근
-        return super().__getitem__(key)
+    _label = "Project"
 
 
 class pyProject:
@@ -33,7 +27,27 @@ class pyProject:
         self.desktop = desktop
 
         # project 객체를 가져와서 저장 (이 객체의 모든 메서드/속성을 pyProject가 위임받음)
-        self.project = self._get_project(path=path, name=name, forced_load=forced_load)
+        self._bind(self._get_project(path=path, name=name, forced_load=forced_load))
+
+        # 새로 만들거나 연 project는 desktop.projects 캐시에 아직 없다
+        self.desktop.invalidate_projects()
+
+
+    @classmethod
+    def _from_aedt(cls, desktop, project, name: Optional[str] = None) -> "pyProject":
+        """
+        이미 열려있는 AEDT project 객체를 감싼다 (_get_project의 파일 확인/SetActiveProject 생략).
+        desktop.projects가 refresh할 때 사용한다.
+        """
+        self = cls.__new__(cls)
+        self.desktop = desktop
+        self._bind(project, name=name)
+        return self
+
+
+    def _bind(self, project, name: Optional[str] = None) -> None:
+
+        self.project = project
         
         # close/delete 시 사용할 기본 정보는 project 객체가 생긴 뒤에만 접근 가능
         # (_get_project 내부에서 self.path/self.name을 호출하면 초기화 순서 문제로 재귀가 발생할 수 있음)
@@ -41,10 +55,13 @@ class pyProject:
             self.close_path = self.project.GetPath()
         except Exception:
             self.close_path = None
-        try:
-            self.close_name = self.project.GetName()
-        except Exception:
-            self.close_name = None
+        if name is not None:
+            self.close_name = name
+        else:
+            try:
+                self.close_name = self.project.GetName()
+            except Exception:
+                self.close_name = None
 
         # underlying AEDT project object (for __getattr__ forwarding)
         # self.proj는 self.project와 동일하지만, 명시적으로 유지
@@ -52,6 +69,10 @@ class pyProject:
 
         self.solver_instance = None
 
+        # designs 캐시 (create_design / 새 design의 pyDesign 생성 시 generation 증가)
+        self.designs_generation = 0
+        self._designs_cache = None
+
         # project 종료되도 path 저장하는 변수 (위에서 project 기반으로 세팅)
 
 
@@ -181,6 +202,8 @@ class pyProject:
             os.makedirs(save_dir)
         
         self.desktop.save_project(self.name, path)
+        # SaveAs로 이름이 바뀔 수 있음
+        self.desktop.invalidate_projects()
 
         norm_path = os.path.normpath(self.path)
         basename = os.path.basename(norm_path)
@@ -238,13 +261,8 @@ class pyProject:
             path = self.GetPath()
         
         if os.path.exists(path) and os.path.isdir(path):
-            for attempt in range(retries):
-                try:
-                    shutil.rmtree(path, onerror=self._remove_readonly)
-                    return True
-                except Exception as e:
-                    time.sleep(delay)
-            return False
+            # 고정 delay 반복 대신 backoff로 재시도 (lock이 풀리는 즉시 삭제)
+            return remove_path(path, timeout=retries * delay, onerror=self._remove_readonly, name="delete_project_folder")
         else:
             return False
 
@@ -266,6 +284,21 @@ class pyProject:
         return design
 
 
+    def invalidate_designs(self) -> None:
+        """
+        Marks the cached `designs` list as outdated (the next access lists the designs again).
+        pyDesign 생성 시 자동으로 호출되므로, AEDT API로 직접 design을 추가/삭제/이름변경한 경우에만 호출하면 된다.
+        """
+        self.designs_generation += 1
+
+
+    def _design_created(self, name: Optional[str]) -> None:
+        """pyDesign 생성 시 호출: 캐시에 이미 있는 design을 materialize한 경우가 아니면 designs 캐시를 무효화."""
+        cache = self._designs_cache
+        if cache is None or name is None or name not in cache:
+            self.invalidate_designs()
+
+
 
     def close(self, save: bool = True) -> None:
 
@@ -275,7 +308,11 @@ class pyProject:
         self.close_path = self.path # 후에 삭제시 사용할 수 있게 최종 경로 받아둠
         self.close_name = self.name
         self.desktop.odesktop.CloseProject(self.name)
-        
+        self.desktop.invalidate_projects()
+
+        # CloseProject 직후 .aedt.lock이 남아있으면 이어지는 삭제/재오픈이 실패하므로 lock 해제를 기다린다
+        lock_file = os.path.join(self.close_path, self.close_name + ".aedt.lock")
+        wait_until(lambda: not os.path.exists(lock_file), timeout=10, name="lock_release", raise_on_timeout=False)
 
 
     def delete(self, delete_folder: bool = True, delay: int = 1, max_retries: int = 3) -> None:
@@ -328,29 +365,8 @@ class pyProject:
                 except Exception as e2:
                     print(f"Error forcibly removing {path}: {e2}")
 
-            for attempt in range(max_retries):
-                try:
-                    # 일반적으로 폴더 삭제
-                    shutil.rmtree(target_path, onerror=on_rm_error)
-                    # 삭제 성공했으면 빠져나감
-                    if not os.path.exists(target_path):
-                        break
-                except NotADirectoryError:
-                    # 파일일 경우, rmtree가 NotADirectoryError 발생시 파일만 삭제
-                    try:
-                        os.remove(target_path)
-                        if not os.path.exists(target_path):
-                            break
-                    except Exception as e:
-                        print(f"Error deleting file: {target_path}, {e}")
-                except Exception as e:
-                    print(f"Error deleting {target_path}: {e}")
-                    # [WinError 32] 등 액세스 오류 발생시 재시도
-                    time.sleep(1)
-                else:
-                    # 삭제에 성공했다면 루프 탈출
-                    if not os.path.exists(target_path):
-                        break
+            # [WinError 32] 등 액세스 오류는 lock이 풀릴 때까지 backoff로 재시도
+            remove_path(target_path, timeout=max_retries * max(delay, 1), onerror=on_rm_error, name="project_delete")
 
             # 삭제 후에도 폴더가 남아있으면 한번 더 시도: 남은 하위 파일/폴더 처리 후 폴더 삭제
             if os.path.exists(target_path):
@@ -365,33 +381,40 @@ class pyProject:
     @property
     def designs(self) -> DesignList:
         """
-        Returns a list of pyDesign objects for all designs in this project.
-        Automatically updates each time it's accessed.
+        Returns a list of lazy design handles for all designs in this project.
+        Each DesignHandle only holds the design name and type; the pyDesign (solver wrapper) is created on first real use.
+        The list is cached until the design set changes (see invalidate_designs).
         
         Returns:
-            DesignList: Custom list of pyDesign objects. Can be accessed by name or index.
+            DesignList: Custom list of DesignHandle objects. Can be accessed by name or index.
             
         Example:
             >>> designs = project.designs
             >>> design = project.designs["HFSS_design1"]  # 이름으로 접근
             >>> design = project.designs[0]  # 인덱스로 접근
+            >>> design.materialize()  # pyDesign 객체
         """
-        designs = DesignList()
+        if self._designs_cache is not None and self._designs_cache.generation == self.designs_generation:
+            return self._designs_cache
+
+        designs = DesignList(generation=self.designs_generation)
 
         try:
             for design in self.project.GetDesigns():
                 try:
                     design_name = design.GetName()
                     solver_type = design.GetDesignType()
-                    # pyDesign은 name과 solver만 필요 (기존 design을 로드)
-                    designs.append(pyDesign(self, name=design_name, solver=solver_type))
+                    # handle은 name과 solver만 저장 (pyDesign은 처음 사용할 때 생성)
+                    designs.append(DesignHandle(self, name=design_name, design_type=solver_type), name=design_name)
                 except Exception as e:
-                    # 개별 design 생성 실패 시 건너뛰기
-                    print(f"Warning: Failed to create pyDesign for design: {e}")
+                    # 개별 design 조회 실패 시 건너뛰기
+                    print(f"Warning: Failed to read design: {e}")
                     continue
         except Exception as e:
             print(f"Error getting designs: {e}")
-            
+            return designs
+
+        self._designs_cache = designs
         return designs
 
 
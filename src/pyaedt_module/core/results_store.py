@@ -0,0 +1,419 @@
+import os
+import json
+import time
+import uuid
+import socket
+import hashlib
+from numbers import Number
+from typing import Optional
+
+import psutil
+
+
+SHARD_PREFIX = "part-"
+COMPACT_PREFIX = "compact-"
+
+_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+
+HASH_COLUMN = "input_hash"
+
+
+def _require_pyarrow():
+    # pyarrow는 결과 저장소를 쓸 때만 필요하므로 lazy import
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError as e:
+        raise ImportError("ResultsStore requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+class ResultsStore :
+    """
+    Lock-free columnar results store.
+
+    각 프로세스는 append할 때마다 자기 이름(host-pid-seq)의 작은 Parquet/Feather shard 파일을 새로 쓴다.
+    파일은 tmp 이름으로 쓴 뒤 os.replace로 공개하므로 reader는 완성된 shard만 보고,
+    writer끼리 같은 파일을 건드리지 않으므로 FileLock이 필요 없다.
+
+    - 숫자 column은 float64, 나머지는 string으로 정규화하고, shard마다 type이 다른 column은 읽을 때 string으로 합친다.
+    - compact()는 쌓인 shard를 하나의 compact 파일로 합치고 원본 shard를 지운다 (lock 파일로 compactor는 하나만, 죽은 compactor의 lock은 회수).
+    - dataset()/read()는 pyarrow.dataset 기반이라 필요한 column만 읽는다.
+
+    Example:
+        >>> store = ResultsStore("simulation_results")
+        >>> store.append(results_df)
+        >>> df = store.read(columns=["N1", "Lmt", "copperloss_Tx"])
+        >>> store.compact()
+    """
+
+    def __init__(self, directory: str = "simulation_results", format: str = "parquet", worker_id: Optional[str] = None) -> None:
+        if format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported format: {format} (choose from {list(_EXTENSIONS)})")
+
+        self.directory = os.path.abspath(directory)
+        self.format = format
+        self.extension = _EXTENSIONS[format]
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        self._seq = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+
+    # ------------------------------------------------------------------ write
+
+    @staticmethod
+    def _to_table(df):
+        """Converts a DataFrame to a pyarrow Table with the store's normalized schema."""
+        pa = _require_pyarrow()
+        import pandas as pd
+
+        df = df.reset_index(drop=True)
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            # object column이라도 전부 숫자면 숫자로 저장
+            numeric = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors="coerce")
+            if numeric.notna().sum() == series.notna().sum():
+                columns[str(name)] = pa.array(numeric.to_numpy(dtype="float64", na_value=float("nan")), type=pa.float64())
+            else:
+                columns[str(name)] = pa.array(series.astype("string").to_numpy(dtype=object, na_value=None), type=pa.string())
+        return pa.table(columns)
+
+
+    def _write_table(self, table, path: str) -> None:
+        _require_pyarrow()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, path)
+
+
+    def append(self, df) -> str:
+        """
+        Writes the rows of `df` as a new shard.
+
+        Returns:
+            str: Path of the written shard.
+        """
+        table = self._to_table(df)
+        self._seq += 1
+        name = f"{SHARD_PREFIX}{self.worker_id}-{self._seq:06d}-{uuid.uuid4().hex[:8]}{self.extension}"
+        path = os.path.join(self.directory, name)
+        self._write_table(table, path)
+        return path
+
+
+    # ------------------------------------------------------------------ read
+
+    def files(self, shards_only: bool = False) -> list:
+        """Lists the committed data files (compacted files first, then shards)."""
+        compacted, shards = [], []
+        for entry in sorted(os.listdir(self.directory)):
+            if not entry.endswith(self.extension):
+                continue
+            if entry.startswith(COMPACT_PREFIX):
+                compacted.append(os.path.join(self.directory, entry))
+            elif entry.startswith(SHARD_PREFIX):
+                shards.append(os.path.join(self.directory, entry))
+        return shards if shards_only else compacted + shards
+
+
+    @staticmethod
+    def _unify_schemas(schemas) -> tuple:
+        """
+        Merges shard schemas; returns (schema, conflicts).
+
+        shard는 각자 column type을 정하므로 같은 column이 어떤 shard에서는 float64, 다른 shard에서는 string일 수 있다
+        (예: 숫자 column에 "fail" 같은 값이 들어간 sample). 이런 column은 string으로 읽는다.
+        """
+        pa = _require_pyarrow()
+        types = {}
+        for schema in schemas:
+            for field in schema:
+                types.setdefault(field.name, []).append(field.type)
+        conflicts = {name for name, found in types.items() if any(t != found[0] for t in found)}
+        schema = pa.schema([(name, pa.string() if name in conflicts else found[0]) for name, found in types.items()])
+        return schema, conflicts
+
+
+    def _dataset(self, files: Optional[list] = None) -> tuple:
+        pa = _require_pyarrow()
+        import pyarrow.dataset as ds
+
+        files = self.files() if files is None else files
+        file_format = "parquet" if self.format == "parquet" else "ipc"
+        if not files:
+            return ds.dataset([], format=file_format, schema=pa.schema([])), set()
+
+        # shard마다 column 구성이 다를 수 있으므로 footer의 schema만 읽어 합친다
+        schema, conflicts = self._unify_schemas([ds.dataset(path, format=file_format).schema for path in files])
+        return ds.dataset(files, format=file_format, schema=schema), conflicts
+
+
+    def dataset(self, files: Optional[list] = None):
+        """
+        Returns a lazy pyarrow.dataset.Dataset over the store (nothing is read until scanned).
+        Shards with different column sets are merged into one unified schema; a column stored with
+        different types in different shards is read as string.
+        """
+        return self._dataset(files)[0]
+
+
+    def read(self, columns: Optional[list] = None, filter=None):
+        """
+        Reads the store into a pandas DataFrame, loading only the requested columns.
+
+        Args:
+            columns: Column names to load (None loads everything).
+            filter: Optional pyarrow.dataset expression, e.g. ``pyarrow.dataset.field("N1") > 10``.
+        """
+        dataset, conflicts = self._dataset()
+        if columns is not None:
+            columns = [column for column in columns if column in dataset.schema.names]
+        if filter is None or not conflicts:
+            return dataset.to_table(columns=columns, filter=filter).to_pandas()
+        # type이 섞인 column은 shard 단위 filter pushdown이 안 되므로 string으로 읽은 뒤 filter
+        return dataset.to_table().filter(filter).select(columns if columns is not None else dataset.schema.names).to_pandas()
+
+
+    def scan(self, columns: Optional[list] = None, batch_size: int = 65536):
+        """Yields pandas DataFrames batch by batch (for datasets larger than memory)."""
+        for batch in self.dataset().to_batches(columns=columns, batch_size=batch_size):
+            yield batch.to_pandas()
+
+
+    def count(self) -> int:
+        return self.dataset().count_rows()
+
+
+    # ------------------------------------------------------------------ compaction
+
+    def _try_lock(self, path: str, lock_timeout: float) -> bool:
+        """O_EXCL lock file with "host:pid:time"; a lock whose owner died or that is older than lock_timeout is reclaimed."""
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._is_stale(path, lock_timeout):
+                    return False
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue # 다른 프로세스가 먼저 회수했으면 다음 os.open이 실패한다
+            with os.fdopen(fd, "w") as file:
+                file.write(f"{socket.gethostname()}:{os.getpid()}:{time.time()}")
+            return True
+        return False
+
+
+    @staticmethod
+    def _is_stale(path: str, lock_timeout: float) -> bool:
+        try:
+            with open(path, "r") as file:
+                host, pid, created = file.read().split(":")
+            pid, created = int(pid), float(created)
+        except (OSError, ValueError):
+            # 쓰는 도중이거나 깨진 파일: 충분히 오래된 경우만 stale
+            try:
+                return time.time() - os.path.getmtime(path) > lock_timeout
+            except OSError:
+                return False
+        if time.time() - created > lock_timeout:
+            return True
+        # pid는 같은 host에서만 확인할 수 있다 (공유 디렉토리에서 다른 노드의 lock은 timeout으로만 회수)
+        if host != socket.gethostname():
+            return False
+        return not psutil.pid_exists(pid)
+
+
+    def compact(self, min_files: int = 2, lock_timeout: float = 3600) -> Optional[str]:
+        """
+        Merges every shard (and earlier compacted files) into one compacted file and removes the merged files.
+
+        Shards written while compaction runs are left untouched and picked up by the next compaction.
+        Only one process compacts at a time (O_EXCL lock file); others return None immediately.
+        A lock left by a compactor that died (same host) or older than `lock_timeout` seconds is reclaimed.
+        The merged files are removed only after the compacted file is in place, so a reader listing
+        the directory in that short window may see those rows twice, but never loses them.
+
+        Returns:
+            str or None: Path of the new compacted file, or None if nothing was compacted.
+        """
+        lock_path = os.path.join(self.directory, ".compact.lock")
+        if not self._try_lock(lock_path, lock_timeout):
+            return None
+
+        try:
+            files = self.files()
+            if len(files) < min_files:
+                return None
+
+            table = self.dataset(files).to_table()
+            path = os.path.join(self.directory, f"{COMPACT_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}{self.extension}")
+            self._write_table(table, path)
+
+            for file in files:
+                try:
+                    os.remove(file)
+                except FileNotFoundError:
+                    pass
+            return path
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+
+
+    def export_csv(self, path: str = "simulation_results.csv", columns: Optional[list] = None) -> str:
+        """Writes the whole store to a single CSV file (for tools that still expect the legacy file)."""
+        self.read(columns=columns).to_csv(path, index=False)
+        return path
+
+
+    def __len__(self) :
+        return self.count()
+
+
+def _canonical_value(value, digits: int):
+    # 5, 5.0, np.int64(5), "5" 가 모두 같은 key가 되도록 숫자는 유효숫자 digits자리 float로 통일
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    if isinstance(value, Number):
+        value = float(value)
+        if value != value:
+            return None # NaN
+        return float(f"{value:.{digits}g}")
+    return str(value)
+
+
+def input_hash(params: dict, columns: Optional[list] = None, digits: int = 12) -> str:
+    """
+    Canonical hash of an input parameter set.
+
+    Args:
+        params: Parameter name -> value.
+        columns: Column order to hash in (e.g. the get_input_parameter columns). Missing keys hash as None,
+            keys outside `columns` are ignored. If None, every key is used in sorted order.
+        digits: Significant digits kept for numeric values.
+
+    Returns:
+        str: sha1 hex digest.
+    """
+    if columns is None:
+        columns = sorted(params)
+    items = [[column, _canonical_value(params.get(column), digits)] for column in columns]
+    return hashlib.sha1(json.dumps(items, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ResultCache :
+    """
+    Input-hash memoization on top of a ResultsStore.
+
+    결과를 저장할 때 입력 parameter의 canonical hash를 input_hash column으로 같이 기록하고,
+    새 parameter set을 해석하기 전에 같은 hash가 이미 store에 있으면 저장된 결과 row를 돌려준다.
+    hash index는 input_hash column만 읽어서 만들고, miss가 나면 새로 생긴 shard만 추가로 읽는다.
+
+    Example:
+        >>> cache = ResultCache(ResultsStore("simulation_results"), columns=INPUT_PARAMETER_COLUMNS)
+        >>> cached = cache.lookup(input_parameter)
+        >>> if cached is None:
+        ...     results_df = run_pipeline(input_parameter)
+        ...     cache.save(input_parameter, results_df)
+        >>> cache.metrics()
+        {'hits': 3, 'misses': 120, 'hit_rate': 0.024, ...}
+    """
+
+    def __init__(self, store: ResultsStore, columns: Optional[list] = None, hash_column: str = HASH_COLUMN, digits: int = 12) -> None:
+        self.store = store
+        self.columns = list(columns) if columns is not None else None
+        self.hash_column = hash_column
+        self.digits = digits
+
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+
+        self._index = set()
+        self._indexed_files = set()
+
+
+    def key(self, params: dict) -> str:
+        return input_hash(params, self.columns, self.digits)
+
+
+    def _refresh_index(self) -> None:
+        """Reads the hash column of data files that were not indexed yet."""
+        files = [path for path in self.store.files() if path not in self._indexed_files]
+        if not files:
+            return
+        dataset = self.store.dataset(files)
+        if self.hash_column in dataset.schema.names:
+            hashes = dataset.to_table(columns=[self.hash_column]).column(self.hash_column).to_pylist()
+            self._index.update(value for value in hashes if value is not None)
+        self._indexed_files.update(files)
+
+
+    def lookup(self, params: dict):
+        """
+        Returns the stored result row (DataFrame) for `params`, or None on a miss.
+        """
+        start = time.time()
+        key = self.key(params)
+
+        if key not in self._index:
+            self._refresh_index()
+
+        result = None
+        if key in self._index:
+            import pyarrow.dataset as ds
+            df = self.store.read(filter=ds.field(self.hash_column) == key)
+            if len(df):
+                result = df.head(1).reset_index(drop=True)
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.lookup_time += time.time() - start
+        return result
+
+
+    def save(self, params: dict, results_df) -> str:
+        """Appends `results_df` to the store tagged with the input hash of `params`."""
+        key = self.key(params)
+        results_df = results_df.copy()
+        results_df[self.hash_column] = key
+        path = self.store.append(results_df)
+        self._index.add(key)
+        return path
+
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "lookup_time": self.lookup_time,
+            "indexed": len(self._index),
+        }
+
+
+    def __repr__(self) :
+        metrics = self.metrics()
+        return f"ResultCache(hits={metrics['hits']}, misses={metrics['misses']}, hit_rate={metrics['hit_rate']:.3f})"
@@ -1,31 +1,44 @@
 import subprocess
 import psutil
+import socket
 import time
 import os
-import csv
 from datetime import datetime
 
-import pandas as pd
+from .slot_store import SlotTable
+from .process_probe import ProcessProbe, kill_tree
+from .admission import AdmissionController
+from .job_queue import JobQueue, ENV_QUEUE_PATH, ENV_WORKER_ID
 
 class Scheduler :
 
     def __init__(
             self,
             max_processes = 5,
-            max_runtime = 300,
+            max_runtime = None,
             start_interval = 3,
             interval = 10,
             script_name = None,
             conda_env = None,
-            log_file = "process_log.csv"
+            log_file = "process_log.csv",
+            journal_file = "process_log.jsonl",
+            snapshot_interval = 30,
+            poll_interval = 1,
+            min_processes = 1,
+            admission = None,
+            job_queue = None,
+            kill_timeout = 15
     ):
-        self.max_processes = max_processes
+        self.max_processes = max_processes # slot 수 (동시 실행 상한)
         self.max_runtime = max_runtime
         self.start_interval = start_interval
         self.interval = interval
+        self.kill_timeout = kill_timeout # slot 프로세스 트리 teardown deadline (초)
         self.script_name = script_name
         self.conda_env = conda_env
-        self.log_file = log_file
+        self.log_file = log_file # CSV snapshot (None이면 렌더링 안함)
+        self.journal_file = journal_file
+        self.poll_interval = poll_interval
 
         self.iter = 0
 
@@ -34,25 +47,54 @@ class Scheduler :
         self.active_processes = []
 
         # delete existing log file
-        if os.path.exists(self.log_file):
+        if self.log_file is not None and os.path.exists(self.log_file):
             os.remove(self.log_file)
 
-        # make new log file
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, mode="w", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(["PID", "aedt_PID", "Start Time", "Status", "CPU_usage", "RAM_usage"])
+        # slot 상태는 메모리가 기준이고, journal(JSONL)에는 변경분만 append 한다
+        self.slots = SlotTable(
+            n_slots = self.max_processes,
+            journal_file = self.journal_file,
+            snapshot_file = self.log_file,
+            snapshot_interval = snapshot_interval
+        )
+        self.slots.maybe_snapshot(force=True)
+
+        # 모든 slot을 한 번의 process table snapshot으로 확인하는 probing engine
+        self.probe = ProcessProbe()
+
+        # 여유 RAM / load average / slot RSS 기준으로 동시 실행 수를 조절
+        if admission is None:
+            admission = AdmissionController(min_processes=min_processes, max_processes=max_processes)
+        self.admission = admission
+
+        # job_queue가 있으면 script는 PYAEDT_JOB_QUEUE 환경변수로 queue를 열어 parameter set을 claim 한다
+        if isinstance(job_queue, str):
+            job_queue = JobQueue(job_queue)
+        self.job_queue = job_queue
+        self._worker_ids = {} # slot -> PYAEDT_WORKER_ID
+        self._n_launch = 0
 
 
     
-    def _start_process(self) :
+    def _start_process(self, slot=None) :
 
         script_path = os.path.join(os.getcwd(), self.script_name)
+
+        env = None
+        if self.job_queue is not None :
+            self._n_launch += 1
+            worker_id = f"{socket.gethostname()}:{os.getpid()}:slot{slot}:{self._n_launch}"
+            self._worker_ids[slot] = worker_id
+            env = dict(os.environ)
+            env[ENV_QUEUE_PATH] = self.job_queue.path
+            env[ENV_WORKER_ID] = worker_id
+
         process = subprocess.Popen(
             ['conda', 'run', '-n', self.conda_env, 'python', script_path],
             shell=False,
             stdout=subprocess.DEVNULL,  # 출력을 콘솔에 표시하지 않음
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.DEVNULL,
+            env=env
         )
 
         pid = process.pid
@@ -65,137 +107,116 @@ class Scheduler :
     def _is_my_process_alive(self, pid):
 
         # 0:시뮬레이션 종료, 1:시뮬레이션 중, 2:이상동작
+        # 단일 slot 확인용. run_simulation에서는 _probe_slots로 전체 slot을 한 번에 확인한다.
+        return tuple(self.probe.probe([pid])[pid])
 
-        try:
-            proc = psutil.Process(pid)  # `conda run` 실행 프로세스
-            child_procs = proc.children(recursive=True)  # 실제 실행된 프로세스 찾기
-
-            if not child_procs: # child process 없는 경우
-                print("no child process")
-                return 2, 0, 0, 0
-
-            # find ansysedt process
-            ansys_edt = self._find_ansys_edt(pid)
-            
-            if ansys_edt == 0 : # child process는 있으나 ansysedt 안열린 경우 -> 다시실행해야함
-                print("no aedt")
-                return 2, 0, 0, 0
-            
-
-            ansys_edt_child = ansys_edt.children(recursive=True)
-
-            process_check_itr = 0
-            for i in range(3) :
-                non_ansyscl_processes = [child for child in ansys_edt_child if child.name().lower() != "ansyscl.exe"]
-                if non_ansyscl_processes : process_check_itr += 1
-                time.sleep(0.5)
-
-            if process_check_itr > 0 :
-                cpu_usage = proc.cpu_percent(interval=0.5)
-                mem_usage = proc.memory_info().rss / (1024 * 1024)
-                for child in proc.children(recursive=True):
-                    cpu_usage += child.cpu_percent(interval=None) 
-                    mem_usage += child.memory_info().rss / (1024 * 1024)
-                return 1, int(ansys_edt.pid), cpu_usage, mem_usage
-            else:
-                print("no simulation running")
-                return 0, 0, 0, 0
-            
-        except psutil.NoSuchProcess:
-            return 2, 0, 0, 0
-        
-    def _find_ansys_edt(self, pid) :
 
-        proc = psutil.Process(pid)  # `conda run` 실행 프로세스
-        child_procs = proc.children(recursive=True)  # 실제 실행된 프로세스 찾기
+    def _probe_slots(self, slots):
+        """
+        Probes every given slot against one process table snapshot (no sleeps).
 
-        for child in child_procs:
-                try:
-                    proc_name = child.name().lower()
-                    if "ansysedt.exe" in proc_name:  # Ansys 관련 프로세스 필터링
-                        ansys_edt = child
-                        return ansys_edt
-                except psutil.NoSuchProcess:
-                    return 0
+        Returns:
+            dict[int, ProbeResult]: Result per root PID.
+        """
+        return self.probe.probe([self.slots[i].pid for i in slots])
 
 
     
 
 
+    def _kill(self, pid) :
+        # conda run 프로세스만 죽이면 AEDT/solver 자식이 남으므로 트리 전체를 deadline 안에 정리
+        result = kill_tree(pid, timeout=self.kill_timeout)
+        if result.survivors :
+            print(f"Warning: slot process {pid} teardown left {result.survivors} alive after {result.duration:.1f} s")
+
+
+    def _release_jobs(self, slot) :
+        # 죽은/강제종료된 slot이 잡고 있던 job은 다시 queue로 돌려보낸다
+        if self.job_queue is not None and slot in self._worker_ids :
+            self.job_queue.requeue_worker(self._worker_ids[slot])
+
+
+    def _has_work(self) :
+        if self.job_queue is None :
+            return True
+        return len(self.job_queue) > 0
+
+
     def run_simulation(self, n_iter=1000) :
 
-        start_flag = True
+        last_start = 0.0
         
         while(self.iter < n_iter) :
 
-            df = pd.read_csv(self.log_file)
-
-            for i in range(self.max_processes) :
+            # 시작 후 60초 지난 slot을 tick당 한 번에 probing
+            now = time.time()
+            due = [record.slot for record in self.slots if record.status in ("START", "RUNNING") and now - record.launch_time > 60]
+            probe_results = self._probe_slots(due) if due else {}
 
-                if start_flag == True :
+            # 자원 상태에 따라 목표 동시 실행 수 조정
+            self.admission.update(probe_results.values(), running=self.slots.count("START", "RUNNING"))
 
-                    pid, start_time, status = self._start_process()
-                    df.loc[i] = [pid, 0, start_time, status, 0, 0]
-                    time.sleep(self.start_interval)
+            for i in due :
 
-                    if i == self.max_processes-1 : 
-                        start_flag = False
+                log = self.slots[i]
+                pid = log.pid
 
-                else :
+                running, ansys_pid, cpu_usage, mem_usage = probe_results[pid]
 
-                    log = df.iloc[i]
+                current_time = time.time()
+                excution_time = current_time - log.launch_time
 
-                    pid = log["PID"]
-                    start_time = log["Start Time"]
-                    start_time_strp = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
-                    status = log["Status"]
+                if self.max_runtime is not None and excution_time > self.max_runtime : # 시뮬레이션이 지정한시간 이상으로 실행되는 경우 (강제종료)
+                    self.slots.update(i, aedt_pid=ansys_pid, start_time=current_time, status="PENDING", cpu_usage=cpu_usage, ram_usage=mem_usage)
+                    self._kill(pid)
+                    self._release_jobs(i)
 
-                    current_time = datetime.now()
-                    current_time_strf = current_time.strftime('%Y-%m-%d %H:%M:%S')
+                elif running == 1 : # 시뮬레이션이 잘 돌고있는 상태
+                    self.slots.update(i, aedt_pid=ansys_pid, start_time=current_time, status="RUNNING", cpu_usage=cpu_usage, ram_usage=mem_usage)
 
-                    excution_time = (current_time - start_time_strp).total_seconds()
+                elif running == 0  : # 시뮬레이션이 끝난 상태
+                    print(f"process {self.iter} complete")
+                    self.iter = self.iter + 1
+                    self.slots.update(i, aedt_pid=ansys_pid, start_time=current_time, status="PENDING", cpu_usage=cpu_usage, ram_usage=mem_usage)
 
-                    if excution_time > 60 :
+                elif running == 2 : # 시뮬레이션 이상 동작
+                    self.slots.update(i, aedt_pid=ansys_pid, start_time=current_time, status="PENDING", cpu_usage=cpu_usage, ram_usage=mem_usage)
+                    self._kill(pid)
+                    self._release_jobs(i)
 
-                        running, ansys_pid, cpu_usage, mem_usage = self._is_my_process_alive(pid)
+                # print(f"{i} : {pid} / {status} / {cpu_usage} / {mem_usage} / ")
 
 
-                        if running == 1 : # 시뮬레이션이 잘 돌고있는 상태
-                            df.loc[i] = [pid, ansys_pid, current_time_strf, "RUNNING", cpu_usage, mem_usage]
+            if self.job_queue is not None :
+                self.job_queue.requeue_expired()
+                # queue가 다 소진되고 실행 중인 slot도 없으면 종료
+                if self.job_queue.pending() == 0 and self.slots.count("START", "RUNNING") == 0 :
+                    break
 
-                        elif running == 0  : # 시뮬레이션이 끝난 상태
-                            print(f"process {self.iter} complete")
-                            self.iter = self.iter + 1
-                            df.loc[i] = [pid, ansys_pid, current_time_strf, "PENDING", cpu_usage, mem_usage]
+            # 빈 slot / 대기시간 지난 pending slot에 admission이 허용하는 만큼 새 process 배치
+            for log in self.slots :
 
-                        elif running == 2 : # 시뮬레이션 이상 동작
-                            df.loc[i] = [pid, ansys_pid, current_time_strf, "PENDING", cpu_usage, mem_usage]
-                            proc = psutil.Process(pid)
-                            proc.kill()
+                current_time = time.time()
+                if not (log.status == "EMPTY" or (log.status == "PENDING" and current_time - log.start_time > self.interval)) :
+                    continue
+                if current_time - last_start < self.start_interval :
+                    break
+                if not self.admission.can_admit(self.slots.count("START", "RUNNING")) :
+                    break
+                if not self._has_work() :
+                    break
 
-                        elif excution_time > self.max_runtime : # 시뮬레이션이 지정한시간 이상으로 실행되는 경우 (강제종료)
-                            df.loc[i] = [pid, ansys_pid, current_time_strf, "PENDING", cpu_usage, mem_usage]
-                            proc = psutil.Process(pid)
-                            proc.kill()
+                pid, start_time, status = self._start_process(log.slot)
+                last_start = time.time()
+                self.slots.update(log.slot, pid=pid, aedt_pid=0, start_time=last_start, launch_time=last_start, status=status, cpu_usage=0, ram_usage=0)
 
-                        elif status == "PENDING" and excution_time > self.interval : # pending 상태에서 대기시간 지난 케이스
-                            pid, start_time, status = self._start_process()
-                            df.loc[i] = [pid, ansys_pid, current_time_strf, "START", 0, 0]
 
-                
-                    # time.sleep(1)
-                    # print(f"{i} : {pid} / {status} / {cpu_usage} / {mem_usage} / ")
+            # 변경분만 journal에 append, CSV는 주기적으로만 렌더링
+            self.slots.flush()
+            self.slots.maybe_snapshot()
 
+            time.sleep(self.poll_interval)
 
-            attempts = 0
-            max_attempts = 5
-            while True:
-                try:
-                    df.to_csv(self.log_file, index=False)
-                    break  # 저장 성공하면 루프 탈출
-                except Exception as e:
-                    attempts += 1
-                    print(f"CSV 기록 오류 발생: {e}. 재시도 {attempts}/{max_attempts}...")
-                    if attempts >= max_attempts:
-                        raise e  # 최대 재시도 횟수를 넘으면 예외 발생
-                    time.sleep(1)  # 1초 후 재시도
+        self.slots.flush()
+        self.slots.maybe_snapshot(force=True)
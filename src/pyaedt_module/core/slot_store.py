@@ -0,0 +1,195 @@
+import os
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Optional
+
+
+class SlotRecord :
+    """
+    Scheduler slot 하나의 상태를 담는 compact record.
+
+    start_time은 마지막 상태 갱신 시각, launch_time은 프로세스 실행 시각이며 둘 다 epoch(float)로 유지한다.
+    사람이 읽는 문자열은 snapshot 렌더링 시에만 만든다.
+    """
+
+    __slots__ = ("slot", "pid", "aedt_pid", "start_time", "launch_time", "status", "cpu_usage", "ram_usage")
+
+    FIELDS = ("pid", "aedt_pid", "start_time", "launch_time", "status", "cpu_usage", "ram_usage")
+
+    def __init__(self, slot: int, pid: int = 0, aedt_pid: int = 0, start_time: float = 0.0, launch_time: float = 0.0,
+                 status: str = "EMPTY", cpu_usage: float = 0.0, ram_usage: float = 0.0) -> None:
+        self.slot = slot
+        self.pid = pid
+        self.aedt_pid = aedt_pid
+        self.start_time = start_time
+        self.launch_time = launch_time
+        self.status = status
+        self.cpu_usage = cpu_usage
+        self.ram_usage = ram_usage
+
+    def to_dict(self) -> dict:
+        return {"slot": self.slot, **{key: getattr(self, key) for key in self.FIELDS}}
+
+    def __repr__(self) :
+        return (f"SlotRecord(slot={self.slot}, pid={self.pid}, aedt_pid={self.aedt_pid}, "
+                f"status={self.status}, cpu_usage={self.cpu_usage}, ram_usage={self.ram_usage})")
+
+
+class SlotTable :
+    """
+    Scheduler의 in-memory slot table (single source of truth).
+
+    모든 상태 변경은 append-only JSONL journal에 event 한 줄로 기록되고,
+    매 loop마다 버퍼에 쌓인 event만 한 번에 flush 된다 (full read-modify-write 없음).
+    기존 CSV log는 snapshot_file을 지정한 경우에만 snapshot_interval 주기로 렌더링된다.
+
+    Example:
+        >>> slots = SlotTable(4, journal_file="process_log.jsonl", snapshot_file="process_log.csv")
+        >>> slots.update(0, pid=1234, status="START", start_time=time.time())
+        >>> slots.flush()
+    """
+
+    SNAPSHOT_HEADER = ["PID", "aedt_PID", "Start Time", "Status", "CPU_usage", "RAM_usage"]
+
+    def __init__(
+            self,
+            n_slots: int = 0,
+            journal_file: Optional[str] = "process_log.jsonl",
+            snapshot_file: Optional[str] = None,
+            snapshot_interval: float = 30,
+            resume: bool = False
+    ) -> None:
+        self.journal_file = journal_file
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+
+        self.records = []
+        self._pending = []
+        self._last_snapshot = 0.0
+
+        if journal_file is not None :
+            if resume and os.path.exists(journal_file):
+                self._replay(journal_file)
+            elif os.path.exists(journal_file):
+                os.remove(journal_file)
+
+        self.resize(n_slots)
+
+
+    def __len__(self) :
+        return len(self.records)
+
+    def __getitem__(self, slot: int) -> SlotRecord :
+        return self.records[slot]
+
+    def __iter__(self) :
+        return iter(self.records)
+
+
+    def resize(self, n_slots: int) -> None:
+        """Grows the table to at least `n_slots` records (existing slots are never dropped)."""
+        while len(self.records) < n_slots:
+            self.records.append(SlotRecord(slot=len(self.records)))
+
+
+    def update(self, slot: int, **fields) -> SlotRecord:
+        """
+        Updates the given slot in memory and queues a journal event for the changed fields only.
+
+        Args:
+            slot: Slot index.
+            **fields: Any of SlotRecord.FIELDS.
+
+        Returns:
+            SlotRecord: The updated record.
+        """
+        self.resize(slot + 1)
+        record = self.records[slot]
+
+        changed = {}
+        for key, value in fields.items():
+            if key not in SlotRecord.FIELDS:
+                raise KeyError(f"Unknown slot field: {key}")
+            if getattr(record, key) != value:
+                setattr(record, key, value)
+                changed[key] = value
+
+        if changed:
+            self._pending.append({"t": round(time.time(), 3), "slot": slot, **changed})
+
+        return record
+
+
+    def count(self, *status: str) -> int:
+        return sum(1 for record in self.records if record.status in status)
+
+
+    def flush(self) -> None:
+        """Appends the buffered events to the journal with a single write call."""
+        if not self._pending:
+            return
+        if self.journal_file is not None:
+            lines = "".join(json.dumps(event, default=_json_default) + "\n" for event in self._pending)
+            with open(self.journal_file, mode="a", encoding="utf-8") as file:
+                file.write(lines)
+                file.flush()
+        self._pending = []
+
+
+    def maybe_snapshot(self, force: bool = False) -> bool:
+        """
+        Renders the CSV snapshot if snapshot_file is set and snapshot_interval has elapsed.
+
+        Returns:
+            bool: True if a snapshot was written.
+        """
+        if self.snapshot_file is None:
+            return False
+        now = time.time()
+        if not force and now - self._last_snapshot < self.snapshot_interval:
+            return False
+        self.render_snapshot(self.snapshot_file)
+        self._last_snapshot = now
+        return True
+
+
+    def render_snapshot(self, path: str) -> None:
+        """Writes the current table in the legacy process_log.csv format (atomic replace)."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.SNAPSHOT_HEADER)
+            for record in self.records:
+                start_time = datetime.fromtimestamp(record.start_time).strftime('%Y-%m-%d %H:%M:%S') if record.start_time else ""
+                writer.writerow([record.pid, record.aedt_pid, start_time, record.status, record.cpu_usage, record.ram_usage])
+        os.replace(tmp_path, path)
+
+
+    def _replay(self, journal_file: str) -> None:
+        """Rebuilds the in-memory table from an existing journal (crash recovery)."""
+        with open(journal_file, mode="r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # 마지막 줄이 쓰다 만 상태로 남은 경우 무시
+                    continue
+                slot = event.pop("slot")
+                event.pop("t", None)
+                self.resize(slot + 1)
+                record = self.records[slot]
+                for key, value in event.items():
+                    if key in SlotRecord.FIELDS:
+                        setattr(record, key, value)
+
+
+def _json_default(value):
+    # numpy scalar 등 json 기본 직렬화가 안되는 값 처리
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
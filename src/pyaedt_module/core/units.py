@@ -0,0 +1,245 @@
+import re
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+# "1.6uH", "-3.5e-2 mm", "10kHz", "25cel" (값 뒤에 unit, 공백 허용)
+_VALUE_PATTERN = r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z_%]*)\s*$"
+_VALUE_RE = re.compile(_VALUE_PATTERN)
+
+_PREFIXES = {
+    "f": 1e-15, "p": 1e-12, "n": 1e-9, "u": 1e-6, "m": 1e-3, "c": 1e-2, "d": 1e-1,
+    "": 1.0, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12,
+}
+
+# base unit -> (dimension, 허용 prefix)
+_BASE_UNITS = {
+    "m": ("length", "fpnumcdk"),
+    "H": ("inductance", "fpnum"),
+    "F": ("capacitance", "fpnum"),
+    "Hz": ("frequency", "kMGT"),
+    "W": ("power", "fpnumkMG"),
+    "A": ("current", "fpnumk"),
+    "V": ("voltage", "fpnumk"),
+    "Ohm": ("resistance", "umkMG"),
+    "ohm": ("resistance", "umkMG"),
+    "s": ("time", "fpnum"),
+    "T": ("magnetic_flux_density", "um"),
+    "Wb": ("magnetic_flux", "um"),
+    "S": ("conductance", "um"),
+    "J": ("energy", "mk"),
+    "N": ("force", "mk"),
+    "g": ("mass", "mk"),
+}
+
+# prefix 규칙으로 만들 수 없는 unit (dimension, SI scale)
+_EXTRA_UNITS = {
+    "meter": ("length", 1.0),
+    "uin": ("length", 2.54e-8),
+    "mil": ("length", 2.54e-5),
+    "in": ("length", 0.0254),
+    "ft": ("length", 0.3048),
+    "yd": ("length", 0.9144),
+    "deg": ("angle", math.pi / 180),
+    "degmin": ("angle", math.pi / 180 / 60),
+    "degsec": ("angle", math.pi / 180 / 3600),
+    "rad": ("angle", 1.0),
+    "rpm": ("frequency", 1 / 60),
+    "rps": ("frequency", 1.0),
+    "min": ("time", 60.0),
+    "hour": ("time", 3600.0),
+    "Tesla": ("magnetic_flux_density", 1.0),
+    "gauss": ("magnetic_flux_density", 1e-4),
+    "siemens": ("conductance", 1.0),
+    "Nm": ("torque", 1.0),
+    "%": ("ratio", 0.01),
+}
+
+# 온도는 affine 변환: SI(K) = value * scale + offset
+_TEMPERATURE_UNITS = {
+    "kel": (1.0, 0.0),
+    "K": (1.0, 0.0),
+    "cel": (1.0, 273.15),
+    "C": (1.0, 273.15),
+    "fah": (5 / 9, 273.15 - 32 * 5 / 9),
+}
+
+# AEDT가 받는 unit이지만 log scale이라 변환하지 않는 unit
+_LOG_UNITS = frozenset(["dB", "dBm", "dBW"])
+
+
+def _build_unit_table() -> dict:
+    table = {}
+    for base, (dimension, prefixes) in _BASE_UNITS.items():
+        table[base] = (dimension, 1.0, 0.0)
+        for prefix in prefixes:
+            table.setdefault(prefix + base, (dimension, _PREFIXES[prefix], 0.0))
+    for unit, (dimension, scale) in _EXTRA_UNITS.items():
+        table[unit] = (dimension, scale, 0.0)
+    for unit, (scale, offset) in _TEMPERATURE_UNITS.items():
+        table[unit] = ("temperature", scale, offset)
+    # 질량의 SI 기준은 kg
+    for unit in [u for u, (dim, _, _) in table.items() if dim == "mass"]:
+        dimension, scale, offset = table[unit]
+        table[unit] = (dimension, scale * 1e-3, offset)
+    return table
+
+
+UNITS = _build_unit_table()
+
+
+def is_known(unit: str) -> bool:
+    """True if AEDT understands `unit` (convertible units plus log units like dBm)."""
+    return unit in UNITS or unit in _LOG_UNITS
+
+
+def dimension(unit: str) -> str:
+    """Dimension name of `unit` (e.g. "length" for "mm")."""
+    try:
+        return UNITS[unit][0]
+    except KeyError:
+        raise ValueError(f"Unknown unit: '{unit}'") from None
+
+
+@lru_cache(maxsize=256)
+def si_unit(unit: str) -> str:
+    """SI base unit of the same dimension as `unit` (e.g. "uH" -> "H", "mm" -> "m", "cel" -> "kel")."""
+    dim = dimension(unit)
+    for name, (other, scale, offset) in UNITS.items():
+        if other == dim and scale == 1.0 and offset == 0.0:
+            return name
+    raise ValueError(f"No SI base unit for {dim} '{unit}'")
+
+
+@lru_cache(maxsize=8192)
+def parse(text: str) -> tuple:
+    """
+    Splits a value string into (number, unit), e.g. "1.6uH" -> (1.6, "uH"), "3" -> (3.0, "").
+
+    결과는 LRU cache되므로 같은 문자열을 반복해서 parsing하지 않는다.
+
+    Raises:
+        ValueError: If `text` is not a number followed by an optional unit (e.g. an expression like "2*w1").
+    """
+    match = _VALUE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid value format: {text}")
+    return float(match.group(1)), match.group(2)
+
+
+@lru_cache(maxsize=1024)
+def conversion(source: str, target: str) -> tuple:
+    """
+    Returns (scale, offset) so that value_in_target = value_in_source * scale + offset.
+
+    Raises:
+        ValueError: If a unit is unknown or the dimensions differ (e.g. "mm" -> "uH").
+    """
+    if source == target:
+        return 1.0, 0.0
+    source_dim, source_scale, source_offset = UNITS.get(source, (None, None, None))
+    target_dim, target_scale, target_offset = UNITS.get(target, (None, None, None))
+    if source_dim is None or target_dim is None:
+        raise ValueError(f"Unknown unit: '{source if source_dim is None else target}'")
+    if source_dim != target_dim:
+        raise ValueError(f"Cannot convert {source_dim} '{source}' to {target_dim} '{target}'")
+    scale = source_scale / target_scale
+    offset = (source_offset - target_offset) / target_scale
+    return scale, offset
+
+
+def convert(value, target_unit: str = None, default_unit: str = "") -> float:
+    """
+    Converts one value to `target_unit` (None: SI base unit).
+
+    Args:
+        value: "10mm", "1.6uH", or a number (number에는 default_unit 적용).
+        target_unit: Unit to convert to, e.g. "mm". None이면 SI 값(m, H, Hz, W, K, ...)을 반환.
+        default_unit: Unit assumed when the value has none.
+
+    Example:
+        >>> convert("1cm", "mm")       # 10.0
+        >>> convert("1.6uH")           # 1.6e-06
+        >>> convert("25cel", "kel")    # 298.15
+        >>> convert(3, "um", "mm")     # 3000.0
+    """
+    if isinstance(value, str):
+        number, unit = parse(value)
+    else:
+        number, unit = float(value), ""
+    unit = unit or default_unit
+    if target_unit is None:
+        if not unit:
+            return number
+        _, scale, offset = UNITS.get(unit, (None, None, None))
+        if scale is None:
+            raise ValueError(f"Unknown unit: '{unit}'")
+        return number * scale + offset
+    if not unit:
+        return number
+    scale, offset = conversion(unit, target_unit)
+    return number * scale + offset
+
+
+def to_si(value, default_unit: str = "") -> float:
+    """Shortcut for convert(value, None, default_unit)."""
+    return convert(value, None, default_unit)
+
+
+def convert_array(values, target_unit: str = None, default_unit: str = ""):
+    """
+    Vectorized convert() for whole columns (pandas Series, numpy array or list).
+
+    문자열 column은 정규식 한 번(Series.str.extract)으로 숫자/unit을 나누고,
+    unit별 scale/offset을 map한 뒤 한 번의 array 연산으로 변환한다. 숫자 column은 곱셈 한 번이다.
+    변환할 수 없는 값(수식, 모르는 unit)은 NaN이 된다.
+
+    Returns:
+        Same kind as the input: pandas Series (index 유지) for a Series, otherwise np.ndarray of float64.
+
+    Example:
+        >>> df["L11"] = convert_array(df["L11"], "uH")         # "1.6uH", "2nH", ...
+        >>> convert_array(np.array([1.0, 2.5]), "mm", "cm")    # array([10., 25.])
+    """
+    is_series = hasattr(values, "index") and hasattr(values, "to_numpy")
+
+    # 숫자 column: unit은 default_unit 하나
+    array = values.to_numpy() if is_series else np.asarray(values)
+    if array.dtype.kind in "iufb":
+        scale, offset = _array_conversion(default_unit, target_unit)
+        result = array.astype(np.float64) * scale + offset
+        if is_series:
+            import pandas as pd
+            return pd.Series(result, index=values.index, name=values.name)
+        return result
+
+    import pandas as pd
+
+    series = values if is_series else pd.Series(array, dtype=object)
+    parts = series.astype(str).str.extract(_VALUE_PATTERN)
+    numbers = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=np.float64)
+    unit_column = parts[1].fillna("").replace("", default_unit)
+
+    factors = {unit: _array_conversion(unit, target_unit) for unit in unit_column.unique()}
+    scales = unit_column.map(lambda unit: factors[unit][0]).to_numpy(dtype=np.float64)
+    offsets = unit_column.map(lambda unit: factors[unit][1]).to_numpy(dtype=np.float64)
+    result = numbers * scales + offsets
+
+    if is_series:
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
+
+
+def _array_conversion(unit: str, target_unit: str) -> tuple:
+    """(scale, offset) for convert_array; unknown/incompatible units give NaN instead of raising."""
+    if not unit:
+        return 1.0, 0.0
+    try:
+        if target_unit is None:
+            _, scale, offset = UNITS[unit]
+            return scale, offset
+        return conversion(unit, target_unit)
+    except (KeyError, ValueError):
+        return math.nan, math.nan
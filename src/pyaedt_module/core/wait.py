@@ -0,0 +1,166 @@
+import os
+import time
+import shutil
+import threading
+from typing import Callable, Optional
+
+
+class WaitTimeout(TimeoutError):
+    """Raised when a wait_until / retry deadline passes."""
+
+
+class _WaitStats :
+    """
+    Per-name wait instrumentation (호출 수, 총/최대 대기 시간, 폴링 횟수, timeout 수).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name: str, elapsed: float, polls: int, timed_out: bool) -> None:
+        with self._lock:
+            stat = self._stats.setdefault(name, {"calls": 0, "total": 0.0, "max": 0.0, "polls": 0, "timeouts": 0})
+            stat["calls"] += 1
+            stat["total"] += elapsed
+            stat["max"] = max(stat["max"], elapsed)
+            stat["polls"] += polls
+            stat["timeouts"] += int(timed_out)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+WAIT_STATS = _WaitStats()
+
+
+def wait_stats() -> dict:
+    """Returns a copy of the wait instrumentation, e.g. {"material": {"calls": 3, "total": 0.21, ...}}."""
+    return WAIT_STATS.snapshot()
+
+
+def _backoff(initial: float, factor: float, max_interval: float):
+    interval = initial
+    while True:
+        yield interval
+        interval = min(interval * factor, max_interval)
+
+
+def wait_until(
+        condition: Callable,
+        timeout: float = 10,
+        initial: float = 0.05,
+        factor: float = 2,
+        max_interval: float = 1,
+        name: Optional[str] = None,
+        raise_on_timeout: bool = True
+):
+    """
+    Polls `condition()` with exponential backoff until it returns a truthy value or the deadline passes.
+
+    고정 sleep 대신 조건이 만족되는 즉시 반환하므로, 보통은 첫 폴링(수 ms)에서 끝난다.
+    condition이 예외를 던지면 아직 준비되지 않은 것으로 보고 계속 폴링한다.
+
+    Args:
+        condition: Callable returning a truthy value once ready.
+        timeout: Deadline in seconds.
+        initial: First poll interval in seconds.
+        factor: Backoff multiplier.
+        max_interval: Upper bound of the poll interval.
+        name: Instrumentation key (defaults to the condition's name).
+        raise_on_timeout: Raise WaitTimeout on timeout instead of returning False.
+
+    Returns:
+        The truthy value returned by `condition`, or False on timeout (raise_on_timeout=False).
+
+    Example:
+        >>> wait_until(lambda: not os.path.exists(lock_file), timeout=30, name="lock_release")
+    """
+    name = name or getattr(condition, "__name__", "wait")
+    start = time.time()
+    deadline = start + timeout
+    polls = 0
+    last_error = None
+
+    for interval in _backoff(initial, factor, max_interval):
+        polls += 1
+        try:
+            result = condition()
+        except Exception as e:
+            result, last_error = None, e
+        if result:
+            WAIT_STATS.record(name, time.time() - start, polls, False)
+            return result
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+
+    WAIT_STATS.record(name, time.time() - start, polls, True)
+    if raise_on_timeout:
+        message = f"'{name}' not ready after {timeout:.1f} s ({polls} polls)"
+        if last_error is not None:
+            message += f", last error: {last_error}"
+        raise WaitTimeout(message)
+    return False
+
+
+def retry(
+        func: Callable,
+        timeout: float = 10,
+        exceptions: tuple = (Exception,),
+        initial: float = 0.1,
+        factor: float = 2,
+        max_interval: float = 2,
+        name: Optional[str] = None
+):
+    """
+    Calls `func()` until it does not raise one of `exceptions`, with exponential backoff and a deadline.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        The last exception once the deadline has passed.
+    """
+    name = name or getattr(func, "__name__", "retry")
+    start = time.time()
+    deadline = start + timeout
+    polls = 0
+
+    for interval in _backoff(initial, factor, max_interval):
+        polls += 1
+        try:
+            result = func()
+        except exceptions:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                WAIT_STATS.record(name, time.time() - start, polls, True)
+                raise
+            time.sleep(min(interval, remaining))
+            continue
+        WAIT_STATS.record(name, time.time() - start, polls, False)
+        return result
+
+
+def remove_path(path: str, timeout: float = 10, onerror: Optional[Callable] = None, name: str = "remove_path") -> bool:
+    """
+    Deletes a file or folder, retrying while it is still locked (e.g. [WinError 32] right after AEDT closes it).
+
+    Returns:
+        bool: True once the path no longer exists, False if it is still there after `timeout`.
+    """
+    def _remove():
+        if os.path.isdir(path):
+            shutil.rmtree(path, onerror=onerror)
+        elif os.path.exists(path):
+            os.remove(path)
+        return not os.path.exists(path)
+
+    return bool(wait_until(_remove, timeout=timeout, initial=0.1, max_interval=1, name=name, raise_on_timeout=False))
@@ -0,0 +1,350 @@
+import os
+import time
+import socket
+import traceback
+import multiprocessing
+from queue import Empty
+from collections import namedtuple
+from typing import Callable, Optional
+
+from .job_queue import JobQueue, Heartbeat
+from .desktop_pool import DesktopPool
+
+
+JobResult = namedtuple("JobResult", ["job_id", "worker_id", "ok", "result", "error", "duration"])
+
+_STOP = None # worker 종료 sentinel
+
+
+def _next_task(task_queue, job_queue, worker_id, poll_interval):
+    """
+    Returns the next (job_id, params) task, or _STOP when the worker should exit.
+    """
+    if job_queue is None:
+        return task_queue.get()
+
+    while True:
+        job = job_queue.claim(worker_id)
+        if job is not None:
+            return job.job_id, job.params
+        # 다른 worker가 잡고 있는 job이 lease 만료로 돌아올 수 있으므로 pending이 0일 때만 종료
+        if job_queue.pending() == 0:
+            return _STOP
+        job_queue.requeue_expired()
+        time.sleep(poll_interval)
+
+
+def _worker_main(worker_id, pipeline, task_queue, result_queue, desktop_kwargs, max_jobs, job_queue=None, poll_interval=10,
+                 current=None) -> None:
+    """
+    Worker process entry point: one pyDesktop session, many jobs.
+
+    AEDT 기동 비용은 worker당 한 번만 내고, job 사이에는 DesktopPool의 soft reset(project close/delete)으로 세션만 초기화한다.
+    세션 초기화나 health check에 실패하면(desktop이 죽은 경우 등) 그때만 프로세스를 정리하고 새로 띄운다.
+    job_queue가 주어지면 multiprocessing queue 대신 JobQueue에서 claim하고 complete/fail을 기록한다.
+    multiprocessing queue mode에서는 실행 중인 task 번호를 공유 메모리 `current`에 적어 둔다 (worker가 죽으면 부모가 읽음).
+    """
+    # soft reset / max_jobs 재시작 / 죽은 desktop 교체는 DesktopPool이 담당
+    pool = DesktopPool(size=1, desktop_kwargs=desktop_kwargs, max_uses=max_jobs)
+    queue_worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    while True:
+        task = _next_task(task_queue, job_queue, queue_worker_id, poll_interval)
+        if task is _STOP:
+            break
+        if job_queue is None:
+            # queue로 알리면 worker가 죽을 때 feeder thread가 flush하지 못할 수 있으므로 공유 메모리에 바로 기록
+            seq, job_id, params = task
+            current.value = seq
+        else:
+            job_id, params = task
+
+        heartbeat = Heartbeat(job_queue, job_id, queue_worker_id) if job_queue is not None else None
+
+        desktop = None
+        start = time.time()
+        try:
+            desktop = pool.acquire()
+            result = pipeline(desktop, params)
+            job_result = JobResult(job_id, worker_id, True, result, None, time.time() - start)
+        except Exception as e:
+            job_result = JobResult(job_id, worker_id, False, None, f"{e}\n{traceback.format_exc()}", time.time() - start)
+
+        if heartbeat is not None:
+            heartbeat.stop()
+            if job_result.ok:
+                job_queue.complete(job_id, queue_worker_id)
+            else:
+                job_queue.fail(job_id, queue_worker_id, error=job_result.error)
+        result_queue.put(job_result)
+        if current is not None:
+            current.value = -1
+
+        if desktop is not None:
+            pool.release(desktop)
+
+    pool.close()
+
+
+class WorkerPool :
+    """
+    Long-lived AEDT worker pool.
+
+    각 worker 프로세스는 pyDesktop 세션 하나를 유지하면서 공유 queue에서 parameter set을 받아
+    pipeline(desktop, params)을 실행하고, job이 끝나면 프로세스를 죽이지 않고 세션만 초기화한다.
+    `conda run` + AEDT 기동 비용을 sample당이 아니라 worker당 한 번만 지불한다.
+
+    pipeline은 spawn 방식으로 worker에 전달되므로 module top-level 함수여야 한다.
+    job_queue(JobQueue)를 주면 worker가 해당 queue에서 직접 claim하며, 죽은 worker의 job은 requeue된다.
+    multiprocessing queue mode에서는 worker별로 실행 중인 task를 추적해서, worker가 죽으면 새 worker를 띄우고
+    그 task를 max_task_attempts번까지 다시 넣은 뒤 그래도 안 되면 실패한 JobResult로 보고한다.
+
+    Example:
+        >>> def pipeline(desktop, params):
+        ...     project = desktop.create_project()
+        ...     design = project.create_design(name="MFT", solver="Maxwell3d")
+        ...     ...
+        ...     return results_df
+        >>> with WorkerPool(n_workers=4, pipeline=pipeline, desktop_kwargs={"non_graphical": True}) as pool:
+        ...     pool.map(param_list)
+        ...     for result in pool.results():
+        ...         print(result.job_id, result.ok)
+
+        >>> queue = JobQueue("/tmp/mft_jobs.db")
+        >>> queue.put_many(param_list)
+        >>> pool = WorkerPool(n_workers=4, pipeline=pipeline, job_queue=queue)
+        >>> pool.start()
+        >>> pool.join()
+    """
+
+    def __init__(
+            self,
+            n_workers: int = 4,
+            pipeline: Optional[Callable] = None,
+            desktop_kwargs: Optional[dict] = None,
+            max_jobs_per_worker: Optional[int] = None,
+            job_queue: Optional[JobQueue] = None,
+            poll_interval: float = 10,
+            start_method: str = "spawn",
+            max_task_attempts: int = 2
+    ) -> None:
+        if pipeline is None:
+            raise ValueError("pipeline is None")
+
+        self.n_workers = n_workers
+        self.pipeline = pipeline
+        self.desktop_kwargs = desktop_kwargs or {}
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_queue = job_queue
+        self.poll_interval = poll_interval
+        self.max_task_attempts = max_task_attempts
+
+        self._ctx = multiprocessing.get_context(start_method)
+        self.task_queue = self._ctx.Queue()
+        self.result_queue = self._ctx.Queue()
+        self.workers = []
+
+        self._next_job_id = 0
+        self.n_submitted = 0
+        self.n_done = 0
+        self.collected = [] # join() 중에 받은 JobResult
+
+        # multiprocessing queue mode의 task 추적
+        self._seq = 0
+        self._tasks = {} # seq -> (job_id, params) (아직 결과가 오지 않은 task)
+        self._seq_of = {} # job_id -> seq
+        self._attempts = {} # seq -> 죽은 worker에서 실행하다 잃어버린 횟수
+        self._ready = [] # 죽은 worker 때문에 실패 처리된 JobResult (results()가 내보냄)
+        self._closing = False
+
+
+    def __enter__(self) :
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) :
+        self.close()
+        return False
+
+
+    def start(self) -> None:
+        for worker_id in range(self.n_workers):
+            self._spawn(worker_id)
+
+
+    def _spawn(self, worker_id: int):
+        current = self._ctx.Value("q", -1, lock=False) if self.job_queue is None else None
+        worker = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.pipeline, self.task_queue, self.result_queue, self.desktop_kwargs, self.max_jobs_per_worker,
+                  self.job_queue, self.poll_interval, current),
+            name=f"aedt_worker_{worker_id}",
+            daemon=False
+        )
+        worker.worker_id = worker_id
+        worker.current = current
+        worker.start()
+        self.workers.append(worker)
+        return worker
+
+
+    def submit(self, params, job_id=None):
+        """
+        Puts one parameter set on the shared queue.
+
+        Returns:
+            The job id (auto-incremented if not given).
+        """
+        if job_id is None:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+        seq = self._seq
+        self._seq += 1
+        self._tasks[seq] = (job_id, params)
+        self._seq_of[job_id] = seq
+        self.task_queue.put((seq, job_id, params))
+        self.n_submitted += 1
+        return job_id
+
+
+    def map(self, param_list) -> list:
+        return [self.submit(params) for params in param_list]
+
+
+    def _handle(self, result: JobResult) -> Optional[JobResult]:
+        """Drops a finished task from the bookkeeping; returns None for a duplicate result of a requeued task."""
+        if self.job_queue is not None:
+            return result
+        seq = self._seq_of.pop(result.job_id, None)
+        if seq is None:
+            return None
+        self._tasks.pop(seq, None)
+        self._attempts.pop(seq, None)
+        return result
+
+
+    def _check_workers(self) -> None:
+        """
+        Liveness check (multiprocessing queue mode): a worker that exited while running a task is replaced,
+        and its task is put back on the queue or, after max_task_attempts, reported as failed.
+        """
+        for worker in list(self.workers):
+            if worker.exitcode is None:
+                continue
+            worker.join()
+            self.workers.remove(worker)
+
+            seq = worker.current.value if worker.current is not None else -1
+            if seq in self._tasks:
+                job_id, params = self._tasks[seq]
+                self._attempts[seq] = self._attempts.get(seq, 0) + 1
+                error = f"worker {worker.worker_id} (pid {worker.pid}) exited with code {worker.exitcode}"
+                if self._attempts[seq] < self.max_task_attempts:
+                    print(f"Warning: {error} while running job {job_id}, requeueing")
+                    self.task_queue.put((seq, job_id, params))
+                else:
+                    print(f"Warning: {error} while running job {job_id}, giving up after {self._attempts[seq]} attempts")
+                    self._ready.append(self._handle(JobResult(job_id, worker.worker_id, False, None, error, None)))
+
+            if not self._closing and self._tasks:
+                self._spawn(worker.worker_id)
+
+
+    def results(self, timeout: Optional[float] = None, poll_interval: float = 1.0):
+        """
+        Yields JobResult objects until every submitted job has reported back.
+
+        worker가 task를 실행하다 죽으면 poll_interval마다 하는 liveness check에서 찾아내므로 무한히 기다리지 않는다.
+
+        Raises:
+            queue.Empty: If no result arrives within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.n_done < self.n_submitted:
+            if self._ready:
+                self.n_done += 1
+                deadline = None if timeout is None else time.time() + timeout
+                yield self._ready.pop(0)
+                continue
+
+            wait = poll_interval if deadline is None else min(poll_interval, deadline - time.time())
+            try:
+                message = self.result_queue.get(timeout=max(wait, 0.0))
+            except Empty:
+                self._check_workers()
+                if deadline is not None and time.time() >= deadline and not self._ready:
+                    raise
+                continue
+
+            result = self._handle(message)
+            if result is None:
+                continue
+            self.n_done += 1
+            deadline = None if timeout is None else time.time() + timeout
+            yield result
+
+
+    def join(self, poll_interval: float = 5) -> None:
+        """
+        Waits until every worker has exited (JobQueue mode: workers exit once the queue is drained).
+        Jobs claimed by a worker that died are requeued so that the remaining workers pick them up.
+        """
+        while self.workers:
+            for worker in list(self.workers):
+                if worker.is_alive():
+                    continue
+                worker.join()
+                if worker.exitcode != 0 and self.job_queue is not None:
+                    self.job_queue.requeue_worker(f"{socket.gethostname()}:{worker.pid}")
+                self.workers.remove(worker)
+            self._drain()
+            time.sleep(poll_interval)
+
+
+    def _drain(self) -> None:
+        # result_queue가 가득 차면 worker가 종료하지 못하므로 계속 비워준다
+        while True:
+            try:
+                message = self.result_queue.get_nowait()
+            except Empty:
+                return
+            result = self._handle(message)
+            if result is not None:
+                self.collected.append(result)
+
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the workers and waits for them to exit.
+
+        multiprocessing queue mode에서는 worker마다 stop sentinel을 보낸다.
+        JobQueue mode의 worker는 task_queue를 읽지 않으므로 queue가 빌 때까지 기다린다.
+        timeout이 지나도 남은 worker는 terminate하고, JobQueue mode에서는 그 worker의 job을 requeue한다.
+        """
+        self._closing = True
+        if self.job_queue is None:
+            for _ in self.workers:
+                self.task_queue.put(_STOP)
+
+        deadline = None if timeout is None else time.time() + timeout
+        while any(worker.is_alive() for worker in self.workers):
+            if deadline is not None and time.time() >= deadline:
+                break
+            self._drain()
+            for worker in self.workers:
+                worker.join(0.5)
+        self._drain()
+
+        for worker in self.workers:
+            if worker.is_alive():
+                print(f"Warning: worker {worker.worker_id} (pid {worker.pid}) did not stop within {timeout} s, terminating")
+                worker.terminate()
+                worker.join()
+            if worker.exitcode != 0 and self.job_queue is not None:
+                self.job_queue.requeue_worker(f"{socket.gethostname()}:{worker.pid}")
+        self.workers = []
+
+
+    @property
+    def alive(self) -> int:
+        return sum(1 for worker in self.workers if worker.is_alive())
@@ -1,6 +1,6 @@
 import math
-import re
 from collections import namedtuple
+from pyaedt_module.core import units
 
 class PCB_winding:
 
@@ -13,22 +13,17 @@ class PCB_winding:
 
     def _convert_unit(self, value, target_unit="mm"):
         """
-        주어진 값을 다른 단위로 변환합니다.
+        주어진 값을 다른 단위로 변환합니다. (core.units 공용 parser 사용)
         
         Parameters:
-            value (str): 변환할 값 (예: "10mm", "1cm")
-            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um")
+            value (str): 변환할 값 (예: "10mm", "1cm"). 단위가 없으면 mm로 간주
+            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um", "mil", ...)
             
         Returns:
             float: 변환된 값
         """
-        unit_map = {
-            "mm": 1,
-            "cm": 10,
-            "m": 1000,
-            "um": 0.001
-        }
-
+        return units.convert(value, target_unit, default_unit="mm")
+    
 
     def create_polyline(self, name="winding", points=None, **kwargs):
         """
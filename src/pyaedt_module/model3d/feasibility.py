@@ -0,0 +1,115 @@
+"""
+Vectorized pre-solve geometry checks on axis-aligned boxes.
+
+모델을 AEDT에 만들기 전에 sample batch 전체에 대해 box 간섭/포함 관계를 numpy로 한 번에 검사한다.
+box는 Box(lo, hi) (각각 (B, 3) array), winding은 winding_geometry.WindingBounds(바깥 box + 가운데 구멍)로 표현한다.
+NaN이 들어간 box(예: N=0인 winding)는 모든 검사에서 실패로 처리된다.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+Box = namedtuple("Box", ["lo", "hi"])
+
+# 치수식 계산의 부동소수점 오차로 딱 맞닿는 경계(clearance와 같은 간격)가 실패하지 않도록 허용하는 오차 (mm)
+TOLERANCE = 1e-9
+
+
+def box(center=None, half=None, lo=None, hi=None) -> Box:
+    """Builds a batch Box from (center, half size) or (lo, hi); 각 값은 (B, 3) array 또는 축별 array 3개."""
+    if lo is None:
+        center = np.stack(np.broadcast_arrays(*center), axis=-1).astype(np.float64)
+        half = np.stack(np.broadcast_arrays(*half), axis=-1).astype(np.float64)
+        return Box(center - half, center + half)
+    lo = np.stack(np.broadcast_arrays(*lo), axis=-1).astype(np.float64)
+    hi = np.stack(np.broadcast_arrays(*hi), axis=-1).astype(np.float64)
+    return Box(lo, hi)
+
+
+def overlaps(a, b, clearance=0.0, axes=slice(None)):
+    """True where boxes `a` and `b` come closer than `clearance` on every axis in `axes` (NaN -> True)."""
+    separated = ((a.hi[..., axes] + clearance <= b.lo[..., axes] + TOLERANCE)
+                 | (b.hi[..., axes] + clearance <= a.lo[..., axes] + TOLERANCE))
+    return ~separated.any(axis=-1)
+
+
+def inside(inner, outer, clearance=0.0, axes=slice(None)):
+    """True where `inner` lies inside `outer` with at least `clearance` margin on every axis in `axes` (NaN -> False)."""
+    return ((inner.lo[..., axes] >= outer.lo[..., axes] + clearance - TOLERANCE)
+            & (inner.hi[..., axes] <= outer.hi[..., axes] - clearance + TOLERANCE)).all(axis=-1)
+
+
+def through_hole(obj, winding, clearance=0.0):
+    """True where `obj` passes through the winding's hole in xy (a core leg or an inner winding/mold)."""
+    return inside(Box(obj.lo[..., :2], obj.hi[..., :2]), Box(winding.hole_lo, winding.hole_hi), clearance)
+
+
+def winding_clear(winding, obj, clearance=0.0):
+    """
+    True where a winding does not touch `obj`: z 방향으로 떨어져 있거나, obj가 구멍을 통과하거나, 바깥 box끼리 떨어져 있다.
+    `obj`는 Box 또는 다른 winding(WindingBounds)이며, 다른 winding이면 서로 상대 구멍 안에 들어가는 경우도 허용한다.
+    """
+    clear = ~overlaps(winding, obj, clearance, axes=slice(2, 3)) | through_hole(obj, winding, clearance)
+    clear |= ~overlaps(winding, obj, clearance)
+    if hasattr(obj, "hole_lo"):
+        clear |= through_hole(winding, obj, clearance)
+    return clear & ~np.isnan(winding.lo).any(axis=-1)
+
+
+class FeasibilityChecker :
+    """
+    Collects named boolean checks over a batch of samples.
+
+    Example:
+        >>> checker = FeasibilityChecker(clearance=1.0)
+        >>> checker.require("winding1_in_window", feasibility.inside(winding1, window, checker.clearance))
+        >>> checker.forbid("winding_cold_plate", feasibility.overlaps(winding1, cold_plate, checker.clearance))
+        >>> samples = samples[checker.feasible]
+        >>> checker.summary()   # {"winding1_in_window": 12, ...} (실패한 sample 수)
+    """
+
+    def __init__(self, clearance: float = 0.0) -> None:
+        self.clearance = clearance
+        self.checks = {}
+
+
+    def require(self, name: str, ok) -> None:
+        """Registers a check; `ok` is a bool array (True = feasible), and-ed with an existing check of the same name."""
+        ok = np.asarray(ok, dtype=bool)
+        self.checks[name] = ok & self.checks[name] if name in self.checks else ok
+
+
+    def forbid(self, name: str, violated) -> None:
+        """Registers a check from a violation mask (True = infeasible)."""
+        self.require(name, ~np.asarray(violated, dtype=bool))
+
+
+    @property
+    def feasible(self):
+        """Bool array, True where every check passes."""
+        if not self.checks:
+            return np.ones(0, dtype=bool)
+        return np.logical_and.reduce(np.broadcast_arrays(*self.checks.values()))
+
+
+    def reasons(self, index: int = 0) -> list:
+        """Names of the checks sample `index` fails."""
+        shape = self.feasible.shape
+        return [name for name, ok in self.checks.items() if not np.broadcast_to(ok, shape)[index]]
+
+
+    def summary(self) -> dict:
+        """Number of failing samples per check."""
+        shape = self.feasible.shape
+        return {name: int((~np.broadcast_to(ok, shape)).sum()) for name, ok in self.checks.items()}
+
+
+    def __len__(self) :
+        return len(self.feasible)
+
+
+    def __repr__(self) :
+        feasible = self.feasible
+        return f"FeasibilityChecker(samples={len(feasible)}, feasible={int(feasible.sum())}, checks={len(self.checks)})"
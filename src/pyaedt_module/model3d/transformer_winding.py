@@ -1,7 +1,8 @@
 import math
-import re
 from collections import namedtuple
 import time
+from pyaedt_module.core import units
+from . import winding_geometry
 
 class Transformer_winding:
 
@@ -14,21 +15,21 @@ class Transformer_winding:
 
     def _convert_unit(self, value, target_unit="mm"):
         """
-        주어진 값을 다른 단위로 변환합니다.
+        주어진 값을 다른 단위로 변환합니다. (core.units 공용 parser 사용)
         
         Parameters:
-            value (str): 변환할 값 (예: "10mm", "1cm")
-            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um")
+            value (str): 변환할 값 (예: "10mm", "1cm"). 단위가 없으면 mm로 간주
+            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um", "mil", ...)
             
         Returns:
             float: 변환된 값
         """
-        unit_map = {
-            "mm": 1,
-            "cm": 10,
-            "m": 1000,
-            "um": 0.001
-        }
+        return units.convert(value, target_unit, default_unit="mm")
+    
+
+    def _evaluate(self, expression, unit="mm"):
+        """design 변수로 수식을 평가합니다 (numeric mode, pyDesign.evaluate)."""
+        return self.design.evaluate(expression, unit)
 
 
     def create_polyline(self, name="winding", points=None, **kwargs):
@@ -69,6 +70,8 @@ class Transformer_winding:
         
         if points is None :
             raise ValueError("points is None")
+        if hasattr(points, "tolist") : # numeric mode (M, 3) array
+            points = points.tolist()
 
         polyline_obj = self.design.modeler.create_polyline(
             points=points, name=name, xsection_orient=orientation,
@@ -114,6 +117,9 @@ class Transformer_winding:
         winding_point = modeler.winding_points(**kwargs)
         winding = modeler.create_polyline(name=name, points=winding_point,**kwargs)
 
+        numeric=True면 수식 문자열 대신 design 변수로 평가한 (M, 3) float array(mm)를 반환 (point 배치는 동일)
+        points = modeler.winding_points(numeric=True, **kwargs)
+
         """
 
         raw_N = kwargs.get("N", 10)
@@ -150,116 +156,25 @@ class Transformer_winding:
 
         # offset을 x, y, z 각 축에 대한 리스트로 처리합니다.
         offset = kwargs.get("offset", ["0mm", "0mm", "0mm"])
-        offset_x, offset_y, offset_z = offset[0], offset[1], offset[2]
 
+        numeric = kwargs.get("numeric", False)
 
-        points = []
-
-        
+        # 좌표 배치(turn index 배열)는 symbolic/numeric mode가 공유한다
         if clock_wise :
-            # --- 레이어 1 좌표 변수 ---
-            pos_x1 = f"({x})/2 + ({coil_diameter})/2"
-            neg_x1 = f"-({x})/2 - ({coil_diameter})/2"
-            pos_y1 = f"({y})/2 + ({coil_diameter})/2"
-            neg_y1 = f"-({y})/2 - ({coil_diameter})/2"
-
-            if N_layer == 1 :
-                for i in range(N) :
-                    z_base = f"-({i})*(({coil_diameter}) + ({coil_zgap}))"
-                    z_start = f"{z_base} + ({offset_z})"
-                    z_end = f"-({i+1})*(({coil_diameter}) + ({coil_zgap})) + ({offset_z})"
-
-                    # 각 좌표에 오프셋 적용
-                    px1_off = f"{pos_x1} + ({offset_x})"
-                    nx1_off = f"{neg_x1} + ({offset_x})"
-                    py1_off = f"{pos_y1} + ({offset_y})"
-                    ny1_off = f"{neg_y1} + ({offset_y})"
-
-                    if terminal and i == 0 :
-                        if terminal_position is not None :
-                            points.append([f"{terminal_position}", ny1_off, z_start])
-                        else :
-                            points.append([f"{px1_off} + {terminal_length}", ny1_off, z_start])
-                    
-                    points.append([px1_off, ny1_off, z_start])
-                    points.append([nx1_off, ny1_off, z_start])
-                    points.append([nx1_off, py1_off, z_start])
-                    points.append([px1_off, py1_off, z_end])
-
-                    if terminal and i == N-1 :
-                        if terminal_position is not None :
-                            points.append([f"{terminal_position}", py1_off, z_end])
-                        else :
-                            points.append([f"{px1_off} + {terminal_length}", py1_off, z_end])
-                            
-            if N_layer == 2 :
-                # --- 레이어 2 좌표 변수 ---
-                x2 = f"({x})/2 + ({coil_diameter}) + ({coil_layer_x_gap})"
-                y2 = f"({y})/2 + ({coil_diameter}) + ({coil_layer_y_gap})"
-                pos_x2 = f"({x2}) + ({coil_diameter})/2"
-                neg_x2 = f"-({x2}) - ({coil_diameter})/2"
-                pos_y2 = f"({y2}) + ({coil_diameter})/2"
-                neg_y2 = f"-({y2}) - ({coil_diameter})/2"
-
-                n1 = math.ceil(N / 2) # 첫 번째 레이어의 턴 수
-
-                for i in range(N):
-                    # --- Z 좌표 계산 ---
-                    if i < n1: # 레이어 1 (내려가는 중)
-                        z_index_start = i
-                        z_index_end = i + 1
-                    else: # 레이어 2 (올라오는 중)
-                        z_index_start = n1 - (i - n1)
-                        z_index_end = z_index_start - 1
-                    
-                    z_base_start = f"-({z_index_start})*(({coil_diameter}) + ({coil_zgap}))"
-                    z_base_end = f"-({z_index_end})*(({coil_diameter}) + ({coil_zgap}))"
-                    z_start = f"{z_base_start} + ({offset_z})"
-                    z_end = f"{z_base_end} + ({offset_z})"
-
-                    # 각 좌표에 오프셋 적용
-                    px1_off = f"{pos_x1} + ({offset_x})"
-                    nx1_off = f"{neg_x1} + ({offset_x})"
-                    py1_off = f"{pos_y1} + ({offset_y})"
-                    ny1_off = f"{neg_y1} + ({offset_y})"
-                    px2_off = f"{pos_x2} + ({offset_x})"
-                    nx2_off = f"{neg_x2} + ({offset_x})"
-                    py2_off = f"{pos_y2} + ({offset_y})"
-                    ny2_off = f"{neg_y2} + ({offset_y})"
-
-
-                    # --- X, Y 좌표 및 포인트 추가 ---
-                    if i < n1: # 레이어 1
-                        if terminal and i == 0:
-                            if terminal_position is not None :
-                                points.append([f"{terminal_position}", ny1_off, z_start])
-                            else :
-                                points.append([f"{px1_off} + {terminal_length}", ny1_off, z_start])
-                        points.append([px1_off, ny1_off, z_start])
-                        points.append([nx1_off, ny1_off, z_start])
-                        points.append([nx1_off, py1_off, z_start])
-                        points.append([px1_off, py1_off, z_end])
-                    elif i == n1: # 레이어 2의 시작 (전이 구간)
-                        # 요청하신대로, 올라오는 구간의 첫 포인트는 pos_x1, neg_y2를 사용합니다.
-                        points.append([px1_off, ny2_off, z_start]) # 전이 포인트
-                        points.append([nx2_off, ny2_off, z_start])
-                        points.append([nx2_off, py2_off, z_start])
-                        points.append([px2_off, py2_off, z_end])
-                    else: # 레이어 2의 나머지
-                        points.append([px2_off, ny2_off, z_start])
-                        points.append([nx2_off, ny2_off, z_start])
-                        points.append([nx2_off, py2_off, z_start])
-                        points.append([px2_off, py2_off, z_end])
-
-                        if terminal and i == N-1 :
-                            if terminal_position is not None :
-                                points.append([f"{terminal_position}", py2_off, z_end])
-                            else :
-                                points.append([f"{px2_off} + {terminal_length}", py2_off, z_end])
-
-                        
-
-        return points
+            layout = winding_geometry.transformer_winding_layout(N, N_layer, bool(terminal))
+        else :
+            layout = winding_geometry.transformer_winding_layout(0)
+
+        if not numeric :
+            return winding_geometry.transformer_winding_expressions(
+                layout, x, y, coil_diameter, coil_zgap, coil_layer_x_gap, coil_layer_y_gap, offset, terminal_position)
+
+        # numeric mode: 수식은 design 변수로 평가해서 mm 단위 float로 바꾼 뒤 (M, 3) array를 한 번에 계산
+        resolve = lambda value: winding_geometry.resolve(value, "mm", self._evaluate)
+        return winding_geometry.transformer_winding_array(
+            layout, resolve(x), resolve(y), resolve(coil_diameter), resolve(coil_zgap),
+            resolve(coil_layer_x_gap), resolve(coil_layer_y_gap), [resolve(value) for value in offset],
+            resolve(terminal_position) if terminal else math.nan)
 
 
     def foil_winding(self, name, **kwargs) :
@@ -1,6 +1,7 @@
 import math
-import re
 from collections import namedtuple
+from pyaedt_module.core import units
+from . import winding_geometry
 
 class Winding:
 
@@ -13,41 +14,22 @@ class Winding:
 
     def _convert_unit(self, value, target_unit="mm"):
         """
-        주어진 값을 다른 단위로 변환합니다.
+        주어진 값을 다른 단위로 변환합니다. (core.units 공용 parser 사용)
         
         Parameters:
-            value (str): 변환할 값 (예: "10mm", "1cm")
-            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um")
+            value (str): 변환할 값 (예: "10mm", "1cm"). 단위가 없으면 mm로 간주
+            target_unit (str): 변환할 단위 ("mm", "cm", "m", "um", "mil", ...)
             
         Returns:
             float: 변환된 값
         """
-        unit_map = {
-            "mm": 1,
-            "cm": 10,
-            "m": 1000,
-            "um": 0.001
-        }
-
-        match = re.match(r"([-+]?\d*\.?\d+)([a-zA-Z]*)", str(value))
-        
-        if not match:
-            raise ValueError(f"Invalid value format: {value}")
-
-        num, unit = match.groups()
-        num = float(num)
-
-        if unit == "":
-            unit = "mm"
+        return units.convert(value, target_unit, default_unit="mm")
+    
 
-        if unit not in unit_map or target_unit not in unit_map:
-            raise ValueError(f"Unsupported unit: {unit} or {target_unit}")
-        
-        value_in_mm = num * unit_map[unit]
-        converted_value = value_in_mm / unit_map[target_unit]
+    def _evaluate(self, expression, unit="mm"):
+        """design 변수로 수식을 평가합니다 (numeric mode, pyDesign.evaluate)."""
+        return self.design.evaluate(expression, unit)
 
-        return converted_value
-    
 
     def create_polyline(self, name="winding", points=None, width=None, height=None, **kwargs):
         """
@@ -125,6 +107,7 @@ class Winding:
                 theta1 (str): 코일의 각도 1
                 theta2 (str): 코일의 각도 2
                 turns_sub (int) : 빼낼 턴 수 (default: 0)
+                numeric (bool): True면 수식 문자열 대신 (M, 3) float array(mm)와 float 파라미터를 반환
 
         Returns:
             namedtuple: 코일의 점들과 관련 파라미터들
@@ -152,6 +135,28 @@ class Winding:
 
         turns_sub = kwargs.get("turns_sub", 0)
 
+        WindingResult = namedtuple("WindingResult", ["points", 
+                                                     "outer_x", "outer_xx", "outer_y", "outer_yy", "fillet", "inner",
+                                                     "width", "gap", "wg", "theta1", "theta2"])
+
+        if kwargs.get("numeric", False) :
+            length = lambda value: winding_geometry.resolve(value, "mm", self._evaluate)
+            scalar = lambda value: winding_geometry.resolve(value, None, self._evaluate)
+
+            outer_x, outer_y, fillet, inner = length(outer_x), length(outer_y), length(fillet), length(inner)
+            fill_factor, theta1, theta2 = scalar(fill_factor), scalar(theta1), scalar(theta2)
+            outer_xx = outer_x - fillet
+            outer_yy = outer_y - fillet
+            width = inner * fill_factor / (N - 1)
+            gap = (1 - fill_factor) / fill_factor * width
+            wg = width + gap
+
+            points = winding_geometry.spiral_array(N, outer_x, outer_y, outer_xx, outer_yy, wg, theta1, theta2,
+                                                   x_shift=(-1, 0, 0, 0), start=turns_sub, end_point=turns_sub < N)
+            return WindingResult(points=points, 
+                                 outer_x=outer_x, outer_xx=outer_xx, outer_y=outer_y, outer_yy=outer_yy, fillet=fillet, inner=inner,
+                                 width=width, gap=gap, wg=wg, theta1=theta1, theta2=theta2)
+
 
         points = []
 
@@ -172,11 +177,6 @@ class Winding:
 
                 points.append([f"0", f"-({outer_y}) + ({i})*({wg})", 0])
 
-
-        WindingResult = namedtuple("WindingResult", ["points", 
-                                                     "outer_x", "outer_xx", "outer_y", "outer_yy", "fillet", "inner",
-                                                     "width", "gap", "wg", "theta1", "theta2"])
-
         return WindingResult(points=points, 
                              outer_x=outer_x, outer_xx=outer_xx, outer_y=outer_y, outer_yy=outer_yy, fillet=fillet, inner=inner,
                              width=width, gap=gap, wg=wg, theta1=theta1, theta2=theta2)
@@ -195,6 +195,7 @@ class Winding:
                 turns (int): 와인딩의 턴 수
                 inner (str): 와인딩의 내부 크기
                 fill_factor (float): 와인딩의 채움 계수
+                numeric (bool): True면 수식 대신 design 변수로 평가한 float 좌표(mm)로 생성
                 
         Returns:
             object: 생성된 와인딩 객체
@@ -221,6 +222,22 @@ class Winding:
         theta1 = f"atan(({outer_yy})/(({outer_x})-({c})))"
         theta2 = f"atan(({outer_y})/(({outer_xx})-({c})))"
 
+        if kwargs.get("numeric", False) :
+            length = lambda value: winding_geometry.resolve(value, "mm", self._evaluate)
+
+            outer_x, outer_y, outer_xx, outer_yy, inner = length(outer_x), length(outer_y), length(outer_xx), length(outer_yy), length(inner)
+            fill_factor = winding_geometry.resolve(fill_factor, None, self._evaluate)
+            width = inner * fill_factor / (N - 1)
+            wg = width + (1 - fill_factor) / fill_factor * width
+            c = math.sqrt(outer_xx**2 + outer_yy**2) / 4
+            theta1 = math.atan(outer_yy / (outer_x - c))
+            theta2 = math.atan(outer_y / (outer_xx - c))
+
+            points = winding_geometry.spiral_array(N, outer_x, outer_y, outer_xx, outer_yy, wg, theta1, theta2,
+                                                   x_shift=(1, 1, 1, 1), end_point=False)
+            self.design.modeler.create_polyline(points=points.tolist())
+            return
+
         points = []
 
         for i in range(N) :
@@ -0,0 +1,271 @@
+"""
+Winding point engine shared by Transformer_winding and Winding.
+
+좌표 배치(어느 turn의 어느 꼭짓점이 어떤 x/y 값과 몇 번째 z 단을 쓰는지)를 turn index 배열로 한 번에 만들고,
+symbolic mode(AEDT 수식 문자열)와 numeric mode((M, 3) float array, mm)가 같은 배치를 공유한다.
+그래서 두 mode의 point 순서/개수가 항상 같고, numeric 값은 symbolic 수식을 평가한 값과 일치한다.
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, Optional
+
+import numpy as np
+
+from pyaedt_module.core import units
+
+
+# Swept bounds of a rectangular winding: 바깥 box와 가운데 구멍(xy)
+WindingBounds = namedtuple("WindingBounds", ["lo", "hi", "hole_lo", "hole_hi"])
+
+# Transformer_winding x/y 값 index
+PX1, NX1, PX2, NX2, TERMINAL = range(5)
+PY1, NY1, PY2, NY2 = range(4)
+
+# turn 하나 = 꼭짓점 4개 (마지막 꼭짓점에서 다음 z 단으로 내려감/올라옴)
+_LAYER1_X = np.array([PX1, NX1, NX1, PX1])
+_LAYER1_Y = np.array([NY1, NY1, PY1, PY1])
+_LAYER2_X = np.array([PX2, NX2, NX2, PX2])
+_LAYER2_Y = np.array([NY2, NY2, PY2, PY2])
+
+
+def resolve(value, unit: Optional[str] = "mm", evaluate: Optional[Callable] = None) -> float:
+    """
+    Resolves one geometry input to a float.
+
+    Args:
+        value: Number (already in `unit`), value string ("3mm") or design expression ("w1 + 2*N1_space_w").
+        unit: Result unit. 길이는 "mm"(단위 없는 값도 mm로 간주), None이면 무차원/각도(rad) 값.
+        evaluate: Callable(expression, unit) for expressions, e.g. pyDesign.evaluate.
+
+    Raises:
+        ValueError: If `value` is an expression and no `evaluate` is given.
+    """
+    if not isinstance(value, str):
+        return float(value)
+    try:
+        return units.convert(value, unit, default_unit=unit or "")
+    except ValueError:
+        if evaluate is None:
+            raise ValueError(f"Cannot resolve '{value}' without a design (pass resolved floats)") from None
+        return float(evaluate(value, unit))
+
+
+def _freeze(*arrays) -> tuple:
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=256)
+def transformer_winding_layout(N: int, N_layer: int = 1, terminal: bool = False) -> tuple:
+    """
+    Point layout of Transformer_winding.winding_points as turn-index arrays.
+
+    Returns:
+        tuple: (x_index, y_index, z_index) int arrays of length M.
+            x_index는 [px1, nx1, px2, nx2, terminal], y_index는 [py1, ny1, py2, ny2] 중 하나를 가리키고,
+            z_index k는 z = -k*(coil_diameter + coil_zgap) + offset_z 단이다.
+            N_layer가 1, 2가 아니면 빈 배열.
+    """
+    if N <= 0 or N_layer not in (1, 2):
+        empty = np.zeros(0, dtype=np.int64)
+        return _freeze(empty, empty.copy(), empty.copy())
+
+    n1 = N if N_layer == 1 else math.ceil(N / 2) # 첫 번째 레이어의 턴 수
+    turns = np.arange(N)
+    lower = turns < n1
+
+    # 레이어 1은 내려가고(z 단 i -> i+1), 레이어 2는 n1 단에서 다시 올라온다
+    z_start = np.where(lower, turns, 2 * n1 - turns)
+    z_end = np.where(lower, z_start + 1, z_start - 1)
+
+    x_index = np.where(lower[:, None], _LAYER1_X, _LAYER2_X)
+    y_index = np.where(lower[:, None], _LAYER1_Y, _LAYER2_Y)
+    if n1 < N:
+        x_index[n1, 0] = PX1 # 레이어 전이 포인트 (pos_x1, neg_y2)
+    z_index = np.column_stack([z_start, z_start, z_start, z_end])
+
+    x_index, y_index, z_index = x_index.ravel(), y_index.ravel(), z_index.ravel()
+
+    if terminal:
+        x_index = np.concatenate([[TERMINAL], x_index])
+        y_index = np.concatenate([[NY1], y_index])
+        z_index = np.concatenate([[0], z_index])
+        # 끝 terminal은 마지막 turn이 레이어 1이거나 (N_layer=1), 전이 turn 이후의 레이어 2일 때만 붙는다
+        if N_layer == 1 or N - 1 > n1:
+            x_index = np.concatenate([x_index, [TERMINAL]])
+            y_index = np.concatenate([y_index, [PY1 if N_layer == 1 else PY2]])
+            z_index = np.concatenate([z_index, z_end[-1:]])
+
+    return _freeze(x_index, y_index, z_index)
+
+
+def transformer_winding_expressions(layout: tuple, x, y, coil_diameter, coil_zgap, coil_layer_x_gap, coil_layer_y_gap,
+                                    offset, terminal_position=None) -> list:
+    """Symbolic mode: layout -> [[x, y, z], ...] AEDT expression strings."""
+    x_index, y_index, z_index = layout
+    offset_x, offset_y, offset_z = offset[0], offset[1], offset[2]
+
+    x2 = f"({x})/2 + ({coil_diameter}) + ({coil_layer_x_gap})"
+    y2 = f"({y})/2 + ({coil_diameter}) + ({coil_layer_y_gap})"
+
+    xs = [
+        f"({x})/2 + ({coil_diameter})/2 + ({offset_x})",
+        f"-({x})/2 - ({coil_diameter})/2 + ({offset_x})",
+        f"({x2}) + ({coil_diameter})/2 + ({offset_x})",
+        f"-({x2}) - ({coil_diameter})/2 + ({offset_x})",
+        f"{terminal_position}",
+    ]
+    ys = [
+        f"({y})/2 + ({coil_diameter})/2 + ({offset_y})",
+        f"-({y})/2 - ({coil_diameter})/2 + ({offset_y})",
+        f"({y2}) + ({coil_diameter})/2 + ({offset_y})",
+        f"-({y2}) - ({coil_diameter})/2 + ({offset_y})",
+    ]
+    zs = {k: f"-({k})*(({coil_diameter}) + ({coil_zgap})) + ({offset_z})" for k in set(z_index.tolist())}
+
+    return [[xs[i], ys[j], zs[k]] for i, j, k in zip(x_index.tolist(), y_index.tolist(), z_index.tolist())]
+
+
+def _transformer_winding_values(x, y, coil_diameter, coil_layer_x_gap, coil_layer_y_gap, offset, terminal_position=math.nan) -> tuple:
+    """x/y value tables of the layout (scalars -> (5,), (4,) / batch arrays -> (B, 5), (B, 4))."""
+    offset_x, offset_y = offset[0], offset[1]
+
+    x2 = x / 2 + coil_diameter + coil_layer_x_gap
+    y2 = y / 2 + coil_diameter + coil_layer_y_gap
+
+    xs = np.stack(np.broadcast_arrays(
+        x / 2 + coil_diameter / 2 + offset_x,
+        -x / 2 - coil_diameter / 2 + offset_x,
+        x2 + coil_diameter / 2 + offset_x,
+        -x2 - coil_diameter / 2 + offset_x,
+        terminal_position,
+    ), axis=-1).astype(np.float64)
+    ys = np.stack(np.broadcast_arrays(
+        y / 2 + coil_diameter / 2 + offset_y,
+        -y / 2 - coil_diameter / 2 + offset_y,
+        y2 + coil_diameter / 2 + offset_y,
+        -y2 - coil_diameter / 2 + offset_y,
+    ), axis=-1).astype(np.float64)
+    return xs, ys
+
+
+def transformer_winding_array(layout: tuple, x: float, y: float, coil_diameter: float, coil_zgap: float,
+                              coil_layer_x_gap: float, coil_layer_y_gap: float, offset, terminal_position: float = math.nan):
+    """Numeric mode: layout + resolved floats -> (M, 3) float array (same formulas as the symbolic mode)."""
+    x_index, y_index, z_index = layout
+    xs, ys = _transformer_winding_values(x, y, coil_diameter, coil_layer_x_gap, coil_layer_y_gap, offset, terminal_position)
+
+    points = np.empty((len(x_index), 3))
+    points[:, 0] = xs[x_index]
+    points[:, 1] = ys[y_index]
+    points[:, 2] = -z_index * (coil_diameter + coil_zgap) + offset[2]
+    return points
+
+
+@lru_cache(maxsize=256)
+def _layout_extent(N: int, N_layer: int, terminal: bool) -> tuple:
+    """(x 값 사용 mask, y 값 사용 mask, z 단 min, z 단 max) of a layout."""
+    x_index, y_index, z_index = transformer_winding_layout(N, N_layer, terminal)
+    if len(x_index) == 0:
+        return np.zeros(5, dtype=bool), np.zeros(4, dtype=bool), 0, 0
+    return np.bincount(x_index, minlength=5) > 0, np.bincount(y_index, minlength=4) > 0, int(z_index.min()), int(z_index.max())
+
+
+def transformer_winding_bounds(N, N_layer, x, y, coil_diameter, coil_zgap, coil_layer_x_gap, coil_layer_y_gap,
+                               offset, terminal_position=None) -> "WindingBounds":
+    """
+    Swept cross-section bounds of Transformer_winding.winding_points for a whole batch of samples.
+
+    centerline 좌표(winding_points와 같은 layout/수식)에 단면 반지름(coil_diameter/2)을 더해서
+    바깥 box(lo, hi)와 가운데 구멍(hole_lo, hole_hi, xy)을 구한다. layout은 (N, N_layer)가 같은 sample끼리 묶어서 한 번만 쓴다.
+
+    Args:
+        N, N_layer: int arrays (B,) or scalars.
+        x, y, coil_diameter, ...: float arrays (B,) or scalars in mm (resolved values).
+        offset: [offset_x, offset_y, offset_z], each an array (B,) or scalar.
+        terminal_position: Terminal x (array or scalar); None이면 terminal 없음.
+
+    Returns:
+        WindingBounds: lo/hi (B, 3), hole_lo/hole_hi (B, 2). N이 0이거나 layout이 비면 NaN.
+    """
+    N, N_layer = np.atleast_1d(np.asarray(N, dtype=np.int64)), np.atleast_1d(np.asarray(N_layer, dtype=np.int64))
+    batch = np.broadcast_shapes(N.shape, N_layer.shape, *(np.shape(v) for v in (x, y, coil_diameter, coil_zgap, *offset)))
+    N, N_layer = np.broadcast_to(N, batch), np.broadcast_to(N_layer, batch)
+
+    terminal = terminal_position is not None
+    xs, ys = _transformer_winding_values(x, y, coil_diameter, coil_layer_x_gap, coil_layer_y_gap, offset,
+                                         terminal_position if terminal else math.nan)
+    xs, ys = np.broadcast_to(xs, batch + (5,)), np.broadcast_to(ys, batch + (4,))
+    radius = np.broadcast_to(np.asarray(coil_diameter, dtype=np.float64) / 2, batch)
+    pitch = np.broadcast_to(np.asarray(coil_diameter + coil_zgap, dtype=np.float64), batch)
+    offset_z = np.broadcast_to(np.asarray(offset[2], dtype=np.float64), batch)
+
+    # (N, N_layer)별 layout extent를 한 번씩만 구해서 sample마다 펼친다 (N_layer 3 이상은 모두 빈 layout)
+    keys, inverse = np.unique(N * 4 + np.clip(N_layer, 0, 3), return_inverse=True)
+    extents = [_layout_extent(int(key // 4), int(key % 4), terminal) for key in keys]
+    x_used = np.array([extent[0] for extent in extents])[inverse].reshape(batch + (5,))
+    y_used = np.array([extent[1] for extent in extents])[inverse].reshape(batch + (4,))
+    k_min = np.array([extent[2] for extent in extents])[inverse].reshape(batch)
+    k_max = np.array([extent[3] for extent in extents])[inverse].reshape(batch)
+    empty = ~x_used.any(axis=-1)
+
+    def _min(values, mask):
+        return np.where(mask, values, np.inf).min(axis=-1)
+
+    def _max(values, mask):
+        return np.where(mask, values, -np.inf).max(axis=-1)
+
+    lo = np.stack([_min(xs, x_used) - radius, _min(ys, y_used) - radius, -k_max * pitch + offset_z - radius], axis=-1)
+    hi = np.stack([_max(xs, x_used) + radius, _max(ys, y_used) + radius, -k_min * pitch + offset_z + radius], axis=-1)
+
+    # 구멍: 양쪽 변 중 안쪽 centerline에서 단면 반지름만큼 안쪽 (terminal은 제외)
+    ring_x = x_used & np.array([True, True, True, True, False])
+    positive_x, positive_y = np.array([True, False, True, False, False]), np.array([True, False, True, False])
+    hole_lo = np.stack([_max(xs, ring_x & ~positive_x) + radius, _max(ys, y_used & ~positive_y) + radius], axis=-1)
+    hole_hi = np.stack([_min(xs, ring_x & positive_x) - radius, _min(ys, y_used & positive_y) - radius], axis=-1)
+
+    for bounds in (lo, hi, hole_lo, hole_hi):
+        bounds[empty] = np.nan
+
+    return WindingBounds(lo, hi, hole_lo, hole_hi)
+
+
+def spiral_array(turns: int, outer_x: float, outer_y: float, outer_xx: float, outer_yy: float, wg: float,
+                 theta1: float, theta2: float, x_shift=(-1, 0, 0, 0), start: int = 0, end_point: bool = True):
+    """
+    Numeric planar spiral of Winding.coil_points / Winding.create_winding as an (M, 3) float array.
+
+    turn i마다 꼭짓점 8개(오른쪽 4개, 왼쪽 4개)를 turn index 배열로 한 번에 계산한다.
+
+    Args:
+        x_shift: 오른쪽 꼭짓점 4개의 x에 더하는 wg 배수 (coil_points: (-1, 0, 0, 0), create_winding: (1, 1, 1, 1)).
+        start: First turn index (coil_points의 turns_sub).
+        end_point: Appends the (0, -outer_y + (N-1)*wg) lead-out point after the last turn.
+    """
+    i = np.arange(start, turns, dtype=np.float64)[:, None]
+    if i.size == 0:
+        return np.zeros((0, 3))
+
+    step = i * wg
+    diagonal = step / math.tan(theta2)
+    slope = step * math.tan(theta1)
+    shift = np.asarray(x_shift, dtype=np.float64) * wg
+
+    x = np.hstack([
+        np.hstack([outer_xx - diagonal, outer_x - step, outer_x - step, outer_xx - diagonal]) + shift,
+        -outer_xx + diagonal, -outer_x + step, -outer_x + step, -outer_xx + diagonal,
+    ])
+    y = np.hstack([
+        -outer_y + step - wg, -outer_yy + slope, outer_yy - slope, outer_y - step,
+        outer_y - step, outer_yy - slope, -outer_yy + slope, -outer_y + step,
+    ])
+
+    points = np.zeros((x.size, 3))
+    points[:, 0] = x.ravel()
+    points[:, 1] = y.ravel()
+    if end_point:
+        points = np.vstack([points, [0.0, -outer_y + (turns - 1) * wg, 0.0]])
+    return points
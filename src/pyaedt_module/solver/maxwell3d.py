@@ -4,6 +4,8 @@ import numpy as np
 import time
 import re
 import os
+from pyaedt_module.core.wait import wait_until
+from pyaedt_module.core import units
 
 
 class Maxwell3d(AEDTMaxwell3d) :
@@ -18,7 +20,8 @@ class Maxwell3d(AEDTMaxwell3d) :
     def set_power_ferrite(self, cm=3, x=1.5, y=2.5, per=1000) :
         
         power_ferrite = self.design.materials.duplicate_material("ferrite","power_ferrite")
-        time.sleep(1)
+        # 고정 sleep 대신 material이 AEDT에 등록될 때까지 polling
+        wait_until(lambda: self.design.materials.exists_material("power_ferrite"), timeout=10, name="material")
         power_ferrite.set_power_ferrite_coreloss(cm=cm, x=x, y=y)
         power_ferrite.permeability = per
 
@@ -72,9 +75,6 @@ class Maxwell3d(AEDTMaxwell3d) :
         # Invert mapping to retrieve original column names for unit parsing
         inverted_rename_mapping = {v: k for k, v in rename_mapping.items()}
         
-        # Define unit conversion factors relative to the base unit (e.g., H for inductance)
-        unit_factors = {"pH": 1e-12, "nH": 1e-9, "uH": 1e-6, "mH": 1e-3, "H": 1.0}
-
         for new_col_name, target_unit in unit_mapping.items():
             if new_col_name not in output_df.columns:
                 continue
@@ -83,23 +83,28 @@ class Maxwell3d(AEDTMaxwell3d) :
             
             # Extract source unit from the original column name (e.g., 'uH' from 'L(V1,V1) [uH]')
             match = re.search(r'\[(.*?)\]', original_col_name)
-            source_unit = match.group(1) if match else "" # Defaults to unitless if no [] found
-
-            # Get conversion factors for source and target units
-            source_factor = unit_factors.get(source_unit, 1.0)
-            target_factor = unit_factors.get(target_unit, 1.0)
-
-            # Calculate the multiplier to convert from source to target unit
-            # Example: from mH (1e-3) to uH (1e-6) -> multiplier is 1e-3 / 1e-6 = 1000
-            if target_unit == "" or target_unit is None : # Handle unitless parameters like 'k'
-                conversion_multiplier = 1.0
-            elif target_factor != 0:
-                conversion_multiplier = source_factor / target_factor
-            else:
-                conversion_multiplier = 1.0
-            
-            # Apply the conversion to the column
-            output_df[new_col_name] = pd.to_numeric(output_df[new_col_name], errors='coerce').abs() * conversion_multiplier
+            source_unit = match.group(1) if match else ""
+
+            # No [] in the column name: the value is in the SI base unit of the target (e.g. H for 'uH')
+            if target_unit and not source_unit:
+                try:
+                    source_unit = units.si_unit(target_unit)
+                except ValueError:
+                    pass
+
+            values = pd.to_numeric(output_df[new_col_name], errors='coerce').abs()
+
+            # Convert the whole column at once (core.units)
+            # unitless parameters like 'k', or units that cannot be converted, are kept as they are
+            if target_unit and source_unit:
+                try:
+                    units.conversion(source_unit, target_unit)
+                except ValueError:
+                    pass
+                else:
+                    values = units.convert_array(values, target_unit, default_unit=source_unit)
+
+            output_df[new_col_name] = values
 
         output_df.dropna(inplace=True)
 
@@ -0,0 +1,79 @@
+"""
+pyDesign regression checks that run without AEDT (the design object is built around a fake odesign).
+
+    python -m pytest tests
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("ansys.aedt.core")
+
+from pyaedt_module.core.pydesign import pyDesign, VariableWrapper
+
+
+class _FakeODesign:
+    def __init__(self, variables):
+        self.variables = dict(variables)
+        self.changes = []
+
+    def GetVariables(self):
+        return list(self.variables)
+
+    def GetNominalVariation(self):
+        return " ".join(f"{name}='{value}'" for name, value in self.variables.items())
+
+    def GetVariableValue(self, name):
+        return self.variables[name]
+
+    def ChangeProperty(self, args):
+        self.changes.append(args)
+
+
+def _design(variables):
+    design = pyDesign.__new__(pyDesign)
+    design._store = {}
+    design._attr_cache = {}
+    design._variables = None
+    design._variable_array = None
+    design._dirty_variables = set()
+    design._evaluator = None
+    design.solver_instance = SimpleNamespace(odesign=_FakeODesign(variables), design_type="Maxwell 3D",
+                                             variable_manager=None)
+    return design
+
+
+def test_set_variables_units_dry_run():
+    # units 인자가 core.units module을 가리면 parse/is_known에서 AttributeError가 난다
+    design = _design({"w1": "3mm", "l1": "10mm"})
+
+    diff = design.set_variables({"w1": 3.0, "l1": 12, "h1": 5}, units={"w1": "mm", "l1": "mm", "h1": "mm"}, dry_run=True)
+
+    assert diff["added"] == {"h1": "5mm"}
+    assert diff["changed"] == {"l1": ("10mm", "12mm")}
+    assert diff["unchanged"] == ["w1"]
+    assert design.solver_instance.odesign.changes == []
+
+
+def test_set_variables_unknown_unit():
+    design = _design({})
+
+    with pytest.raises(ValueError, match="unknown unit"):
+        design.set_variables({"w1": 3}, units={"w1": "furlong"}, dry_run=True)
+
+
+def test_variable_wrapper_units():
+    assert VariableWrapper("3mm").value() == 3
+    assert VariableWrapper("3mm").to("um") == pytest.approx(3000)
+
+
+def test_invalidate_variables_drops_cached_attributes():
+    design = _design({"w1": "3mm"})
+    design._attr_cache["w1"] = ("variable", VariableWrapper("3mm"))
+    design._attr_cache["oeditor"] = ("solver", None)
+
+    design.invalidate_variables()
+
+    assert "w1" not in design._attr_cache
+    assert "oeditor" in design._attr_cache